@@ -0,0 +1,143 @@
+"""Benchmark font registration and SVG widget creation.
+
+Fonts: registers every face of the font directory (the previous start-up
+behaviour) versus only the weights the theme uses, excluding the one-off
+stylesheet compilation, each in a fresh process so
+Qt's font database starts empty, reading from the resources folder or from the
+resource archive. SVG: creates, shows and paints card-sized images as
+``QSvgWidget`` (the file is parsed for every widget) versus ``SvgWidget``
+(one parsed renderer, one cached pixmap). Runs on the ``offscreen`` platform
+unless another one is selected.
+
+Usage:
+------
+    python -m benchmarks.bench_assets [--widgets N]
+"""
+
+import argparse
+import os
+import subprocess
+import sys
+import time
+from collections.abc import Callable
+
+from keyguard.gui import assets
+from keyguard.utils import get_resource_path
+
+SVG_PATH: str = "resources/training.svg"
+SVG_SIZE: int = 150
+
+
+def register_fonts(mode: str) -> float:
+    """Register fonts the given way and return the seconds it took.
+
+    Args:
+        mode: ``all`` for every face, ``theme`` for the theme's weights only
+
+    Returns:
+        float: the registration time
+    """
+    from PyQt6.QtGui import QFontDatabase
+    from PyQt6.QtWidgets import QApplication
+
+    app = QApplication([])  # noqa: F841
+    # the theme stylesheet is compiled at start-up anyway
+    weights = assets.theme_font_weights()
+    start = time.perf_counter()
+    if mode == "all":
+        for font_file in get_resource_path(assets.FONT_DIR).iterdir():
+            QFontDatabase.addApplicationFont(str(font_file))
+    else:
+        assets.load_fonts(weights)
+    return time.perf_counter() - start
+
+
+def font_time(mode: str, archive: bool) -> float:
+    """Run :func:`register_fonts` in a fresh process.
+
+    Args:
+        mode: ``all`` or ``theme``
+        archive: whether the resource archive is present
+
+    Returns:
+        float: the registration time in milliseconds
+    """
+    out = subprocess.run(
+        [sys.executable, "-m", "benchmarks.bench_assets", "--child", mode],
+        env={**os.environ, "QT_QPA_PLATFORM": "offscreen"},
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    return float(out.stdout.strip().splitlines()[-1]) * 1e3
+
+
+def widget_time(build: Callable, count: int) -> float:
+    """Create, show and paint ``count`` SVG widgets.
+
+    Args:
+        build: creates one widget
+        count: how many widgets to create
+
+    Returns:
+        float: the mean time per widget in microseconds
+    """
+    from PyQt6.QtWidgets import QApplication, QHBoxLayout, QWidget
+
+    app = QApplication.instance()
+    start = time.perf_counter()
+    host = QWidget()
+    layout = QHBoxLayout(host)
+    for _ in range(count):
+        widget = build()
+        widget.setFixedSize(SVG_SIZE, SVG_SIZE)
+        layout.addWidget(widget)
+    host.show()
+    app.processEvents()
+    elapsed = time.perf_counter() - start
+    host.close()
+    host.deleteLater()
+    app.processEvents()
+    return elapsed / count * 1e6
+
+
+def main() -> None:
+    """Run the benchmark and print the timings."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--widgets", type=int, default=20)
+    parser.add_argument("--child", choices=("all", "theme"), help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        print(register_fonts(args.child))
+        return
+
+    archive = get_resource_path(assets.ARCHIVE_NAME)
+    had_archive = archive.exists()
+    print(f"{'fonts':>7} {'folder, ms':>11} {'archive, ms':>12}")
+    for mode in ("all", "theme"):
+        archive.unlink(missing_ok=True)
+        folder = min(font_time(mode, False) for _ in range(3))
+        assets.build_archive(archive)
+        packed = min(font_time(mode, True) for _ in range(3))
+        print(f"{mode:>7} {folder:>11.1f} {packed:>12.1f}")
+    if not had_archive:
+        archive.unlink()
+
+    os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+    from PyQt6.QtSvgWidgets import QSvgWidget
+    from PyQt6.QtWidgets import QApplication
+
+    app = QApplication([])  # noqa: F841
+    path = str(get_resource_path(SVG_PATH))
+    print(f"\n{'svg widget':>11} {'us per widget':>14}")
+    for name, build in (
+        ("QSvgWidget", lambda: QSvgWidget(path)),
+        ("SvgWidget", lambda: assets.SvgWidget(SVG_PATH)),
+    ):
+        widget_time(build, 2)
+        print(f"{name:>11} {widget_time(build, args.widgets):>14.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,177 @@
+"""Benchmark dwell-time capture jitter against synthetic key events.
+
+A synthetic typist produces press/release events with known times, including
+rollover (the next key goes down before the previous one is released). Each
+event reaches the capture code after a random event-loop delay, modelling
+repaints and other work queued ahead of it. Three capture strategies are
+compared by their dwell-time error against the ground truth:
+
+* ``legacy`` -- one press slot overwritten by every press, timestamped with
+  the clock at delivery (the original ``LearningView`` behaviour);
+* ``per-key delivery`` -- :class:`KeystrokeCapture` without event timestamps;
+* ``per-key event ts`` -- :class:`KeystrokeCapture` with millisecond event
+  timestamps, as provided by ``QKeyEvent.timestamp()``.
+
+The per-event cost of the capture itself is reported as well.
+
+Usage:
+------
+    python -m benchmarks.bench_capture [--keys N]
+"""
+
+import argparse
+import time
+
+import numpy as np
+
+from keyguard.capture import KeystrokeCapture
+
+ROLLOVER_RATE: float = 0.2
+KEYS: int = 26
+
+
+Event = tuple[float, str, int, int]
+
+
+def make_events(count: int, rng: np.random.Generator) -> list[Event]:
+    """Generate key events of a typist with occasional rollover.
+
+    Args:
+        count: the number of keystrokes
+        rng: the random generator
+
+    Returns:
+        list[Event]: ``(time_ms, kind, key, keystroke)`` events sorted by time;
+        the true dwell time of a keystroke is its release minus its press time
+    """
+    dwells = rng.normal(100.0, 20.0, count).clip(30.0)
+    flights = rng.normal(60.0, 25.0, count).clip(5.0)
+    rollover = rng.random(count) < ROLLOVER_RATE
+    flights[rollover] = -rng.uniform(5.0, 25.0, rollover.sum())
+
+    events = []
+    press = 0.0
+    for i in range(count):
+        events.append((press, "press", i % KEYS, i))
+        events.append((press + dwells[i], "release", i % KEYS, i))
+        press = max(press + dwells[i] + flights[i], press + 1.0)
+    events.sort(key=lambda event: event[0])
+    return events
+
+
+def true_dwells(events: list[Event]) -> np.ndarray:
+    """Return the true dwell times in the order of the releases.
+
+    Args:
+        events: the key events
+
+    Returns:
+        np.ndarray: the dwell times in ms
+    """
+    pressed = {i: at for at, kind, _, i in events if kind == "press"}
+    return np.array([at - pressed[i] for at, kind, _, i in events if kind == "release"])
+
+
+def delivery_delays(count: int, rng: np.random.Generator) -> np.ndarray:
+    """Event-loop delays: a few ms of queueing plus occasional 16 ms frames.
+
+    Args:
+        count: the number of events
+        rng: the random generator
+
+    Returns:
+        np.ndarray: the delays in ms
+    """
+    return rng.exponential(2.0, count) + 16.0 * (rng.random(count) < 0.1)
+
+
+def legacy(events: list[Event], delays: np.ndarray) -> list[float]:
+    """Capture with a single press slot and delivery-time stamps.
+
+    Args:
+        events: the key events
+        delays: the delivery delay of each event
+
+    Returns:
+        list[float]: the measured dwell times in release order
+    """
+    measured = []
+    press_ts = 0.0
+    for (at, kind, _, _), delay in zip(events, delays, strict=True):
+        if kind == "press":
+            press_ts = at + delay
+        else:
+            measured.append(at + delay - press_ts)
+    return measured
+
+
+def per_key(events: list[Event], delays: np.ndarray, event_ts: bool) -> list[float]:
+    """Capture with :class:`KeystrokeCapture`.
+
+    Args:
+        events: the key events
+        delays: the delivery delay of each event
+        event_ts: whether events carry their millisecond timestamp
+
+    Returns:
+        list[float]: the measured dwell times in release order
+    """
+    now = [0.0]
+    capture = KeystrokeCapture(len(events))
+    if not event_ts:
+        capture = KeystrokeCapture(len(events), clock=lambda: now[0])
+
+    measured = []
+    for (at, kind, key, _), delay in zip(events, delays, strict=True):
+        now[0] = (at + delay) / 1000
+        # window systems stamp events in whole ms; 0 means "no timestamp"
+        event_ms = int(at) + 1 if event_ts else 0
+        if kind == "press":
+            capture.press(key, event_ms)
+        else:
+            measured.append(capture.release(key, event_ms))
+    return measured
+
+
+def capture_cost(count: int) -> float:
+    """Return the cost of one press/release/record cycle in nanoseconds.
+
+    Args:
+        count: the number of cycles
+
+    Returns:
+        float: the mean cost per keystroke
+    """
+    capture = KeystrokeCapture(count)
+    start = time.perf_counter()
+    for key in range(count):
+        capture.press(key, 0)
+        capture.record(capture.release(key, 0))
+    return (time.perf_counter() - start) / count * 1e9
+
+
+def main() -> None:
+    """Run the benchmark and print an error table."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--keys", type=int, default=100_000)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    events = make_events(args.keys, rng)
+    delays = delivery_delays(len(events), rng)
+    truth = true_dwells(events)
+
+    print(f"{'capture':>18} {'mean |err|, ms':>15} {'p99 |err|, ms':>14}")
+    for name, measured in (
+        ("legacy", legacy(events, delays)),
+        ("per-key delivery", per_key(events, delays, event_ts=False)),
+        ("per-key event ts", per_key(events, delays, event_ts=True)),
+    ):
+        error = np.abs(np.array(measured) - truth)
+        print(f"{name:>18} {error.mean():>15.2f} {np.percentile(error, 99):>14.2f}")
+
+    print(f"\ncapture cost: {capture_cost(args.keys):.0f} ns per keystroke")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,128 @@
+"""Benchmark profile lookup and enrollment latency in the profile database.
+
+Enrolls synthetic users into a fresh SQLite ``ProfileDatabase`` (one profile
+and one five-run session each) and, at every checkpoint, reports the median
+latency of enrolling another user, loading a header by user id, resolving a
+uuid and checking existence. The latencies should stay flat as the database
+grows.
+
+Usage:
+------
+    python -m benchmarks.bench_database [--profiles N]
+"""
+
+import argparse
+import statistics
+import tempfile
+import time
+import uuid
+from collections.abc import Callable, Sequence
+from functools import partial
+from pathlib import Path
+from typing import Any
+
+import numpy as np
+
+from keyguard.config import PHRASE
+from keyguard.database import ProfileDatabase
+
+CHECKPOINTS: tuple[int, ...] = (100, 1_000, 10_000)
+SAMPLES: int = 200
+
+
+def make_profile(rng: np.random.Generator) -> tuple[dict, dict]:
+    """Generate an empty profile and one training session.
+
+    Args:
+        rng: the random generator
+
+    Returns:
+        tuple[dict, dict]: the profile header and the session
+    """
+    means = rng.uniform(60.0, 160.0, len(PHRASE))
+    profile = {
+        "uuid": str(uuid.uuid4()),
+        "phrase": PHRASE,
+        "means": [],
+        "variances": [],
+        "m2": [],
+        "counts": [],
+        "total_runs": 0,
+    }
+    session = {"session_id": "bench", "runs": rng.normal(means, 10.0, (5, len(means)))}
+    return profile, session
+
+
+def enroll(db: ProfileDatabase, user_id: str, rng: np.random.Generator) -> str:
+    """Create a profile and append its first session.
+
+    Args:
+        db: the database
+        user_id: the user id
+        rng: the random generator
+
+    Returns:
+        str: the uuid of the new profile
+    """
+    profile, session = make_profile(rng)
+    db.save(user_id, profile)
+    db.append_session(user_id, profile, session)
+    return profile["uuid"]
+
+
+def median_us(func: Callable[[Any], object], arguments: Sequence[Any]) -> float:
+    """Return the median latency of ``func(arg)`` over the given arguments.
+
+    Args:
+        func: the function to time
+        arguments: the argument of each call
+
+    Returns:
+        float: the median latency in microseconds
+    """
+    times = []
+    for arg in arguments:
+        start = time.perf_counter()
+        func(arg)
+        times.append(time.perf_counter() - start)
+    return statistics.median(times) * 1e6
+
+
+def main() -> None:
+    """Run the benchmark and print a latency table."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--profiles", type=int, default=CHECKPOINTS[-1])
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    with tempfile.TemporaryDirectory() as tmp:
+        db = ProfileDatabase(Path(tmp) / "profiles.sqlite3")
+        uuids: list[str] = []
+
+        print(
+            f"{'profiles':>9} {'enroll, us':>11} {'load, us':>9} "
+            f"{'by uuid, us':>12} {'exists, us':>11}"
+        )
+        for checkpoint in (c for c in CHECKPOINTS if c <= args.profiles):
+            while len(uuids) < checkpoint:
+                uuids.append(enroll(db, f"user-{len(uuids)}", rng))
+
+            picks = rng.integers(0, len(uuids), SAMPLES)
+            users = [f"user-{i}" for i in picks]
+            load = median_us(db.load_header, users)
+            by_uuid = median_us(db.find_by_uuid, [uuids[i] for i in picks])
+            exists = median_us(db.exists, users)
+            enrolled = median_us(
+                partial(enroll, db, rng=rng),
+                [f"extra-{checkpoint}-{i}" for i in range(SAMPLES)],
+            )
+
+            print(
+                f"{checkpoint:>9} {enrolled:>11.1f} {load:>9.1f} "
+                f"{by_uuid:>12.1f} {exists:>11.1f}"
+            )
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
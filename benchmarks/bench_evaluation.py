@@ -0,0 +1,82 @@
+"""Benchmark the FAR/FRR/EER sweep.
+
+Compares rescoring every attempt with ``AuthTemplate.score`` once per
+threshold factor with ``keyguard.evaluation.evaluate``, which scores every
+attempt once and reads the rates of all threshold factors from the sorted
+scores. Both sweep ``THRESHOLD_STEPS`` threshold factors over synthetic
+genuine and impostor attempts, and the rates they produce are checked to be
+identical.
+
+Usage:
+------
+    python -m benchmarks.bench_evaluation
+"""
+
+import time
+
+import numpy as np
+
+from keyguard.config import PHRASE
+from keyguard.evaluation import THRESHOLD_STEPS, evaluate
+from keyguard.logic import RunAccumulator
+from keyguard.synthetic import Typist
+from keyguard.template import AuthTemplate
+
+ATTEMPT_COUNTS: tuple[int, ...] = (1_000, 10_000, 100_000)
+RESCORE_LIMIT: int = 10_000
+ENROLLED_RUNS: int = 40
+
+
+def rescore(
+    template: AuthTemplate,
+    genuine: np.ndarray,
+    impostor: np.ndarray,
+    thresholds: np.ndarray,
+) -> tuple[np.ndarray, np.ndarray]:
+    """Compute FAR and FRR by scoring every attempt at every threshold."""
+    far = np.empty(len(thresholds))
+    frr = np.empty(len(thresholds))
+    for idx, factor in enumerate(thresholds):
+        far[idx] = template.score(impostor, factor).accepted.mean()
+        frr[idx] = 1 - template.score(genuine, factor).accepted.mean()
+    return far, frr
+
+
+def main() -> None:
+    """Run the benchmark and print a timing table."""
+    typist = Typist.random(len(PHRASE), 0)
+    acc = RunAccumulator()
+    for run in typist.runs(ENROLLED_RUNS):
+        acc.push(run)
+    profile = {"uuid": "bench", "revision": 1}
+    acc.to_profile(profile)
+    template = AuthTemplate.from_profile(profile)
+    impostor = typist.impostor(similarity=0.5)
+
+    print(f"{THRESHOLD_STEPS} threshold factors")
+    print(f"{'attempts':>10} {'rescore':>10} {'sorted':>10} {'speedup':>8} {'EER':>7}")
+    for count in ATTEMPT_COUNTS:
+        genuine_runs = typist.runs(count, outlier_rate=0.01)
+        impostor_runs = impostor.runs(count)
+
+        start = time.perf_counter()
+        result = evaluate(template, genuine_runs, impostor_runs)
+        sorted_time = time.perf_counter() - start
+
+        rescore_cell, speedup = "-", "-"
+        if count <= RESCORE_LIMIT:
+            start = time.perf_counter()
+            far, frr = rescore(template, genuine_runs, impostor_runs, result.thresholds)
+            rescore_time = time.perf_counter() - start
+            if not (np.array_equal(far, result.far) and np.allclose(frr, result.frr)):
+                raise SystemExit("rates differ between the two sweeps")
+            rescore_cell = f"{rescore_time:.3f} s"
+            speedup = f"{rescore_time / sorted_time:.0f}x"
+        print(
+            f"{count:>10} {rescore_cell:>10} {sorted_time * 1e3:>7.1f} ms "
+            f"{speedup:>8} {result.eer:>7.2%}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,73 @@
+"""Benchmark per-keystroke render latency of the phrase highlight.
+
+Types the phrase character by character and, after every keystroke, processes
+the pending update events so the invalidated region is repainted. Compares the rich-text ``LabelValue``
+(an HTML string re-laid out by ``QLabel`` on every change) with the
+custom-painted ``PhraseHighlighter``. Runs on the ``offscreen`` platform unless
+another one is selected.
+
+Usage:
+------
+    python -m benchmarks.bench_highlight [--rounds N]
+"""
+
+import argparse
+import os
+import time
+
+import numpy as np
+from PyQt6.QtWidgets import QApplication, QWidget
+
+from keyguard.config import GLOBAL_STYLESHEET, PHRASE
+from keyguard.gui.components.LabelValue import LabelValue
+from keyguard.gui.components.PhraseHighlighter import PhraseHighlighter
+
+
+def keystroke_latency(highlight: QWidget, rounds: int, app: QApplication) -> np.ndarray:
+    """Time ``highlight_match`` plus the repaint for every keystroke.
+
+    Args:
+        highlight: the shown widget providing ``highlight_match``
+        rounds: how many times to type the phrase
+        app: the application
+
+    Returns:
+        np.ndarray: the latencies in microseconds
+    """
+    times = []
+    for _ in range(rounds):
+        highlight.highlight_match(0)
+        app.processEvents()
+        for matched in range(1, len(PHRASE) + 1):
+            start = time.perf_counter()
+            highlight.highlight_match(matched)
+            app.processEvents()
+            times.append(time.perf_counter() - start)
+    return np.array(times) * 1e6
+
+
+def main() -> None:
+    """Run the benchmark and print a latency table."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rounds", type=int, default=50)
+    args = parser.parse_args()
+
+    os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+    app = QApplication([])
+    app.setStyleSheet(GLOBAL_STYLESHEET)
+
+    label = LabelValue("Фраза", PHRASE, size="large", bold=True)
+    painted = PhraseHighlighter(PHRASE)
+    painted.setProperty("class", "label-value_value--large")
+
+    print(f"{'widget':>18} {'mean, us':>9} {'p99, us':>9}")
+    for name, widget in (("LabelValue", label), ("PhraseHighlighter", painted)):
+        widget.show()
+        app.processEvents()
+        latency = keystroke_latency(widget, args.rounds, app)
+        print(f"{name:>18} {latency.mean():>9.1f} {np.percentile(latency, 99):>9.1f}")
+        widget.hide()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,56 @@
+"""Benchmark the cold import time of ``keyguard.__main__``.
+
+Each measurement runs in a fresh interpreter. The "before" figure imports
+``scipy.stats`` ahead of the application, which is what ``keyguard.logic`` used
+to do at module import; it is skipped when scipy is not installed.
+
+Usage:
+------
+    python -m benchmarks.bench_import [--repeat N]
+"""
+
+import argparse
+import importlib.util
+import subprocess
+import sys
+import time
+
+AFTER: str = "import keyguard.__main__"
+BEFORE: str = "import scipy.stats; import keyguard.__main__"
+
+
+def cold_import(statement: str, repeat: int) -> float:
+    """Return the best wall time of running ``statement`` in a new interpreter.
+
+    Args:
+        statement: the Python statement to execute
+        repeat: the number of interpreter launches
+
+    Returns:
+        float: the best observed time in seconds
+    """
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        subprocess.run([sys.executable, "-c", statement], check=True)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main() -> None:
+    """Run the benchmark and print both timings."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=10)
+    args = parser.parse_args()
+
+    baseline = cold_import("pass", args.repeat)
+    after = cold_import(AFTER, args.repeat) - baseline
+    print(f"interpreter start-up:     {baseline * 1e3:8.1f} ms")
+    if importlib.util.find_spec("scipy") is not None:
+        before = cold_import(BEFORE, args.repeat) - baseline
+        print(f"import with scipy.stats:  {before * 1e3:8.1f} ms")
+    print(f"import keyguard.__main__: {after * 1e3:8.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,375 @@
+"""Scale benchmark suite for ``keyguard.logic``.
+
+Times the statistics functions on runs of a seeded synthetic typist (see
+:mod:`keyguard.synthetic`) with 1 % outliers and 10 % drift, at 1e2 to 1e6
+runs. Every function has a size limit so the whole suite finishes in a couple
+of minutes: the Grubbs-based outlier removal is quadratic in the number of
+runs and stops at 1e3, the ``statistics``-based and per-attempt functions at
+1e5.
+
+Every measurement times the call at least ``--repeats`` times and until
+``--min-time`` has passed, and keeps the fastest and the median time.
+``run --save`` writes them to a JSON baseline; ``compare`` times the current
+tree (or reads a second baseline) and exits with status 1 if both the median
+and the fastest time of any case got slower than the baseline by more than
+``--tolerance``, so a single noisy sample cannot flag a regression; cases that
+regress while timing the current tree are timed once more and keep the better
+median before they are reported. Baselines are only comparable on the same,
+otherwise idle machine.
+
+Usage:
+------
+    python -m benchmarks.bench_logic run [--max-runs N] [--repeats N] [--save BASELINE.json]
+    python -m benchmarks.bench_logic compare BASELINE.json [CURRENT.json]
+"""
+
+import argparse
+import json
+import platform
+import statistics
+import sys
+import time
+from collections.abc import Callable
+from datetime import UTC, datetime
+from pathlib import Path
+from typing import Any, NamedTuple
+
+import numpy as np
+
+from keyguard.config import PHRASE
+from keyguard.logic import (
+    calculate_authentication_delta,
+    compute_session_stats,
+    rebuild_profile_from_history,
+    remove_outliers,
+    remove_outliers_per_position,
+    t_test,
+    update_aggregate_profile,
+)
+from keyguard.synthetic import Typist
+
+SIZES: tuple[int, ...] = (100, 1_000, 10_000, 100_000, 1_000_000)
+SEED: int = 0
+OUTLIER_RATE: float = 0.01
+DRIFT: float = 0.1
+MIN_TIME: float = 0.2
+MIN_REPEATS: int = 5
+MAX_REPEATS: int = 200
+TOLERANCE: float = 0.2
+
+
+class Workload(NamedTuple):
+    """The inputs of one size."""
+
+    runs: np.ndarray
+    impostor: np.ndarray
+    means: list[float]
+    variances: list[float]
+
+
+Thunk = Callable[[], object]
+
+
+def _session_stats(data: Workload) -> Thunk:
+    runs = data.runs.tolist()
+    return lambda: compute_session_stats(runs)
+
+
+def _update_aggregate(data: Workload) -> Thunk:
+    # rows of the matrix, like a session read back from runs.bin
+    session = {"runs": data.runs}
+    return lambda: update_aggregate_profile({}, session)
+
+
+def _rebuild(data: Workload) -> Thunk:
+    return lambda: rebuild_profile_from_history({}, data.runs)
+
+
+def _remove_outliers(data: Workload) -> Thunk:
+    values = data.runs[:, 0].tolist()
+    return lambda: remove_outliers(values)
+
+
+def _remove_outliers_per_position(data: Workload) -> Thunk:
+    runs = data.runs.tolist()
+    return lambda: remove_outliers_per_position(runs)
+
+
+def _t_test(data: Workload) -> Thunk:
+    genuine, impostor = data.runs[:, 0].tolist(), data.impostor[:, 0].tolist()
+    return lambda: t_test(genuine, impostor)
+
+
+def _authentication_delta(data: Workload) -> Thunk:
+    attempts = data.impostor.tolist()
+
+    def score_all() -> None:
+        for attempt in attempts:
+            calculate_authentication_delta(
+                attempt, data.means, data.variances, threshold_factor=2.85
+            )
+
+    return score_all
+
+
+# case name -> (largest number of runs, setup returning the timed call)
+CASES: dict[str, tuple[int, Callable[[Workload], Thunk]]] = {
+    "compute_session_stats": (100_000, _session_stats),
+    "update_aggregate_profile": (1_000_000, _update_aggregate),
+    "rebuild_profile_from_history": (1_000_000, _rebuild),
+    "remove_outliers": (1_000, _remove_outliers),
+    "remove_outliers_per_position": (1_000, _remove_outliers_per_position),
+    "t_test": (1_000_000, _t_test),
+    "calculate_authentication_delta": (100_000, _authentication_delta),
+}
+
+
+def workload(size: int, seed: int = SEED) -> Workload:
+    """Draw the inputs of one size.
+
+    Args:
+        size: the number of runs
+        seed: the seed of the typist
+
+    Returns:
+        Workload: genuine and impostor runs and the typist's true statistics
+    """
+    typist = Typist.random(len(PHRASE), seed)
+    impostor = typist.impostor(similarity=0.5)
+    return Workload(
+        typist.runs(size, OUTLIER_RATE, drift=DRIFT, dtype=np.float32),
+        impostor.runs(size, OUTLIER_RATE, dtype=np.float32),
+        typist.means.tolist(),
+        typist.variances.tolist(),
+    )
+
+
+def measure(
+    thunk: Thunk, min_time: float = MIN_TIME, repeats: int = MIN_REPEATS
+) -> dict[str, float]:
+    """Time a call at least ``repeats`` times and until ``min_time`` has passed.
+
+    Calls shorter than ``min_time`` are made once more beforehand, untimed, to
+    warm up caches and lazily built state.
+
+    Args:
+        thunk: the call
+        min_time: the least total time to spend
+        repeats: the least number of timed calls
+
+    Returns:
+        dict[str, float]: the fastest and median seconds and the repeats
+    """
+    start = time.perf_counter()
+    thunk()
+    times = [time.perf_counter() - start]
+    if times[0] < min_time:
+        times.clear()
+    while len(times) < repeats or (sum(times) < min_time and len(times) < MAX_REPEATS):
+        start = time.perf_counter()
+        thunk()
+        times.append(time.perf_counter() - start)
+    return {
+        "min_s": min(times),
+        "median_s": statistics.median(times),
+        "repeats": len(times),
+    }
+
+
+def run_suite(
+    sizes: dict[str, list[int]], min_time: float, repeats: int = MIN_REPEATS
+) -> dict[str, dict[str, dict[str, float]]]:
+    """Time every case at its sizes, printing each result as it is measured.
+
+    Args:
+        sizes: the numbers of runs to time per case name
+        min_time: the least time to spend per measurement
+        repeats: the least number of timed calls per measurement
+
+    Returns:
+        dict[str, dict[str, dict[str, float]]]: the measurements per case
+        name and number of runs
+    """
+    results: dict[str, dict[str, dict[str, float]]] = {}
+    print(f"{'case':<32} {'runs':>9} {'min':>11} {'median':>11} {'per run':>11}")
+    for size in sorted({size for case in sizes.values() for size in case}):
+        data = workload(size)
+        for name, case_sizes in sizes.items():
+            if size not in case_sizes:
+                continue
+            result = measure(CASES[name][1](data), min_time, repeats)
+            results.setdefault(name, {})[str(size)] = result
+            print(
+                f"{name:<32} {size:>9} {_seconds(result['min_s']):>11} "
+                f"{_seconds(result['median_s']):>11} "
+                f"{_seconds(result['min_s'] / size):>11}"
+            )
+    return results
+
+
+def _seconds(value: float) -> str:
+    """Format a duration with a readable unit."""
+    for unit, scale in (("s", 1.0), ("ms", 1e-3), ("us", 1e-6)):
+        if value >= scale:
+            return f"{value / scale:.3f} {unit}"
+    return f"{value / 1e-9:.1f} ns"
+
+
+def _baseline(
+    results: dict[str, Any], min_time: float, repeats: int = MIN_REPEATS
+) -> dict[str, Any]:
+    """Wrap measurements with the conditions they were taken under."""
+    return {
+        "created": datetime.now(UTC).isoformat(timespec="seconds"),
+        "machine": {
+            "platform": platform.platform(),
+            "processor": platform.processor() or platform.machine(),
+            "python": platform.python_version(),
+            "numpy": np.__version__,
+        },
+        "seed": SEED,
+        "min_time": min_time,
+        "repeats": repeats,
+        "results": results,
+    }
+
+
+def compare_results(
+    baseline: dict[str, Any], current: dict[str, Any], tolerance: float
+) -> list[str]:
+    """Print the ratio of every common case and return the regressed ones.
+
+    Cases are compared by their median time. A case only counts as regressed
+    when its fastest time is beyond ``tolerance`` as well, so one slow outlier
+    among the repeats, or a single lucky baseline sample, is not reported.
+
+    Args:
+        baseline: the baseline document
+        current: the document to check
+        tolerance: the allowed relative slowdown, e.g. ``0.2`` for 20 %
+
+    Returns:
+        list[str]: ``case/runs`` of every measurement that regressed
+    """
+    regressions = []
+    print(
+        f"{'case':<32} {'runs':>9} {'baseline':>11} {'current':>11} "
+        f"{'median':>7} {'min':>7}"
+    )
+    for name, sizes in baseline["results"].items():
+        for size, before in sizes.items():
+            after = current["results"].get(name, {}).get(size)
+            if after is None:
+                print(f"{name:<32} {size:>9} {'not measured':>31}")
+                continue
+            ratio = after["median_s"] / before["median_s"]
+            best = after["min_s"] / before["min_s"]
+            flag = ""
+            if min(ratio, best) > 1 + tolerance:
+                flag = "  REGRESSION"
+                regressions.append(f"{name}/{size}")
+            elif max(ratio, best) < 1 / (1 + tolerance):
+                flag = "  faster"
+            print(
+                f"{name:<32} {size:>9} {_seconds(before['median_s']):>11} "
+                f"{_seconds(after['median_s']):>11} {ratio:>6.2f}x {best:>6.2f}x"
+                f"{flag}"
+            )
+    return regressions
+
+
+def _retime(
+    current: dict[str, Any], cases: list[str], min_time: float, repeats: int
+) -> None:
+    """Time ``case/runs`` measurements again, keeping the better median.
+
+    Args:
+        current: the document to update
+        cases: ``case/runs`` of the measurements to repeat
+        min_time: the least time to spend per measurement
+        repeats: the least number of timed calls per measurement
+    """
+    sizes: dict[str, list[int]] = {}
+    for case in cases:
+        name, size = case.split("/")
+        sizes.setdefault(name, []).append(int(size))
+    for name, results in run_suite(sizes, min_time, repeats).items():
+        for size, result in results.items():
+            if result["median_s"] < current["results"][name][size]["median_s"]:
+                current["results"][name][size] = result
+
+
+def _case_sizes(args: argparse.Namespace) -> dict[str, list[int]]:
+    """Select the sizes to time per case from the arguments."""
+    names = args.cases or list(CASES)
+    unknown = set(names) - set(CASES)
+    if unknown:
+        raise SystemExit(f"unknown cases: {', '.join(sorted(unknown))}")
+    limit = args.max_runs or max(SIZES)
+    return {
+        name: [size for size in SIZES if size <= min(CASES[name][0], limit)]
+        for name in names
+    }
+
+
+def main() -> None:
+    """Run the suite or compare it against a baseline."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    run_parser = commands.add_parser("run", help="time the suite")
+    run_parser.add_argument("--save", type=Path, help="write a JSON baseline")
+    compare_parser = commands.add_parser("compare", help="check for regressions")
+    compare_parser.add_argument("baseline", type=Path)
+    compare_parser.add_argument(
+        "current", type=Path, nargs="?", help="a second baseline instead of a run"
+    )
+    compare_parser.add_argument(
+        "--tolerance", type=float, default=TOLERANCE, help="allowed slowdown"
+    )
+    for command in (run_parser, compare_parser):
+        command.add_argument("--cases", nargs="+", choices=list(CASES))
+        command.add_argument("--max-runs", type=int, help="skip larger sizes")
+        command.add_argument("--min-time", type=float, default=MIN_TIME)
+        command.add_argument(
+            "--repeats", type=int, default=MIN_REPEATS, help="least timed calls"
+        )
+    args = parser.parse_args()
+
+    if args.command == "run":
+        results = run_suite(_case_sizes(args), args.min_time, args.repeats)
+        if args.save:
+            args.save.write_text(
+                json.dumps(_baseline(results, args.min_time, args.repeats), indent=2)
+            )
+            print(f"baseline written to {args.save}")
+        return
+
+    baseline = json.loads(args.baseline.read_text())
+    if args.current:
+        current = json.loads(args.current.read_text())
+    else:
+        selected = _case_sizes(args)
+        sizes = {
+            name: [int(size) for size in measured if int(size) in selected[name]]
+            for name, measured in baseline["results"].items()
+            if name in selected
+        }
+        current = _baseline(
+            run_suite(sizes, args.min_time, args.repeats), args.min_time, args.repeats
+        )
+        print()
+    regressions = compare_results(baseline, current, args.tolerance)
+    if regressions and not args.current:
+        print(f"\ntiming {len(regressions)} regressed cases again")
+        _retime(current, regressions, args.min_time, args.repeats)
+        print()
+        regressions = compare_results(baseline, current, args.tolerance)
+    if regressions:
+        print(f"{len(regressions)} regressions beyond {args.tolerance:.0%}")
+        sys.exit(1)
+    print(f"no regressions beyond {args.tolerance:.0%}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,161 @@
+"""Benchmark for per-position outlier removal.
+
+Compares the array-backed ``remove_outliers_per_position`` with the original
+pure-Python implementation (kept here as a frozen baseline) at 10, 100 and
+10 000 runs of a phrase-length dwell vector.
+
+The test statistic scales with the square root of the sample size, so on large
+samples nearly every run is rejected one at a time and both implementations do
+quadratic work. The legacy baseline needs hours at 10 000 runs; it is skipped
+above ``--legacy-max-runs`` unless ``--full`` is given.
+
+The legacy baseline takes its critical values from scipy, which is only
+installed with the optional ``verify`` extra; without it the baseline and the
+result check are skipped and only the array-backed version is timed.
+
+Usage:
+------
+    python -m benchmarks.bench_outliers [--full] [--legacy-max-runs N]
+"""
+
+import argparse
+import importlib.util
+import math
+import random
+import statistics
+import time
+from collections.abc import Callable
+
+from keyguard.config import PHRASE
+from keyguard.logic import remove_outliers_per_position
+
+RUN_COUNTS: tuple[int, ...] = (10, 100, 10_000)
+
+
+def legacy_remove_outliers_per_position(
+    runs: list[list[float]], alpha: float = 0.05
+) -> list[list[float]]:
+    """Remove outlier runs with the original per-position Python loop.
+
+    Args:
+        runs: the runs to remove outliers from
+        alpha: the significance level
+
+    Returns:
+        list[list[float]]: the runs with outliers removed
+    """
+    from scipy.stats import t as t_dist
+
+    if not runs:
+        return []
+
+    num_positions = len(runs[0])
+    outlier_indices: set[int] = set()
+
+    for pos in range(num_positions):
+        data = [(run[pos], idx) for idx, run in enumerate(runs) if len(run) > pos]
+        n = len(data)
+
+        while n > 2:
+            mean = statistics.mean(v for v, _ in data)
+            std = statistics.stdev(v for v, _ in data)
+            if std == 0:
+                break
+
+            value, idx = max(data, key=lambda item: abs(item[0] - mean))
+            t_stat = abs(value - mean) / (std / math.sqrt(n))
+            t_crit = t_dist.ppf(1 - alpha / 2, n - 2)
+
+            if t_stat > t_crit:
+                outlier_indices.add(idx)
+                data = [item for item in data if item[1] != idx]
+                n -= 1
+            else:
+                break
+
+    return [run for idx, run in enumerate(runs) if idx not in outlier_indices]
+
+
+def make_runs(count: int, seed: int = 0) -> list[list[float]]:
+    """Generate dwell runs with a sprinkle of gross errors.
+
+    Args:
+        count: the number of runs
+        seed: the random seed
+
+    Returns:
+        list[list[float]]: the generated runs
+    """
+    rng = random.Random(seed)
+    base = [rng.uniform(60.0, 160.0) for _ in PHRASE]
+    runs = []
+    for _ in range(count):
+        run = [rng.gauss(m, m * 0.15) for m in base]
+        if rng.random() < 0.05:
+            pos = rng.randrange(len(run))
+            run[pos] *= rng.uniform(3.0, 6.0)
+        runs.append(run)
+    return runs
+
+
+def measure(
+    func: Callable[[list[list[float]]], list[list[float]]],
+    runs: list[list[float]],
+    budget: float = 1.0,
+) -> float:
+    """Return the best wall time of ``func(runs)`` within a time budget.
+
+    Args:
+        func: the function to time
+        runs: the input runs
+        budget: the total time budget in seconds
+
+    Returns:
+        float: the best observed time in seconds
+    """
+    best = math.inf
+    deadline = time.perf_counter() + budget
+    while True:
+        start = time.perf_counter()
+        func(runs)
+        best = min(best, time.perf_counter() - start)
+        if time.perf_counter() > deadline:
+            return best
+
+
+def main() -> None:
+    """Run the benchmark and print a comparison table."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--full", action="store_true", help="always run legacy")
+    parser.add_argument("--legacy-max-runs", type=int, default=1_000)
+    args = parser.parse_args()
+
+    legacy_available = importlib.util.find_spec("scipy") is not None
+    if not legacy_available:
+        print(
+            "scipy is not installed, skipping the legacy baseline "
+            "(poetry install --no-root --extras verify)"
+        )
+    print(f"{'runs':>8} {'legacy, ms':>12} {'vectorized, ms':>16} {'speedup':>9}")
+    for count in RUN_COUNTS:
+        runs = make_runs(count)
+        vectorized = measure(remove_outliers_per_position, runs)
+
+        if not legacy_available or (not args.full and count > args.legacy_max_runs):
+            print(f"{count:>8} {'skipped':>12} {vectorized * 1e3:>16.3f} {'-':>9}")
+            continue
+
+        if legacy_remove_outliers_per_position(runs) != remove_outliers_per_position(
+            runs
+        ):
+            raise SystemExit(f"Result mismatch at {count} runs")
+
+        legacy = measure(legacy_remove_outliers_per_position, runs)
+        print(
+            f"{count:>8} {legacy * 1e3:>12.3f} {vectorized * 1e3:>16.3f} "
+            f"{legacy / vectorized:>8.1f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
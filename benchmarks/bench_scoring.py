@@ -0,0 +1,53 @@
+"""Benchmark authentication scoring throughput in attempts per second.
+
+Compares calling ``calculate_authentication_delta`` once per attempt with a
+single ``score_attempts`` pass over the whole attempt matrix.
+
+Usage:
+------
+    python -m benchmarks.bench_scoring
+"""
+
+import time
+
+import numpy as np
+
+from keyguard.config import PHRASE
+from keyguard.logic import calculate_authentication_delta, score_attempts
+
+BATCH_SIZES: tuple[int, ...] = (100, 10_000, 1_000_000)
+PER_ATTEMPT_LIMIT: int = 10_000
+
+
+def main() -> None:
+    """Run the benchmark and print a throughput table."""
+    rng = np.random.default_rng(0)
+    positions = len(PHRASE)
+    means = rng.uniform(60.0, 160.0, positions)
+    variances = (means * 0.15) ** 2
+
+    print(f"{'attempts':>10} {'per-attempt, /s':>16} {'batch, /s':>14}")
+    for count in BATCH_SIZES:
+        attempts = rng.normal(means, np.sqrt(variances), (count, positions))
+
+        start = time.perf_counter()
+        batch = score_attempts(attempts, means, variances, threshold_factor=2.85)
+        batch_rate = count / (time.perf_counter() - start)
+
+        per_attempt = "-"
+        if count <= PER_ATTEMPT_LIMIT:
+            mean_list, var_list = means.tolist(), variances.tolist()
+            start = time.perf_counter()
+            decisions = [
+                all(calculate_authentication_delta(row, mean_list, var_list, 2.85)[2])
+                for row in attempts.tolist()
+            ]
+            per_attempt = f"{count / (time.perf_counter() - start):,.0f}"
+            if decisions != batch.accepted.tolist():
+                raise SystemExit(f"Decision mismatch at {count} attempts")
+
+        print(f"{count:>10} {per_attempt:>16} {batch_rate:>14,.0f}")
+
+
+if __name__ == "__main__":
+    main()
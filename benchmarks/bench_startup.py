@@ -0,0 +1,125 @@
+"""Benchmark time to first paint of the home screen.
+
+For growing profile sizes, starts the application in a fresh process on the
+``offscreen`` platform with a synthetic profile and measures the time from
+building the main window to its first paint. ``eager`` builds every
+``MainFrame`` page up front like the original implementation, ``lazy`` builds
+only the home page.
+
+Usage:
+------
+    python -m benchmarks.bench_startup [--sessions N [N ...]]
+"""
+
+import argparse
+import os
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+
+from keyguard.config import PHRASE
+from keyguard.storage import ProfileStore
+
+SESSION_COUNTS: tuple[int, ...] = (0, 100, 10_000)
+RUNS_PER_SESSION: int = 4
+
+
+def write_profile(data_dir: Path, sessions: int) -> None:
+    """Store a synthetic profile with the given number of sessions.
+
+    Args:
+        data_dir: the application data directory
+        sessions: the number of sessions
+    """
+    rng = np.random.default_rng(0)
+    means = rng.uniform(60.0, 160.0, len(PHRASE))
+    data_dir.mkdir(parents=True, exist_ok=True)
+    ProfileStore(data_dir / "profile.json").save(
+        {
+            "uuid": "bench",
+            "phrase": PHRASE,
+            "created": "2025-01-01 00:00",
+            "updated": "2025-01-01 00:00",
+            "sessions": [
+                {
+                    "session_id": str(i),
+                    "runs": rng.normal(means, 10.0, (RUNS_PER_SESSION, len(means))),
+                }
+                for i in range(sessions)
+            ],
+        }
+    )
+
+
+def first_paint(eager: bool) -> float:
+    """Build the main window and return the seconds until its first paint.
+
+    Args:
+        eager: whether to build every page up front
+
+    Returns:
+        float: the time to first paint
+    """
+    from PyQt6.QtCore import QEvent, QObject
+    from PyQt6.QtWidgets import QApplication
+
+    app = QApplication([])
+    start = time.perf_counter()
+
+    from keyguard.__main__ import App
+
+    painted: list[float] = []
+
+    class PaintProbe(QObject):
+        def eventFilter(self, obj: QObject, event: QEvent) -> bool:  # noqa: N802
+            if event.type() == QEvent.Type.Paint and not painted:
+                painted.append(time.perf_counter())
+            return False
+
+    window = App()
+    if eager:
+        for index in (window.main_frame.TRAINING_PAGE, window.main_frame.AUTH_PAGE):
+            window.main_frame.ensure_page(index)
+    probe = PaintProbe()
+    window.installEventFilter(probe)
+    window.show()
+    while not painted:
+        app.processEvents()
+    return painted[0] - start
+
+
+def main() -> None:
+    """Run the benchmark and print a latency table."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sessions", type=int, nargs="+", default=SESSION_COUNTS)
+    parser.add_argument("--child", choices=("eager", "lazy"), help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        print(first_paint(args.child == "eager"))
+        return
+
+    print(f"{'sessions':>9} {'eager, ms':>10} {'lazy, ms':>9}")
+    for sessions in args.sessions:
+        with tempfile.TemporaryDirectory() as tmp:
+            write_profile(Path(tmp) / "keyguard", sessions)
+            env = {**os.environ, "XDG_DATA_HOME": tmp, "QT_QPA_PLATFORM": "offscreen"}
+            times = {}
+            for mode in ("eager", "lazy"):
+                out = subprocess.run(
+                    [sys.executable, "-m", "benchmarks.bench_startup", "--child", mode],
+                    env=env,
+                    capture_output=True,
+                    text=True,
+                    check=True,
+                )
+                times[mode] = float(out.stdout.strip().splitlines()[-1]) * 1e3
+        print(f"{sessions:>9} {times['eager']:>10.1f} {times['lazy']:>9.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,83 @@
+"""Benchmark per-user threshold tuning.
+
+Times leave-one-session-out tuning of synthetic profiles by their number of
+sessions, with impostor attempts and every default minimum threshold. The
+fold statistics are compared with recomputing every fold template from the
+runs of the other sessions, as a ``RunAccumulator`` rebuild would.
+
+Usage:
+------
+    python -m benchmarks.bench_tuning [--workers N]
+"""
+
+import argparse
+import time
+
+import numpy as np
+
+from keyguard.config import MAX_TRAINING_RUNS, PHRASE
+from keyguard.logic import RunAccumulator
+from keyguard.synthetic import Typist
+from keyguard.tuning import leave_one_out, session_statistics, tune
+
+SESSION_COUNTS: tuple[int, ...] = (100, 300, 1000)
+RECOMPUTE_LIMIT: int = 300
+IMPOSTOR_ATTEMPTS: int = 1000
+
+
+def recompute_folds(sessions: list[np.ndarray]) -> tuple[np.ndarray, np.ndarray]:
+    """Rebuild the statistics of every fold from the other sessions' runs."""
+    means, variances = [], []
+    for held_out in range(len(sessions)):
+        acc = RunAccumulator()
+        for idx, runs in enumerate(sessions):
+            if idx != held_out:
+                for run in runs:
+                    acc.push(run)
+        means.append(acc.mean)
+        variances.append(acc.m2 / (acc.count - 1))
+    return np.array(means), np.array(variances)
+
+
+def main() -> None:
+    """Run the benchmark and print a timing table."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--workers", type=int, help="processes (default: CPUs)")
+    args = parser.parse_args()
+
+    typist = Typist.random(len(PHRASE), 0)
+    impostor = typist.impostor(similarity=0.5).runs(IMPOSTOR_ATTEMPTS)
+
+    print(
+        f"{'sessions':>9} {'recompute':>10} {'subtract':>9} {'tune':>8} "
+        f"{'factor':>7} {'min':>5} {'FRR':>6} {'FAR':>6}"
+    )
+    for count in SESSION_COUNTS:
+        sessions = list(np.split(typist.runs(count * MAX_TRAINING_RUNS), count))
+
+        start = time.perf_counter()
+        means, variances = leave_one_out(*session_statistics(sessions))
+        subtract = time.perf_counter() - start
+
+        recompute = "-"
+        if count <= RECOMPUTE_LIMIT:
+            start = time.perf_counter()
+            expected = recompute_folds(sessions)
+            recompute = f"{time.perf_counter() - start:.2f} s"
+            if not (
+                np.allclose(means, expected[0]) and np.allclose(variances, expected[1])
+            ):
+                raise SystemExit("fold statistics differ from a recomputation")
+
+        start = time.perf_counter()
+        result = tune(sessions, impostor, workers=args.workers)
+        elapsed = time.perf_counter() - start
+        print(
+            f"{count:>9} {recompute:>10} {subtract * 1e3:>6.1f} ms {elapsed:>6.2f} s "
+            f"{result.threshold_factor:>7.3f} {result.min_threshold:>5.1f} "
+            f"{result.frr:>6.1%} {result.far:>6.1%}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,135 @@
+"""Benchmark view construction with per-widget and global stylesheets.
+
+Builds, shows and paints the views the application creates while running —
+``LearningView``, ``AuthView``, ``SessionStatsView`` and a ``CardFrame`` — and
+measures the time per view. ``legacy`` installs only the global rules on the
+application and gives every component its own stylesheet, the way the
+components used to style themselves; ``theme`` installs the single compiled
+stylesheet from :mod:`keyguard.gui.theme`. Runs on the ``offscreen`` platform
+unless another one is selected.
+
+Usage:
+------
+    python -m benchmarks.bench_views [--rounds N]
+"""
+
+import argparse
+import os
+import time
+from collections.abc import Callable
+
+import numpy as np
+from PyQt6.QtWidgets import QApplication, QWidget
+
+from keyguard.config import GLOBAL_STYLESHEET, PHRASE
+from keyguard.gui.frames.card_frame import CardFrame
+from keyguard.gui.theme import COMPONENT_STYLESHEET, stylesheet
+from keyguard.gui.views.AuthView import AuthView
+from keyguard.gui.views.LearningView import LearningView
+from keyguard.gui.views.SessionStatsView import SessionStatsView
+
+# component rule blocks in COMPONENT_STYLESHEET order
+LEGACY_SECTIONS = COMPONENT_STYLESHEET.strip().split("\n\n")
+LEGACY_CLASSES: dict[str, int] = {
+    "line-edit": 0,
+    "spin-box": 0,
+    "button": 1,
+    "progress-bar": 2,
+    "card-frame": 3,
+    "hint": 4,
+}
+
+PROFILE: dict = {
+    "uuid": "bench",
+    "phrase": PHRASE,
+    "created": "2025-01-01 00:00",
+    "updated": "2025-01-01 00:00",
+    "total_runs": 40,
+    "avg_dwell": 110.0,
+    "mean": [110.0] * len(PHRASE),
+    "stddev": [12.0] * len(PHRASE),
+}
+SESSION: dict = {
+    "session_id": "bench",
+    "phrase": PHRASE,
+    "total_runs": 4,
+    "accepted_runs": 4,
+    "mean": 110.0,
+    "stddev": 12.0,
+}
+
+VIEWS: dict[str, Callable[[], QWidget]] = {
+    "LearningView": lambda: LearningView(PHRASE, PROFILE),
+    "AuthView": lambda: AuthView(PROFILE),
+    "SessionStatsView": lambda: SessionStatsView(SESSION),
+    "CardFrame": lambda: CardFrame("Навчання"),
+}
+
+
+def style_legacy(view: QWidget) -> None:
+    """Give every component of ``view`` its own stylesheet.
+
+    Args:
+        view: the constructed view
+    """
+    for widget in [view, *view.findChildren(QWidget)]:
+        for name in str(widget.property("class") or "").split():
+            if name in LEGACY_CLASSES:
+                widget.setStyleSheet(LEGACY_SECTIONS[LEGACY_CLASSES[name]])
+
+
+def construction_time(
+    build: Callable[[], QWidget], legacy: bool, rounds: int, app: QApplication
+) -> np.ndarray:
+    """Time building, polishing and painting a view.
+
+    Args:
+        build: creates the view
+        legacy: whether to style the components one by one
+        rounds: how many views to build
+        app: the application
+
+    Returns:
+        np.ndarray: the construction times in milliseconds
+    """
+    times = []
+    for _ in range(rounds):
+        start = time.perf_counter()
+        view = build()
+        if legacy:
+            style_legacy(view)
+        view.show()
+        app.processEvents()
+        times.append(time.perf_counter() - start)
+        view.close()
+        view.deleteLater()
+        app.processEvents()
+    return np.array(times) * 1e3
+
+
+def main() -> None:
+    """Run the benchmark and print a construction time table."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rounds", type=int, default=30)
+    args = parser.parse_args()
+
+    os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+    app = QApplication([])
+
+    print(f"{'view':>17} {'legacy, ms':>11} {'theme, ms':>10} {'speedup':>8}")
+    for name, build in VIEWS.items():
+        results = {}
+        for mode in ("legacy", "theme"):
+            app.setStyleSheet(GLOBAL_STYLESHEET if mode == "legacy" else stylesheet())
+            construction_time(build, mode == "legacy", 2, app)
+            results[mode] = np.median(
+                construction_time(build, mode == "legacy", args.rounds, app)
+            )
+        print(
+            f"{name:>17} {results['legacy']:>11.2f} {results['theme']:>10.2f}"
+            f" {results['legacy'] / results['theme']:>7.2f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,161 @@
+"""Load test of the authentication daemon.
+
+Enrolls synthetic users in a temporary profile database, starts
+``keyguard serve`` on a socket in a separate process and sends verify
+requests at a fixed rate over several pipelining connections. Requests are
+scheduled open-loop: latency is measured from the time a request was due, so
+a daemon that falls behind shows up in the percentiles instead of slowing
+the sender down.
+
+Usage:
+------
+    python -m benchmarks.loadtest_daemon [--rate RPS] [--duration S]
+"""
+
+import argparse
+import asyncio
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+
+from keyguard.config import PHRASE
+from keyguard.daemon import AuthClient
+from keyguard.database import ProfileDatabase
+from keyguard.logic import RunAccumulator
+from keyguard.utils import create_profile
+
+RUNS_PER_USER: int = 40
+
+
+def enroll_users(path: Path, users: int, rng: np.random.Generator) -> np.ndarray:
+    """Store synthetic users and return their true per-position means.
+
+    Args:
+        path: the database file
+        users: the number of users
+        rng: the random generator
+
+    Returns:
+        np.ndarray: the ``(users, positions)`` means
+    """
+    means = rng.uniform(60.0, 160.0, (users, len(PHRASE)))
+    with ProfileDatabase(path) as database:
+        for user, user_means in enumerate(means):
+            acc = RunAccumulator()
+            for run in rng.normal(user_means, 10.0, (RUNS_PER_USER, len(PHRASE))):
+                acc.push(run)
+            header = create_profile(PHRASE)
+            del header["sessions"]
+            acc.to_profile(header)
+            database.save(f"user{user}", header)
+    return means
+
+
+async def run_load(
+    socket: Path, means: np.ndarray, args: argparse.Namespace
+) -> tuple[np.ndarray, int, float]:
+    """Send requests at the target rate and collect their latencies.
+
+    Args:
+        socket: the daemon socket
+        means: the users' true means, used to draw genuine attempts
+        args: the parsed arguments
+
+    Returns:
+        tuple[np.ndarray, int, float]: the latencies in milliseconds, the
+        number of accepted attempts and the elapsed seconds
+    """
+    clients = [AuthClient() for _ in range(args.connections)]
+    for client in clients:
+        await client.connect(socket)
+
+    rng = np.random.default_rng(1)
+    total = int(args.rate * args.duration)
+    users = rng.integers(len(means), size=total)
+    attempts = rng.normal(means[users], 10.0)[:, None, :].repeat(args.batch, axis=1)
+    latencies = np.zeros(total)
+    accepted = 0
+
+    async def one(i: int, due: float) -> None:
+        nonlocal accepted
+        client = clients[i % len(clients)]
+        result = await client.verify(f"user{users[i]}", attempts[i])
+        latencies[i] = time.perf_counter() - due
+        accepted += int(result.sum())
+
+    loop = asyncio.get_running_loop()
+    start = time.perf_counter()
+    tasks = []
+    for i in range(total):
+        due = start + i / args.rate
+        delay = due - time.perf_counter()
+        if delay > 0:
+            await asyncio.sleep(delay)
+        tasks.append(loop.create_task(one(i, due)))
+    await asyncio.gather(*tasks)
+    elapsed = time.perf_counter() - start
+
+    for client in clients:
+        await client.close()
+    return latencies * 1e3, accepted, elapsed
+
+
+def main() -> None:
+    """Run the load test and print throughput and latency percentiles."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--users", type=int, default=1000)
+    parser.add_argument("--rate", type=float, default=5000.0, help="requests/s")
+    parser.add_argument("--duration", type=float, default=5.0, help="seconds")
+    parser.add_argument("--connections", type=int, default=16)
+    parser.add_argument("--batch", type=int, default=1, help="attempts/request")
+    parser.add_argument("--max-inflight", type=int, default=256)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        data_dir = Path(tmp)
+        means = enroll_users(
+            data_dir / "profiles.sqlite3", args.users, np.random.default_rng(0)
+        )
+        socket = data_dir / "keyguard.sock"
+        daemon = subprocess.Popen(
+            [
+                sys.executable,
+                "-m",
+                "keyguard.cli",
+                "--data-dir",
+                tmp,
+                "serve",
+                "--socket",
+                str(socket),
+                "--max-inflight",
+                str(args.max_inflight),
+            ],
+            stdout=subprocess.PIPE,
+            text=True,
+        )
+        try:
+            print(daemon.stdout.readline().strip())
+            latencies, accepted, elapsed = asyncio.run(run_load(socket, means, args))
+        finally:
+            daemon.terminate()
+            daemon.wait()
+
+    total = len(latencies)
+    print(
+        f"{total} requests in {elapsed:.2f} s ({total / elapsed:.0f} req/s, "
+        f"{args.batch} attempts each, {args.connections} connections)"
+    )
+    print(
+        f"latency p50 {np.percentile(latencies, 50):.2f} ms, "
+        f"p99 {np.percentile(latencies, 99):.2f} ms, "
+        f"max {latencies.max():.2f} ms"
+    )
+    print(f"genuine attempts accepted: {accepted / (total * args.batch):.1%}")
+
+
+if __name__ == "__main__":
+    main()
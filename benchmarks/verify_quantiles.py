@@ -0,0 +1,72 @@
+"""Check the native t/F quantiles in ``keyguard.distributions`` against scipy.
+
+Requires the optional ``verify`` extra (scipy). Exits with a non-zero status if
+any quantile on the grid differs from scipy by more than ``1e-9`` relative.
+
+Usage:
+------
+    python -m benchmarks.verify_quantiles
+"""
+
+import sys
+
+import numpy as np
+from scipy.stats import f as f_dist
+from scipy.stats import t as t_dist
+
+from keyguard.distributions import f_ppf, t_ppf
+
+TOLERANCE: float = 1e-9
+PROBABILITIES: tuple[float, ...] = (
+    0.0005, 0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.4,
+    0.6, 0.75, 0.9, 0.95, 0.975, 0.99, 0.995, 0.999, 0.9995,
+)  # fmt: skip
+T_DF: tuple[float, ...] = (
+    *np.linspace(0.5, 3.0, 11),
+    *range(1, 101),
+    *np.geomspace(100, 1e6, 25),
+    *np.random.default_rng(0).uniform(1.0, 300.0, 100),
+)
+F_DF: tuple[float, ...] = (1, 2, 3, 4, 5, 7, 10, 15, 20, 30, 46, 100, 1000, 2.5, 7.3)
+
+
+def relative_error(got: float, expected: float) -> float:
+    """Return the relative error of ``got`` with respect to ``expected``.
+
+    Args:
+        got: the computed value
+        expected: the reference value
+
+    Returns:
+        float: the relative error
+    """
+    return abs(got - expected) / max(abs(expected), 1e-300)
+
+
+def main() -> int:
+    """Compare both quantile functions on a grid and report the worst case.
+
+    Returns:
+        int: the process exit status
+    """
+    worst_t = max(
+        (relative_error(t_ppf(p, df), float(t_dist.ppf(p, df))), p, df)
+        for df in T_DF
+        for p in PROBABILITIES
+    )
+    worst_f = max(
+        (relative_error(f_ppf(p, n, d), float(f_dist.ppf(p, n, d))), p, n, d)
+        for n in F_DF
+        for d in F_DF
+        for p in PROBABILITIES
+    )
+    print(f"t: max relative error {worst_t[0]:.3e} at p={worst_t[1]}, df={worst_t[2]}")
+    print(
+        f"F: max relative error {worst_f[0]:.3e} at p={worst_f[1]}, "
+        f"dfn={worst_f[2]}, dfd={worst_f[3]}"
+    )
+    return int(max(worst_t[0], worst_f[0]) > TOLERANCE)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -20,9 +20,10 @@ from PyQt6.QtCore import Qt
 from PyQt6.QtGui import QFont, QKeySequence, QShortcut
 from PyQt6.QtWidgets import QApplication, QLabel, QMainWindow, QVBoxLayout, QWidget
 
-from keyguard.config import APP_SIZE, APP_TITLE, GLOBAL_STYLESHEET
+from keyguard.config import APP_SIZE, APP_TITLE
+from keyguard.gui.assets import load_fonts
 from keyguard.gui.frames import MainFrame
-from keyguard.utils import load_font
+from keyguard.gui.theme import apply_theme
 
 
 class App(QMainWindow):
@@ -31,10 +32,10 @@ class App(QMainWindow):
     def __init__(self) -> None:
         """Initialize an instance of the App class."""
         super().__init__()
-        load_font()
+        load_fonts()
 
         self.setFont(QFont("IBM Plex Mono"))
-        self.setStyleSheet(GLOBAL_STYLESHEET)
+        apply_theme()
 
         self.setWindowTitle(APP_TITLE)
         self.setFixedSize(APP_SIZE[0], APP_SIZE[1])
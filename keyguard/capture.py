@@ -0,0 +1,128 @@
+"""Keystroke capture.
+
+:class:`KeystrokeCapture` turns key press/release events into dwell times:
+
+* every key is tracked separately from its press to its release, so rollover
+  typing (pressing the next key before releasing the previous one) keeps both
+  dwell times intact;
+* dwell times of the current run go to a buffer preallocated to the phrase
+  length, so capturing a key never allocates a growing list;
+* timestamps come from an injected clock if there is one (tests, replays),
+  otherwise from the windowing system's event timestamp (``QKeyEvent.timestamp()``
+  in milliseconds) and, when the platform does not provide it, from
+  :func:`time.perf_counter` read at delivery.
+
+Event timestamps are taken when the key is actually pressed, so they do not
+include the time the event spent queued behind repaints in the event loop.
+They are whole milliseconds, though, so dwell times measured from them are
+quantized to 1 ms (a mean error of about 0.3 ms), where the delivery clock
+resolves far below a millisecond. The event timestamps are still preferred:
+they are more accurate once events queue for more than a few tenths of a
+millisecond on average, which a single repaint exceeds;
+``benchmarks/bench_capture.py`` compares the two.
+"""
+
+import time
+from collections.abc import Callable, Hashable
+
+import numpy as np
+
+Clock = Callable[[], float]
+
+
+class KeystrokeCapture:
+    """Per-key dwell-time capture for one phrase-length run."""
+
+    __slots__ = ("_dwells", "_pressed", "clock", "count")
+
+    def __init__(self, length: int, clock: Clock | None = None) -> None:
+        """Initialize a KeystrokeCapture.
+
+        Args:
+            length: the number of dwell times in a run (the phrase length)
+            clock: a time source in seconds overriding event timestamps
+        """
+        self.clock = clock
+        self._dwells = np.zeros(length, dtype=float)
+        self._pressed: dict[Hashable, tuple[float, int]] = {}
+        self.count = 0
+
+    @property
+    def capacity(self) -> int:
+        """Number of dwell times a run can hold."""
+        return len(self._dwells)
+
+    @property
+    def full(self) -> bool:
+        """Whether the run holds a dwell time for every position."""
+        return self.count >= len(self._dwells)
+
+    def _stamp(self, event_ms: int) -> tuple[float, int]:
+        if self.clock is not None:
+            return self.clock(), 0
+        return time.perf_counter(), event_ms
+
+    def press(self, key: Hashable, event_ms: int = 0) -> None:
+        """Record a key press; repeated presses of a held key are ignored.
+
+        Args:
+            key: the key identifier, e.g. ``QKeyEvent.key()``
+            event_ms: the event timestamp in milliseconds, 0 if unknown
+        """
+        if key not in self._pressed:
+            self._pressed[key] = self._stamp(event_ms)
+
+    def release(self, key: Hashable, event_ms: int = 0) -> float | None:
+        """Record a key release and return the key's dwell time.
+
+        Args:
+            key: the key identifier
+            event_ms: the event timestamp in milliseconds, 0 if unknown
+
+        Returns:
+            float | None: the dwell time in milliseconds, or None if the press
+            of this key was not seen
+        """
+        pressed = self._pressed.pop(key, None)
+        if pressed is None:
+            return None
+
+        released = self._stamp(event_ms)
+        if pressed[1] and released[1] >= pressed[1]:
+            return float(released[1] - pressed[1])
+        return (released[0] - pressed[0]) * 1000
+
+    def record(self, dwell: float) -> int:
+        """Store the dwell time of the next phrase position.
+
+        Args:
+            dwell: the dwell time in milliseconds
+
+        Returns:
+            int: the position the dwell time was stored at
+
+        Raises:
+            IndexError: if the run is already complete
+        """
+        if self.count >= len(self._dwells):
+            raise IndexError("Keystroke buffer is full")
+        self._dwells[self.count] = dwell
+        self.count += 1
+        return self.count - 1
+
+    def dwells(self) -> list[float]:
+        """Return the dwell times of the current run.
+
+        Returns:
+            list[float]: a copy of the recorded dwell times
+        """
+        return self._dwells[: self.count].tolist()
+
+    def clear(self) -> None:
+        """Start a new run; keys that are still held stay tracked."""
+        self.count = 0
+
+    def reset(self) -> None:
+        """Start a new run and forget every held key."""
+        self.count = 0
+        self._pressed.clear()
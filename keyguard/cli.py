@@ -0,0 +1,447 @@
+"""KeyGuard - Command line interface.
+
+Enrolls and verifies typing samples from recorded keystroke event files (see
+:mod:`keyguard.recording`) without the GUI; PyQt6 is never imported, so it
+runs on servers and in batch jobs. Input files are streamed: events, runs and
+sessions are processed as they are read, so memory use does not depend on the
+size of the recordings.
+
+Usage:
+------
+    keyguard enroll sessions.jsonl [more.csv.gz ...]
+    keyguard verify attempts.jsonl
+    keyguard evaluate genuine.jsonl --impostor others.jsonl [--roc]
+    keyguard tune [--impostor others.jsonl]
+    keyguard rebuild
+    keyguard stats [--positions]
+    keyguard serve [--socket PATH]
+
+Run ``keyguard <command> --help`` for the options of a command.
+"""
+
+import argparse
+import asyncio
+import json
+import sys
+import time
+from collections.abc import Iterable, Iterator
+from pathlib import Path
+from typing import Any, TypeVar
+
+import numpy as np
+
+from keyguard.config import MAX_TRAINING_RUNS, PHRASE
+from keyguard.daemon import DEFAULT_SOCKET, MAX_INFLIGHT, TemplateStore
+from keyguard.daemon import serve as serve_daemon
+from keyguard.database import ProfileDatabase
+from keyguard.evaluation import THRESHOLD_STEPS, sweep
+from keyguard.pipeline import finalize_sessions
+from keyguard.recording import iter_runs, read_events
+from keyguard.template import get_template
+from keyguard.tuning import TARGET_FRR, apply_tuning, tune
+from keyguard.utils import ProfileRepository, create_profile, generate_session_id
+
+SESSION_BATCH: int = 64
+VERIFY_CHUNK: int = 1024
+
+T = TypeVar("T")
+
+
+def _batched(items: Iterable[T], size: int) -> Iterator[list[T]]:
+    """Group an iterable into lists of ``size`` items, the last one shorter."""
+    batch: list[T] = []
+    for item in items:
+        batch.append(item)
+        if len(batch) == size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def _print_json(data: Any) -> None:  # noqa: ANN401
+    """Write one compact JSON line to standard output."""
+    print(json.dumps(data, ensure_ascii=False, separators=(",", ":")))
+
+
+def _load_header(repository: ProfileRepository, filename: str) -> dict[str, Any]:
+    """Load a profile header.
+
+    Raises:
+        SystemExit: if the profile does not exist
+    """
+    if not repository.exists(filename):
+        raise SystemExit(f"keyguard: profile {filename!r} not found")
+    return repository.load(filename, include_sessions=False)
+
+
+def _iter_sessions(
+    files: Iterable[str], phrase: str, runs_per_session: int
+) -> Iterator[dict[str, Any]]:
+    """Stream complete training sessions from recordings.
+
+    Runs of one file are grouped into sessions of ``runs_per_session``; an
+    incomplete trailing session is dropped, like an abandoned GUI session.
+    """
+    for path in files:
+        runs = iter_runs(read_events(path), phrase)
+        for session_runs in _batched(runs, runs_per_session):
+            if len(session_runs) < runs_per_session:
+                print(
+                    f"{path}: dropped {len(session_runs)} runs of an incomplete "
+                    "session",
+                    file=sys.stderr,
+                )
+                continue
+            yield {
+                "session_id": generate_session_id()[:8],
+                "phrase": phrase,
+                "timestamp": int(time.time()),
+                "total_runs": len(session_runs),
+                "accepted_runs": len(session_runs),
+                "runs": session_runs,
+            }
+
+
+def enroll(args: argparse.Namespace, repository: ProfileRepository) -> int:
+    """Add the sessions of the recordings to a profile, creating it if needed.
+
+    Args:
+        args: the parsed arguments
+        repository: the profile repository
+
+    Returns:
+        int: the exit status
+    """
+    if not repository.exists(args.profile):
+        repository.save(create_profile(args.phrase), args.profile)
+    header = _load_header(repository, args.profile)
+
+    sessions = runs = 0
+    sessions_iter = _iter_sessions(args.files, header["phrase"], args.runs_per_session)
+    for batch in _batched(sessions_iter, args.batch):
+        header, cleaned = finalize_sessions(repository, batch, args.profile)
+        sessions += len(cleaned)
+        runs += sum(len(session["runs"]) for session in cleaned)
+
+    _print_json(
+        {
+            "uuid": header.get("uuid"),
+            "sessions": sessions,
+            "accepted_runs": runs,
+            "total_runs": header.get("total_runs", 0),
+        }
+    )
+    return 0
+
+
+def verify(args: argparse.Namespace, repository: ProfileRepository) -> int:
+    """Verify every run of the recordings against a profile.
+
+    Writes one JSON line per attempt and a summary to standard error.
+
+    Args:
+        args: the parsed arguments
+        repository: the profile repository
+
+    Returns:
+        int: 0 if there were attempts and all were accepted, 1 otherwise
+    """
+    header = _load_header(repository, args.profile)
+    template = get_template(header)
+    if not template.positions:
+        raise SystemExit("keyguard: the profile has no enrolled runs")
+
+    attempts = accepted = 0
+    for path in args.files:
+        runs = iter_runs(read_events(path), header["phrase"])
+        for chunk in _batched(runs, VERIFY_CHUNK):
+            score = template.score(np.asarray(chunk), args.threshold_factor)
+            for ok, decision in zip(score.ok, score.accepted, strict=True):
+                _print_json(
+                    {
+                        "file": path,
+                        "attempt": attempts,
+                        "accepted": bool(decision),
+                        "failed_positions": np.flatnonzero(~ok).tolist(),
+                    }
+                )
+                attempts += 1
+                accepted += bool(decision)
+
+    print(f"{accepted}/{attempts} attempts accepted", file=sys.stderr)
+    return 0 if attempts and accepted == attempts else 1
+
+
+def _read_attempts(files: Iterable[str], phrase: str) -> np.ndarray:
+    """Read every accepted run of the recordings into one attempt matrix."""
+    runs = [run for path in files for run in iter_runs(read_events(path), phrase)]
+    return np.array(runs, dtype=float).reshape(len(runs), len(phrase))
+
+
+def evaluate(args: argparse.Namespace, repository: ProfileRepository) -> int:
+    """Print the error rates of a profile on genuine and impostor recordings.
+
+    Writes one JSON line per minimum threshold with the equal error rate and
+    the FAR/FRR at ``--threshold-factor``, and with ``--roc`` the whole curve.
+
+    Args:
+        args: the parsed arguments
+        repository: the profile repository
+
+    Returns:
+        int: the exit status
+    """
+    header = _load_header(repository, args.profile)
+    template = get_template(header)
+    if not template.positions:
+        raise SystemExit("keyguard: the profile has no enrolled runs")
+
+    genuine = _read_attempts(args.files, header["phrase"])
+    impostor = _read_attempts(args.impostor, header["phrase"])
+    factor = args.threshold_factor
+    if factor is None:
+        factor = template.threshold_factor
+    min_thresholds = args.min_threshold or [template.min_threshold]
+    steps = args.steps or None
+    for result in sweep(template, genuine, impostor, min_thresholds, steps):
+        far, frr = result.rates(factor)
+        summary = {
+            "min_threshold": result.min_threshold,
+            "genuine": len(genuine),
+            "impostor": len(impostor),
+            "eer": round(result.eer, 6),
+            "eer_threshold": round(result.eer_threshold, 6),
+            "threshold_factor": factor,
+            "far": round(far, 6),
+            "frr": round(frr, 6),
+        }
+        if args.roc:
+            summary["roc"] = (
+                np.column_stack([result.thresholds, result.far, result.frr])
+                .round(6)
+                .tolist()
+            )
+        _print_json(summary)
+    return 0
+
+
+def tune_thresholds(args: argparse.Namespace, repository: ProfileRepository) -> int:
+    """Choose and store a profile's thresholds by cross-validation.
+
+    Args:
+        args: the parsed arguments
+        repository: the profile repository
+
+    Returns:
+        int: the exit status
+    """
+    header = _load_header(repository, args.profile)
+    store = repository.store(args.profile)
+    sessions = [
+        session["runs"] for session in store.iter_sessions(header, as_arrays=True)
+    ]
+    impostor = None
+    if args.impostor:
+        impostor = _read_attempts(args.impostor, header["phrase"])
+    result = tune(
+        sessions, impostor, args.min_threshold, args.target_frr, workers=args.workers
+    )
+    if not args.dry_run:
+        apply_tuning(header, result)
+        repository.save(header, args.profile)
+    _print_json(result._asdict())
+    return 0
+
+
+def rebuild(args: argparse.Namespace, repository: ProfileRepository) -> int:
+    """Recompute a profile's aggregates from its stored runs.
+
+    Args:
+        args: the parsed arguments
+        repository: the profile repository
+
+    Returns:
+        int: the exit status
+    """
+    _load_header(repository, args.profile)
+    header = repository.rebuild(args.profile)
+    _print_json(
+        {
+            "uuid": header.get("uuid"),
+            "total_runs": header.get("total_runs", 0),
+            "revision": header.get("revision", 0),
+        }
+    )
+    return 0
+
+
+def stats(args: argparse.Namespace, repository: ProfileRepository) -> int:
+    """Print the summary of a profile.
+
+    Args:
+        args: the parsed arguments
+        repository: the profile repository
+
+    Returns:
+        int: the exit status
+    """
+    if not repository.exists(args.profile):
+        raise SystemExit(f"keyguard: profile {args.profile!r} not found")
+    summary = dict(repository.summary(args.profile))
+    if args.positions:
+        template = get_template(_load_header(repository, args.profile))
+        summary["means"] = np.round(template.means, 3).tolist()
+        summary["stddev"] = np.round(np.sqrt(template.variances), 3).tolist()
+    _print_json(summary)
+    return 0
+
+
+def serve(args: argparse.Namespace, repository: ProfileRepository) -> int:
+    """Run the authentication daemon until interrupted.
+
+    Args:
+        args: the parsed arguments
+        repository: the profile repository
+
+    Returns:
+        int: the exit status
+    """
+    if not hasattr(asyncio, "start_unix_server"):
+        raise SystemExit("keyguard: Unix domain sockets are not supported here")
+    database = ProfileDatabase(repository.data_dir / args.database)
+    templates = TemplateStore(database, repository, args.profile)
+    templates.load()
+    socket = args.socket or repository.data_dir / DEFAULT_SOCKET
+    try:
+        asyncio.run(serve_daemon(socket, templates, args.max_inflight))
+    except KeyboardInterrupt:
+        pass
+    finally:
+        database.close()
+    return 0
+
+
+def build_parser() -> argparse.ArgumentParser:
+    """Build the argument parser.
+
+    Returns:
+        argparse.ArgumentParser: the parser with one subcommand per action
+    """
+    parser = argparse.ArgumentParser(
+        prog="keyguard", description="Keystroke dynamics enrollment and verification."
+    )
+    parser.add_argument(
+        "--data-dir", type=Path, help="the profile directory (default: user data)"
+    )
+    parser.add_argument(
+        "--profile", default="profile.json", help="the profile file name"
+    )
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    command = commands.add_parser("enroll", help="train a profile from recordings")
+    command.add_argument("files", nargs="+", help="event files (.jsonl/.csv[.gz], -)")
+    command.add_argument("--phrase", default=PHRASE, help="the phrase of a new profile")
+    command.add_argument(
+        "--runs-per-session", type=int, default=MAX_TRAINING_RUNS, metavar="N"
+    )
+    command.add_argument(
+        "--batch", type=int, default=SESSION_BATCH, help="sessions per commit"
+    )
+    command.set_defaults(handler=enroll)
+
+    command = commands.add_parser("verify", help="verify recorded attempts")
+    command.add_argument("files", nargs="+", help="event files (.jsonl/.csv[.gz], -)")
+    command.add_argument(
+        "--threshold-factor", type=float, help="default: the profile's own"
+    )
+    command.set_defaults(handler=verify)
+
+    command = commands.add_parser("evaluate", help="measure FAR, FRR and EER")
+    command.add_argument("files", nargs="+", help="recordings of the user")
+    command.add_argument(
+        "--impostor", nargs="+", required=True, help="recordings of other people"
+    )
+    command.add_argument(
+        "--threshold-factor", type=float, help="default: the profile's own"
+    )
+    command.add_argument(
+        "--min-threshold",
+        type=float,
+        nargs="+",
+        metavar="MS",
+        help="default: the profile's own",
+    )
+    command.add_argument(
+        "--steps",
+        type=int,
+        default=THRESHOLD_STEPS,
+        help="threshold factors on the curve, 0 for every distinct score",
+    )
+    command.add_argument("--roc", action="store_true", help="print the curve")
+    command.set_defaults(handler=evaluate)
+
+    command = commands.add_parser(
+        "tune", help="choose the profile's thresholds by cross-validation"
+    )
+    command.add_argument("--impostor", nargs="+", help="recordings of other people")
+    command.add_argument(
+        "--target-frr",
+        type=float,
+        default=TARGET_FRR,
+        help="the false rejection rate to stay under",
+    )
+    command.add_argument(
+        "--min-threshold",
+        type=float,
+        nargs="+",
+        metavar="MS",
+        help="the minimum thresholds to try",
+    )
+    command.add_argument("--workers", type=int, help="processes (default: CPUs)")
+    command.add_argument(
+        "--dry-run", action="store_true", help="print the result without saving"
+    )
+    command.set_defaults(handler=tune_thresholds)
+
+    command = commands.add_parser("serve", help="run the authentication daemon")
+    command.add_argument("--socket", type=Path, help="the Unix socket path")
+    command.add_argument(
+        "--database", default="profiles.sqlite3", help="the multi-user database"
+    )
+    command.add_argument("--max-inflight", type=int, default=MAX_INFLIGHT, metavar="N")
+    command.set_defaults(handler=serve)
+
+    command = commands.add_parser("rebuild", help="recompute the profile aggregates")
+    command.set_defaults(handler=rebuild)
+
+    command = commands.add_parser("stats", help="print the profile summary")
+    command.add_argument(
+        "--positions", action="store_true", help="include per-position statistics"
+    )
+    command.set_defaults(handler=stats)
+    return parser
+
+
+def main(argv: list[str] | None = None) -> int:
+    """Run the command line interface.
+
+    Args:
+        argv: the arguments, ``sys.argv[1:]`` by default
+
+    Returns:
+        int: the exit status
+    """
+    args = build_parser().parse_args(argv)
+    repository = ProfileRepository(args.data_dir)
+    try:
+        if args.data_dir is not None:
+            args.data_dir.mkdir(parents=True, exist_ok=True)
+        return args.handler(args, repository)
+    except (OSError, ValueError) as e:
+        print(f"keyguard: {e}", file=sys.stderr)
+        return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -13,6 +13,10 @@ MAX_TRAINING_RUNS: int = 4
 MAX_AUTH_ATTEMPTS: int = 1
 MIN_SESSIONS_FOR_AUTH: int = 4
 MAX_MISTAKES: int = 5
+AUTH_THRESHOLD_FACTOR: float = 2.85
+AUTH_MIN_THRESHOLD: float = 5.0
+
+PAGE_PREWARM_DELAY_MS: int = 1000
 
 FONT_SIZE: dict[str, int] = {
     "xs": 12,  # extra-small (legal fine print)
@@ -0,0 +1,526 @@
+"""Local authentication daemon.
+
+Lets other local programs (a screen locker, a sudo helper) ask whether a
+typing sample belongs to an enrolled user without starting the GUI. The
+daemon listens on a Unix domain socket that only its owner may connect to,
+loads every profile once and keeps a compiled :class:`AuthTemplate` per user
+in memory, so a request costs one vectorized comparison.
+
+Protocol
+--------
+Every message is a frame: a big-endian ``uint32`` payload length followed by
+the payload. A connection may pipeline any number of requests; responses carry
+the request id and can arrive out of order.
+
+Request payload (``>BIBHH`` header, then the user id and the attempts)::
+
+    type        uint8     1 = VERIFY, 2 = RELOAD
+    request_id  uint32    echoed in the response
+    user_len    uint8     length of the UTF-8 user id
+    attempts    uint16    number of attempts (0 for RELOAD)
+    positions   uint16    dwell times per attempt
+    user_id     bytes     empty for the profile file the GUI writes
+    dwells      float32   attempts x positions, big-endian, row-major
+
+Response payload (``>BIBH`` header, then one entry per attempt)::
+
+    type        uint8     0x80 = RESULT
+    request_id  uint32
+    status      uint8     0 = OK, 1 = UNKNOWN_USER, 2 = BAD_REQUEST
+    attempts    uint16
+    accepted    uint8     per attempt, 1 if every position is within threshold
+    failed      uint16    per attempt, number of positions over threshold
+
+Decisions follow :func:`keyguard.logic.calculate_authentication_delta`: an
+attempt is accepted if every ``|dwell - mean|`` is within the user's floored
+threshold: the threshold factor and minimum threshold tuned for the user
+(see :mod:`keyguard.tuning`), or the defaults.
+
+At most ``max_inflight`` requests are processed at once across all
+connections. When that many are pending the daemon stops reading from its
+sockets, so clients that send faster than it answers are held back by the
+socket buffers instead of queueing unbounded work in memory. Large VERIFY
+batches are scored in a thread pool; RELOAD reads the profile stores and is
+always handled on the event loop thread.
+"""
+
+import asyncio
+import logging
+import os
+import struct
+from pathlib import Path
+from typing import Any
+
+import numpy as np
+
+from keyguard.database import ProfileDatabase
+from keyguard.template import AuthTemplate
+from keyguard.utils import ProfileRepository
+
+FRAME = struct.Struct(">I")
+REQUEST = struct.Struct(">BIBHH")
+RESPONSE = struct.Struct(">BIBH")
+DWELL_DTYPE = np.dtype(">f4")
+FAILED_DTYPE = np.dtype(">u2")
+MAX_FRAME: int = 1 << 20
+
+VERIFY: int = 1
+RELOAD: int = 2
+RESULT: int = 0x80
+
+OK: int = 0
+UNKNOWN_USER: int = 1
+BAD_REQUEST: int = 2
+
+# the profile file the GUI writes; database user ids are never empty
+DEFAULT_USER: str = ""
+DEFAULT_SOCKET: str = "keyguard.sock"
+MAX_INFLIGHT: int = 256
+# larger VERIFY batches (attempts x positions) are scored off the event loop
+INLINE_VALUES: int = 16_384
+
+log = logging.getLogger(__name__)
+
+
+def encode_request(
+    request_id: int,
+    user_id: str,
+    attempts: np.ndarray | list[list[float]] | None = None,
+    kind: int = VERIFY,
+) -> bytes:
+    """Build a request frame.
+
+    Args:
+        request_id: the id echoed in the response
+        user_id: the enrolled user
+        attempts: the ``(attempts, positions)`` dwell times, None for RELOAD
+        kind: VERIFY or RELOAD
+
+    Returns:
+        bytes: the framed request
+    """
+    user = user_id.encode()
+    dwells = np.zeros((0, 0)) if attempts is None else np.atleast_2d(attempts)
+    payload = (
+        REQUEST.pack(kind, request_id, len(user), *dwells.shape)
+        + user
+        + dwells.astype(DWELL_DTYPE).tobytes()
+    )
+    return FRAME.pack(len(payload)) + payload
+
+
+def decode_request(payload: bytes) -> tuple[int, int, str, np.ndarray]:
+    """Parse a request payload.
+
+    Args:
+        payload: the frame payload
+
+    Returns:
+        tuple[int, int, str, np.ndarray]: type, request id, user id and the
+        ``(attempts, positions)`` dwell matrix
+
+    Raises:
+        ValueError: if the payload is malformed
+    """
+    try:
+        kind, request_id, user_len, attempts, positions = REQUEST.unpack_from(payload)
+    except struct.error as e:
+        raise ValueError(f"short request: {e}") from e
+    start = REQUEST.size + user_len
+    if len(payload) != start + attempts * positions * DWELL_DTYPE.itemsize:
+        raise ValueError("request length does not match its header")
+    user_id = payload[REQUEST.size : start].decode()
+    dwells = np.frombuffer(payload, DWELL_DTYPE, offset=start)
+    return kind, request_id, user_id, dwells.reshape(attempts, positions)
+
+
+def encode_response(
+    request_id: int,
+    status: int,
+    accepted: np.ndarray | None = None,
+    failed: np.ndarray | None = None,
+) -> bytes:
+    """Build a response frame.
+
+    Args:
+        request_id: the id of the request
+        status: OK, UNKNOWN_USER or BAD_REQUEST
+        accepted: per-attempt decisions
+        failed: per-attempt numbers of positions over threshold
+
+    Returns:
+        bytes: the framed response
+    """
+    count = 0 if accepted is None else len(accepted)
+    payload = RESPONSE.pack(RESULT, request_id, status, count)
+    if count:
+        payload += accepted.astype(np.uint8).tobytes()
+        payload += failed.astype(FAILED_DTYPE).tobytes()
+    return FRAME.pack(len(payload)) + payload
+
+
+def decode_response(payload: bytes) -> tuple[int, int, np.ndarray, np.ndarray]:
+    """Parse a response payload.
+
+    Args:
+        payload: the frame payload
+
+    Returns:
+        tuple[int, int, np.ndarray, np.ndarray]: request id, status, the
+        per-attempt decisions and numbers of failed positions
+    """
+    _, request_id, status, count = RESPONSE.unpack_from(payload)
+    accepted = np.frombuffer(payload, np.uint8, count, RESPONSE.size).astype(bool)
+    failed = np.frombuffer(payload, FAILED_DTYPE, count, RESPONSE.size + count)
+    return request_id, status, accepted, failed
+
+
+async def read_frame(reader: asyncio.StreamReader) -> bytes | None:
+    """Read one frame payload.
+
+    Args:
+        reader: the stream
+
+    Returns:
+        bytes | None: the payload, or None at the end of the stream
+
+    Raises:
+        ValueError: if the frame is larger than MAX_FRAME
+    """
+    try:
+        (length,) = FRAME.unpack(await reader.readexactly(FRAME.size))
+        if length > MAX_FRAME:
+            raise ValueError(f"frame of {length} bytes exceeds {MAX_FRAME}")
+        return await reader.readexactly(length)
+    except asyncio.IncompleteReadError:
+        return None
+
+
+class TemplateStore:
+    """Compiled templates of every enrolled user, loaded once.
+
+    Users come from the multi-user profile database and, under the empty
+    ``DEFAULT_USER`` id no database user can have, from the single-profile
+    files the GUI writes.
+    """
+
+    def __init__(
+        self,
+        database: ProfileDatabase | None = None,
+        repository: ProfileRepository | None = None,
+        filename: str = "profile.json",
+    ) -> None:
+        """Initialize a TemplateStore.
+
+        Args:
+            database: the multi-user profile database
+            repository: the file profile repository
+            filename: the name of the file profile
+        """
+        self.database = database
+        self.repository = repository
+        self.filename = filename
+        self._templates: dict[str, AuthTemplate] = {}
+
+    def __len__(self) -> int:
+        """Return the number of loaded users."""
+        return len(self._templates)
+
+    def get(self, user_id: str) -> AuthTemplate | None:
+        """Return a user's template.
+
+        Args:
+            user_id: the user id
+
+        Returns:
+            AuthTemplate | None: the template, None if the user is unknown
+        """
+        return self._templates.get(user_id)
+
+    def add(self, user_id: str, profile: dict[str, Any]) -> None:
+        """Compile and keep the template of a profile.
+
+        Args:
+            user_id: the user id
+            profile: the profile header
+        """
+        template = AuthTemplate.from_profile(profile)
+        if template.positions:
+            self._templates[user_id] = template
+        else:
+            self._templates.pop(user_id, None)
+
+    def load(self) -> int:
+        """Load every user, replacing the loaded templates.
+
+        Returns:
+            int: the number of users with a template
+        """
+        self._templates.clear()
+        if self.database is not None:
+            for user_id in self.database.users():
+                self.add(user_id, self.database.load_header(user_id))
+        if self.repository is not None:
+            self.reload(DEFAULT_USER)
+        return len(self._templates)
+
+    def reload(self, user_id: str) -> bool:
+        """Re-read one user's profile.
+
+        Args:
+            user_id: the user id
+
+        Returns:
+            bool: whether the user has a template now
+        """
+        self._templates.pop(user_id, None)
+        if user_id == DEFAULT_USER and self.repository is not None:
+            if self.repository.exists(self.filename):
+                self.repository.invalidate(self.filename)
+                self.add(user_id, self.repository.load(self.filename, False))
+        elif self.database is not None and self.database.exists(user_id):
+            self.add(user_id, self.database.load_header(user_id))
+        return user_id in self._templates
+
+
+class AuthServer:
+    """Answers framed verify requests on a Unix domain socket."""
+
+    def __init__(
+        self,
+        templates: TemplateStore,
+        max_inflight: int = MAX_INFLIGHT,
+        threshold_factor: float | None = None,
+    ) -> None:
+        """Initialize an AuthServer.
+
+        Args:
+            templates: the loaded templates
+            max_inflight: the number of requests processed at once
+            threshold_factor: the number of standard deviations allowed for
+                every user, each user's own if omitted
+        """
+        self.templates = templates
+        self.threshold_factor = threshold_factor
+        self._slots = asyncio.Semaphore(max_inflight)
+        self._server: asyncio.AbstractServer | None = None
+
+    async def start(self, path: str | Path) -> asyncio.AbstractServer:
+        """Listen on a socket path readable and writable only by the owner.
+
+        Args:
+            path: the socket path
+
+        Returns:
+            asyncio.AbstractServer: the listening server
+        """
+        old_umask = os.umask(0o177)
+        try:
+            self._server = await asyncio.start_unix_server(self._serve_client, path)
+        finally:
+            os.umask(old_umask)
+        return self._server
+
+    async def close(self) -> None:
+        """Stop listening and wait for the connections to close."""
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+
+    def respond(self, payload: bytes) -> bytes:
+        """Process one request payload.
+
+        Args:
+            payload: the frame payload
+
+        Returns:
+            bytes: the framed response
+        """
+        try:
+            kind, request_id, user_id, attempts = decode_request(payload)
+        except (ValueError, UnicodeDecodeError):
+            request_id = int.from_bytes(payload[1:5]) if len(payload) >= 5 else 0
+            return encode_response(request_id, BAD_REQUEST)
+
+        if kind == RELOAD:
+            if attempts.size:
+                return encode_response(request_id, BAD_REQUEST)
+            found = self.templates.reload(user_id)
+            return encode_response(request_id, OK if found else UNKNOWN_USER)
+
+        if kind != VERIFY:
+            return encode_response(request_id, BAD_REQUEST)
+        template = self.templates.get(user_id)
+        if template is None:
+            return encode_response(request_id, UNKNOWN_USER)
+        if attempts.shape[1] != template.positions:
+            return encode_response(request_id, BAD_REQUEST)
+
+        score = template.score(attempts, self.threshold_factor)
+        return encode_response(request_id, OK, score.accepted, (~score.ok).sum(axis=1))
+
+    async def _handle(
+        self, payload: bytes, writer: asyncio.StreamWriter, drain: asyncio.Lock
+    ) -> None:
+        """Answer one request and release its slot.
+
+        Only VERIFY requests are moved to the thread pool: the profile stores
+        RELOAD reads from are bound to the event loop thread.
+        """
+        try:
+            try:
+                if (
+                    payload[:1] == bytes([VERIFY])
+                    and len(payload) > INLINE_VALUES * DWELL_DTYPE.itemsize
+                ):
+                    loop = asyncio.get_running_loop()
+                    response = await loop.run_in_executor(None, self.respond, payload)
+                else:
+                    response = self.respond(payload)
+            except Exception:
+                log.exception("failed to process a request")
+                request_id = int.from_bytes(payload[1:5]) if len(payload) >= 5 else 0
+                response = encode_response(request_id, BAD_REQUEST)
+            if not writer.is_closing():
+                writer.write(response)
+                async with drain:
+                    await writer.drain()
+        except ConnectionError:
+            pass
+        finally:
+            self._slots.release()
+
+    async def _serve_client(
+        self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter
+    ) -> None:
+        """Read the requests of one connection until it closes."""
+        drain = asyncio.Lock()
+        tasks: set[asyncio.Task] = set()
+        try:
+            while True:
+                # no free slot: stop reading, the socket buffers push back
+                await self._slots.acquire()
+                try:
+                    payload = await read_frame(reader)
+                except (ValueError, ConnectionError):
+                    payload = None
+                if payload is None:
+                    self._slots.release()
+                    break
+                task = asyncio.create_task(self._handle(payload, writer, drain))
+                tasks.add(task)
+                task.add_done_callback(tasks.discard)
+            if tasks:
+                await asyncio.gather(*tasks)
+        finally:
+            writer.close()
+
+
+class AuthClient:
+    """Pipelining client of the authentication daemon."""
+
+    def __init__(self) -> None:
+        """Initialize an AuthClient; call :meth:`connect` before use."""
+        self._reader: asyncio.StreamReader | None = None
+        self._writer: asyncio.StreamWriter | None = None
+        self._pending: dict[int, asyncio.Future] = {}
+        self._next_id = 0
+        self._receiver: asyncio.Task | None = None
+
+    async def connect(self, path: str | Path) -> None:
+        """Connect to the daemon.
+
+        Args:
+            path: the socket path
+        """
+        self._reader, self._writer = await asyncio.open_unix_connection(path)
+        self._receiver = asyncio.create_task(self._receive())
+
+    async def _receive(self) -> None:
+        """Resolve pending requests as their responses arrive."""
+        try:
+            while (payload := await read_frame(self._reader)) is not None:
+                response = decode_response(payload)
+                future = self._pending.pop(response[0], None)
+                if future is not None and not future.done():
+                    future.set_result(response[1:])
+        finally:
+            for future in self._pending.values():
+                if not future.done():
+                    future.set_exception(ConnectionError("daemon closed"))
+            self._pending.clear()
+
+    async def request(
+        self,
+        user_id: str,
+        attempts: np.ndarray | list[list[float]] | None = None,
+        kind: int = VERIFY,
+    ) -> tuple[int, np.ndarray, np.ndarray]:
+        """Send a request and wait for its response.
+
+        Args:
+            user_id: the enrolled user
+            attempts: the ``(attempts, positions)`` dwell times
+            kind: VERIFY or RELOAD
+
+        Returns:
+            tuple[int, np.ndarray, np.ndarray]: the status, the per-attempt
+            decisions and numbers of failed positions
+        """
+        self._next_id = (self._next_id + 1) & 0xFFFFFFFF
+        future = asyncio.get_running_loop().create_future()
+        self._pending[self._next_id] = future
+        self._writer.write(encode_request(self._next_id, user_id, attempts, kind))
+        await self._writer.drain()
+        return await future
+
+    async def verify(
+        self, user_id: str, attempts: np.ndarray | list[list[float]]
+    ) -> np.ndarray:
+        """Verify attempts of a user.
+
+        Args:
+            user_id: the enrolled user
+            attempts: the ``(attempts, positions)`` dwell times
+
+        Returns:
+            np.ndarray: per-attempt decisions
+
+        Raises:
+            LookupError: if the user is unknown
+            ValueError: if the daemon rejected the request
+        """
+        status, accepted, _ = await self.request(user_id, attempts)
+        if status == UNKNOWN_USER:
+            raise LookupError(f"unknown user {user_id!r}")
+        if status != OK:
+            raise ValueError("bad request")
+        return accepted
+
+    async def close(self) -> None:
+        """Close the connection."""
+        if self._writer is not None:
+            self._writer.close()
+            await self._writer.wait_closed()
+        if self._receiver is not None:
+            await self._receiver
+
+
+async def serve(
+    path: str | Path, templates: TemplateStore, max_inflight: int = MAX_INFLIGHT
+) -> None:
+    """Run the daemon until it is cancelled.
+
+    Args:
+        path: the socket path
+        templates: the loaded templates
+        max_inflight: the number of requests processed at once
+    """
+    server = AuthServer(templates, max_inflight)
+    listener = await server.start(path)
+    print(f"Serving {len(templates)} users on {path}", flush=True)
+    try:
+        async with listener:
+            await listener.serve_forever()
+    finally:
+        Path(path).unlink(missing_ok=True)
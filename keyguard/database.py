@@ -0,0 +1,317 @@
+"""SQLite-backed multi-user profile storage.
+
+Where :class:`keyguard.storage.ProfileStore` keeps exactly one profile per set
+of files, :class:`ProfileDatabase` keeps any number of them in one SQLite file,
+keyed by a user id:
+
+* ``profiles`` -- one row per user: the JSON header (everything except the
+  session history) plus ``uuid`` and ``phrase`` columns, both indexed.
+* ``sessions`` -- one row per session with its JSON metadata.
+* ``runs`` -- the dwell runs of a session as a single float32 blob
+  (``runs x positions``), like a slice of the on-disk run matrix.
+
+The database runs in WAL mode, so readers never block the writer, and every
+write is a single transaction. All SQL is kept in module constants and executed
+through the connection's statement cache, so each statement is prepared once.
+"""
+
+import json
+import sqlite3
+from collections.abc import Iterator
+from pathlib import Path
+from types import TracebackType
+from typing import Any
+
+import numpy as np
+
+from keyguard.logic import rebuild_profile_from_history, update_aggregate_profile
+from keyguard.storage import FORMAT_VERSION, RUN_DTYPE, profile_summary
+
+SCHEMA: str = """
+CREATE TABLE IF NOT EXISTS profiles (
+    user_id TEXT PRIMARY KEY,
+    uuid TEXT NOT NULL,
+    phrase TEXT NOT NULL,
+    header TEXT NOT NULL
+);
+CREATE UNIQUE INDEX IF NOT EXISTS profiles_uuid ON profiles (uuid);
+CREATE INDEX IF NOT EXISTS profiles_phrase ON profiles (phrase);
+CREATE TABLE IF NOT EXISTS sessions (
+    id INTEGER PRIMARY KEY,
+    user_id TEXT NOT NULL REFERENCES profiles (user_id) ON DELETE CASCADE,
+    data TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS sessions_user ON sessions (user_id, id);
+CREATE TABLE IF NOT EXISTS runs (
+    session_id INTEGER PRIMARY KEY REFERENCES sessions (id) ON DELETE CASCADE,
+    positions INTEGER NOT NULL,
+    data BLOB NOT NULL
+);
+"""
+
+_SELECT_HEADER = "SELECT header FROM profiles WHERE user_id = ?"
+_SELECT_EXISTS = "SELECT 1 FROM profiles WHERE user_id = ?"
+_SELECT_BY_UUID = "SELECT user_id FROM profiles WHERE uuid = ?"
+_SELECT_BY_PHRASE = "SELECT user_id FROM profiles WHERE phrase = ? ORDER BY user_id"
+_SELECT_USERS = "SELECT user_id FROM profiles ORDER BY user_id"
+_SELECT_SESSIONS = """
+SELECT sessions.data, runs.positions, runs.data
+FROM sessions LEFT JOIN runs ON runs.session_id = sessions.id
+WHERE sessions.user_id = ? ORDER BY sessions.id
+"""
+_UPSERT_PROFILE = """
+INSERT INTO profiles (user_id, uuid, phrase, header) VALUES (?, ?, ?, ?)
+ON CONFLICT (user_id) DO UPDATE SET
+    uuid = excluded.uuid, phrase = excluded.phrase, header = excluded.header
+"""
+_INSERT_SESSION = "INSERT INTO sessions (user_id, data) VALUES (?, ?)"
+_INSERT_RUNS = "INSERT INTO runs (session_id, positions, data) VALUES (?, ?, ?)"
+_DELETE_SESSIONS = "DELETE FROM sessions WHERE user_id = ?"
+_DELETE_PROFILE = "DELETE FROM profiles WHERE user_id = ?"
+
+
+class ProfileDatabase:
+    """Profiles of many users in one SQLite database."""
+
+    def __init__(self, path: Path | str) -> None:
+        """Initialize a ProfileDatabase, creating the schema if needed.
+
+        Args:
+            path: the database file, or ``":memory:"``
+        """
+        self.path = path
+        self._conn = sqlite3.connect(path, cached_statements=64)
+        self._conn.execute("PRAGMA journal_mode = WAL")
+        self._conn.execute("PRAGMA synchronous = NORMAL")
+        self._conn.execute("PRAGMA foreign_keys = ON")
+        with self._conn:
+            self._conn.executescript(SCHEMA)
+
+    def __enter__(self) -> "ProfileDatabase":
+        """Return the database itself."""
+        return self
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc: BaseException | None,
+        tb: TracebackType | None,
+    ) -> None:
+        """Close the database."""
+        self.close()
+
+    def close(self) -> None:
+        """Close the connection."""
+        self._conn.close()
+
+    def exists(self, user_id: str) -> bool:
+        """Check whether a user has a profile.
+
+        Args:
+            user_id: the user id
+
+        Returns:
+            bool: True if the profile exists
+        """
+        return self._conn.execute(_SELECT_EXISTS, (user_id,)).fetchone() is not None
+
+    def users(self) -> list[str]:
+        """Return every user id.
+
+        Returns:
+            list[str]: the user ids, sorted
+        """
+        return [row[0] for row in self._conn.execute(_SELECT_USERS)]
+
+    def find_by_uuid(self, profile_uuid: str) -> str | None:
+        """Look up the user owning a profile uuid.
+
+        Args:
+            profile_uuid: the profile uuid
+
+        Returns:
+            str | None: the user id, or None if no profile has this uuid
+        """
+        row = self._conn.execute(_SELECT_BY_UUID, (profile_uuid,)).fetchone()
+        return row[0] if row else None
+
+    def find_by_phrase(self, phrase: str) -> list[str]:
+        """Return the users enrolled with a phrase.
+
+        Args:
+            phrase: the phrase
+
+        Returns:
+            list[str]: the user ids, sorted
+        """
+        return [row[0] for row in self._conn.execute(_SELECT_BY_PHRASE, (phrase,))]
+
+    def load_header(self, user_id: str) -> dict[str, Any]:
+        """Read a profile header.
+
+        Args:
+            user_id: the user id
+
+        Returns:
+            dict[str, Any]: the header, without the session history
+
+        Raises:
+            KeyError: if the user has no profile
+        """
+        row = self._conn.execute(_SELECT_HEADER, (user_id,)).fetchone()
+        if row is None:
+            raise KeyError(user_id)
+        return json.loads(row[0])
+
+    def load_summary(self, user_id: str) -> dict[str, Any]:
+        """Read the summary fields of a profile.
+
+        Args:
+            user_id: the user id
+
+        Returns:
+            dict[str, Any]: see :func:`keyguard.storage.profile_summary`
+        """
+        return profile_summary(self.load_header(user_id))
+
+    def iter_sessions(self, user_id: str, as_arrays: bool = False) -> Iterator[dict]:
+        """Stream the sessions of a profile.
+
+        Args:
+            user_id: the user id
+            as_arrays: give ``runs`` as float32 arrays instead of lists
+
+        Yields:
+            dict: the sessions in the order they were saved
+        """
+        for data, positions, blob in self._conn.execute(_SELECT_SESSIONS, (user_id,)):
+            session = json.loads(data)
+            runs = _decode_runs(positions, blob)
+            session["runs"] = runs if as_arrays else runs.astype(float).tolist()
+            yield session
+
+    def runs(self, user_id: str) -> np.ndarray:
+        """Return every stored run of a profile as one matrix.
+
+        Args:
+            user_id: the user id
+
+        Returns:
+            np.ndarray: the ``(runs, positions)`` float32 matrix
+        """
+        blocks = [
+            _decode_runs(positions, blob)
+            for _, positions, blob in self._conn.execute(_SELECT_SESSIONS, (user_id,))
+            if blob
+        ]
+        if not blocks:
+            return np.empty((0, 0), dtype=RUN_DTYPE)
+        return np.concatenate(blocks)
+
+    def load(self, user_id: str, include_sessions: bool = True) -> dict[str, Any]:
+        """Read a profile.
+
+        Args:
+            user_id: the user id
+            include_sessions: whether to read the session history as well
+
+        Returns:
+            dict[str, Any]: the profile data
+        """
+        profile = self.load_header(user_id)
+        if include_sessions:
+            profile["sessions"] = list(self.iter_sessions(user_id))
+        return profile
+
+    def save(self, user_id: str, profile: dict[str, Any]) -> None:
+        """Write a profile.
+
+        If ``profile`` holds a ``sessions`` list, the stored sessions are
+        replaced by it and the aggregates are rebuilt from the stored float32
+        runs. Otherwise only the header is replaced.
+
+        Args:
+            user_id: the user id, not empty
+            profile: the profile data
+
+        Raises:
+            ValueError: if the user id is empty
+        """
+        if not user_id:
+            raise ValueError("user id must not be empty")
+        header = {k: v for k, v in profile.items() if k != "sessions"}
+        with self._conn:
+            if "sessions" in profile:
+                self._conn.execute(_DELETE_SESSIONS, (user_id,))
+                self._write_header(user_id, header)
+                for session in profile["sessions"]:
+                    self._insert(user_id, session)
+                header["session_count"] = len(profile["sessions"])
+                rebuild_profile_from_history(header, runs=self.runs(user_id))
+            self._write_header(user_id, header)
+
+    def append_session(
+        self, user_id: str, header: dict[str, Any], session: dict[str, Any]
+    ) -> None:
+        """Append a session and fold it into the aggregates.
+
+        ``header`` is updated in place, including its ``sessions`` list if it
+        has one.
+
+        Args:
+            user_id: the user id
+            header: the current profile header
+            session: the session data
+        """
+        with self._conn:
+            stored = self._insert(user_id, session)
+            update_aggregate_profile(header, {"runs": stored})
+            header["session_count"] = header.get("session_count", 0) + 1
+            if "sessions" in header:
+                header["sessions"].append(session)
+            self._write_header(user_id, header)
+
+    def delete(self, user_id: str) -> None:
+        """Remove a profile with its sessions and runs.
+
+        Args:
+            user_id: the user id
+        """
+        with self._conn:
+            self._conn.execute(_DELETE_PROFILE, (user_id,))
+
+    def _insert(self, user_id: str, session: dict[str, Any]) -> np.ndarray:
+        """Write a session and its runs; return the stored runs."""
+        runs = np.asarray(session.get("runs", []), dtype=RUN_DTYPE)
+        record = {k: v for k, v in session.items() if k != "runs"}
+        cursor = self._conn.execute(
+            _INSERT_SESSION,
+            (user_id, json.dumps(record, ensure_ascii=False, separators=(",", ":"))),
+        )
+        if not len(runs):
+            return np.empty((0, 0))
+        runs = runs.reshape(len(runs), -1)
+        self._conn.execute(
+            _INSERT_RUNS, (cursor.lastrowid, runs.shape[1], runs.tobytes())
+        )
+        return runs.astype(float)
+
+    def _write_header(self, user_id: str, header: dict[str, Any]) -> None:
+        header["format"] = FORMAT_VERSION
+        header.setdefault("session_count", 0)
+        fields = {k: v for k, v in header.items() if k != "sessions"}
+        self._conn.execute(
+            _UPSERT_PROFILE,
+            (
+                user_id,
+                str(header.get("uuid", user_id)),
+                header.get("phrase", ""),
+                json.dumps(fields, ensure_ascii=False),
+            ),
+        )
+
+
+def _decode_runs(positions: int | None, blob: bytes | None) -> np.ndarray:
+    if not blob:
+        return np.empty((0, positions or 0), dtype=RUN_DTYPE)
+    return np.frombuffer(blob, dtype=RUN_DTYPE).reshape(-1, positions)
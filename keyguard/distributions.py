@@ -0,0 +1,390 @@
+"""Inverse CDFs of the Student-t and Fisher-F distributions.
+
+Self-contained replacements for ``scipy.stats.t.ppf`` and ``scipy.stats.f.ppf``
+so that the statistics code does not pull scipy into the application start-up.
+Both are expressed through the regularized incomplete beta function: an initial
+estimate of its inverse is polished with Halley steps, and the resulting
+quantile is refined with Newton steps on the distribution's own tail
+probability. Results agree with scipy to a relative error below ``1e-9``.
+"""
+
+import math
+
+_EPS: float = 1e-15
+_INV_EPS: float = 1e-12
+_TINY: float = 1e-300
+_MAX_ITER: int = 300
+_INV_MAX_ITER: int = 64
+
+
+_STIRLING_MIN: float = 100.0
+_ASYMPTOTIC_DF: float = 30.0
+
+
+def _stirling_correction(x: float) -> float:
+    """Tail of the Stirling series for ``lgamma(x)``, accurate for large ``x``."""
+    x2 = x * x
+    return (1.0 / 12.0 - (1.0 / 360.0 - 1.0 / (1260.0 * x2)) / x2) / x
+
+
+def _log_beta(a: float, b: float) -> float:
+    a, b = max(a, b), min(a, b)
+    if a < _STIRLING_MIN:
+        return math.lgamma(a) + math.lgamma(b) - math.lgamma(a + b)
+
+    # lgamma(a) - lgamma(a + b) cancels badly for large a; expand it instead
+    diff = (
+        -(a + b - 0.5) * math.log1p(b / a)
+        - b * math.log(a)
+        + b
+        + _stirling_correction(a)
+        - _stirling_correction(a + b)
+    )
+    if b >= _STIRLING_MIN:
+        # both large: expand lgamma(b) as well
+        return (
+            diff
+            + (b - 0.5) * math.log(b)
+            - b
+            + 0.5 * math.log(2.0 * math.pi)
+            + _stirling_correction(b)
+        )
+    return math.lgamma(b) + diff
+
+
+def _beta_cf(a: float, b: float, x: float) -> float:
+    """Continued fraction of the incomplete beta function (modified Lentz)."""
+    qab, qap, qam = a + b, a + 1.0, a - 1.0
+    c = 1.0
+    d = 1.0 - qab * x / qap
+    d = 1.0 / (d if abs(d) > _TINY else _TINY)
+    h = d
+    for m in range(1, _MAX_ITER + 1):
+        m2 = 2 * m
+        aa = m * (b - m) * x / ((qam + m2) * (a + m2))
+        d = 1.0 + aa * d
+        d = 1.0 / (d if abs(d) > _TINY else _TINY)
+        c = 1.0 + aa / c
+        c = c if abs(c) > _TINY else _TINY
+        h *= d * c
+
+        aa = -(a + m) * (qab + m) * x / ((a + m2) * (qap + m2))
+        d = 1.0 + aa * d
+        d = 1.0 / (d if abs(d) > _TINY else _TINY)
+        c = 1.0 + aa / c
+        c = c if abs(c) > _TINY else _TINY
+        delta = d * c
+        h *= delta
+        if abs(delta - 1.0) < _EPS:
+            break
+    return h
+
+
+def betainc(a: float, b: float, x: float) -> float:
+    """Regularized incomplete beta function ``I_x(a, b)``.
+
+    Args:
+        a: the first shape parameter
+        b: the second shape parameter
+        x: the upper integration limit, in ``[0, 1]``
+
+    Returns:
+        float: the value of ``I_x(a, b)``
+    """
+    if x <= 0.0:
+        return 0.0
+    if x >= 1.0:
+        return 1.0
+
+    log_front = a * math.log(x) + b * math.log1p(-x) - _log_beta(a, b)
+    if x < (a + 1.0) / (a + b + 2.0):
+        return math.exp(log_front) * _beta_cf(a, b, x) / a
+    return 1.0 - math.exp(log_front) * _beta_cf(b, a, 1.0 - x) / b
+
+
+def betaincinv(a: float, b: float, p: float) -> float:
+    """Inverse of the regularized incomplete beta function in ``x``.
+
+    Args:
+        a: the first shape parameter
+        b: the second shape parameter
+        p: the probability, in ``[0, 1]``
+
+    Returns:
+        float: ``x`` such that ``I_x(a, b) == p``
+    """
+    if p <= 0.0:
+        return 0.0
+    if p >= 1.0:
+        return 1.0
+
+    x = _betaincinv_guess(a, b, p)
+
+    # Halley iterations on I_x(a, b) - p; callers polish the final digits
+    a1, b1 = a - 1.0, b - 1.0
+    log_norm = -_log_beta(a, b)
+    for _ in range(_INV_MAX_ITER):
+        if x <= 0.0 or x >= 1.0:
+            break
+        err = betainc(a, b, x) - p
+        density = math.exp(a1 * math.log(x) + b1 * math.log1p(-x) + log_norm)
+        u = err / density
+        step = u / (1.0 - 0.5 * min(1.0, u * (a1 / x - b1 / (1.0 - x))))
+        x_new = x - step
+        if x_new <= 0.0:
+            x_new = 0.5 * x
+        elif x_new >= 1.0:
+            x_new = 0.5 * (x + 1.0)
+        if abs(x_new - x) <= _INV_EPS * x:
+            return x_new
+        x = x_new
+    return x
+
+
+def _betaincinv_guess(a: float, b: float, p: float) -> float:
+    """Initial estimate for :func:`betaincinv` (Numerical Recipes, 6.4)."""
+    if a >= 1.0 and b >= 1.0:
+        pp = p if p < 0.5 else 1.0 - p
+        t = math.sqrt(-2.0 * math.log(pp))
+        x = (2.30753 + t * 0.27061) / (1.0 + t * (0.99229 + t * 0.04481)) - t
+        if p < 0.5:
+            x = -x
+        al = (x * x - 3.0) / 6.0
+        h = 2.0 / (1.0 / (2.0 * a - 1.0) + 1.0 / (2.0 * b - 1.0))
+        w = x * math.sqrt(al + h) / h - (
+            1.0 / (2.0 * b - 1.0) - 1.0 / (2.0 * a - 1.0)
+        ) * (al + 5.0 / 6.0 - 2.0 / (3.0 * h))
+        x = a / (a + b * math.exp(2.0 * w))
+    else:
+        lna = math.log(a / (a + b))
+        lnb = math.log(b / (a + b))
+        t = math.exp(a * lna) / a
+        u = math.exp(b * lnb) / b
+        w = t + u
+        if p < t / w:
+            x = (a * w * p) ** (1.0 / a)
+        else:
+            x = 1.0 - (b * w * (1.0 - p)) ** (1.0 / b)
+    return x
+
+
+def _t_sf(t: float, df: float) -> float:
+    """Upper tail probability of Student's t for ``t >= 0``."""
+    return 0.5 * betainc(df / 2.0, 0.5, df / (df + t * t))
+
+
+def _t_centre(t: float, df: float) -> float:
+    """Probability mass of Student's t between ``0`` and ``t >= 0``."""
+    return 0.5 * betainc(0.5, df / 2.0, t * t / (df + t * t))
+
+
+def _t_pdf(t: float, df: float) -> float:
+    log_pdf = (
+        -_log_beta(df / 2.0, 0.5)
+        - 0.5 * math.log(df)
+        - (df + 1.0) / 2.0 * math.log1p(t * t / df)
+    )
+    return math.exp(log_pdf)
+
+
+def _norm_ppf(q: float) -> float:
+    """Lower-tail standard normal quantile for ``0 < q <= 0.5`` (Acklam)."""
+    if q < 0.02425:
+        r = math.sqrt(-2.0 * math.log(q))
+        return (
+            (
+                (
+                    (
+                        (-7.784894002430293e-03 * r - 3.223964580411365e-01) * r
+                        - 2.400758277161838e00
+                    )
+                    * r
+                    - 2.549732539343734e00
+                )
+                * r
+                + 4.374664141464968e00
+            )
+            * r
+            + 2.938163982698783e00
+        ) / (
+            (
+                (
+                    (7.784695709041462e-03 * r + 3.224671290700398e-01) * r
+                    + 2.445134137142996e00
+                )
+                * r
+                + 3.754408661907416e00
+            )
+            * r
+            + 1.0
+        )
+    u = q - 0.5
+    r = u * u
+    return (
+        (
+            (
+                (
+                    (
+                        (-3.969683028665376e01 * r + 2.209460984245205e02) * r
+                        - 2.759285104469687e02
+                    )
+                    * r
+                    + 1.383577518672690e02
+                )
+                * r
+                - 3.066479806614716e01
+            )
+            * r
+            + 2.506628277459239e00
+        )
+        * u
+    ) / (
+        (
+            (
+                (
+                    (-5.447609879822406e01 * r + 1.615858368580409e02) * r
+                    - 1.556989798598866e02
+                )
+                * r
+                + 6.680131188771972e01
+            )
+            * r
+            - 1.328068155288572e01
+        )
+        * r
+        + 1.0
+    )
+
+
+def _t_asymptotic(q: float, df: float) -> float:
+    """Upper ``q`` quantile of Student's t from its large-df expansion."""
+    z = -_norm_ppf(q)
+    z2 = z * z
+    g1 = (z2 + 1.0) * z / 4.0
+    g2 = ((5.0 * z2 + 16.0) * z2 + 3.0) * z / 96.0
+    g3 = (((3.0 * z2 + 19.0) * z2 + 17.0) * z2 - 15.0) * z / 384.0
+    g4 = (
+        ((((79.0 * z2 + 776.0) * z2 + 1482.0) * z2 - 1920.0) * z2 - 945.0) * z / 92160.0
+    )
+    return z + (g1 + (g2 + (g3 + g4 / df) / df) / df) / df
+
+
+def _t_start(q: float, c: float, df: float) -> float:
+    """Initial estimate of the upper ``q`` quantile (``c = 0.5 - q``)."""
+    if df >= _ASYMPTOTIC_DF:
+        return _t_asymptotic(q, df)
+    if 2.0 * q < 0.5:
+        # tail: solve for x = df / (df + t^2)
+        x = betaincinv(df / 2.0, 0.5, 2.0 * q)
+        return math.sqrt(df * (1.0 - x) / x)
+    # centre: solve for y = t^2 / (df + t^2)
+    y = betaincinv(0.5, df / 2.0, 2.0 * c)
+    return math.sqrt(df * y / (1.0 - y))
+
+
+def t_ppf(p: float, df: float) -> float:
+    """Inverse CDF (percent point function) of Student's t-distribution.
+
+    Args:
+        p: the probability
+        df: the degrees of freedom, possibly fractional
+
+    Returns:
+        float: the ``p`` quantile
+    """
+    if math.isnan(p) or math.isnan(df) or df <= 0 or not 0.0 <= p <= 1.0:
+        return math.nan
+    if p == 0.0:
+        return -math.inf
+    if p == 1.0:
+        return math.inf
+    if p == 0.5:
+        return 0.0
+
+    q = min(p, 1.0 - p)
+    c = abs(p - 0.5)
+    tail = 2.0 * q < 0.5
+    t = _t_start(q, c, df)
+
+    # Newton refinement on the tail mass, or on the central mass near the median
+    for _ in range(8):
+        density = _t_pdf(t, df)
+        if density <= 0.0:
+            break
+        if tail:
+            step = (_t_sf(t, df) - q) / density
+        else:
+            step = (c - _t_centre(t, df)) / density
+        t += step
+        if abs(step) <= _INV_EPS * t:
+            break
+
+    return t if p > 0.5 else -t
+
+
+def _f_tail(f: float, dfn: float, dfd: float) -> tuple[float, float]:
+    """Return the lower and upper tail probabilities of F at ``f``."""
+    x = dfn * f / (dfn * f + dfd)
+    if x < 0.5:
+        cdf = betainc(dfn / 2.0, dfd / 2.0, x)
+        return cdf, 1.0 - cdf
+    sf = betainc(dfd / 2.0, dfn / 2.0, dfd / (dfn * f + dfd))
+    return 1.0 - sf, sf
+
+
+def _f_pdf(f: float, dfn: float, dfd: float) -> float:
+    log_pdf = (
+        0.5 * dfn * math.log(dfn / dfd)
+        + (0.5 * dfn - 1.0) * math.log(f)
+        - 0.5 * (dfn + dfd) * math.log1p(dfn * f / dfd)
+        - _log_beta(dfn / 2.0, dfd / 2.0)
+    )
+    return math.exp(log_pdf)
+
+
+def f_ppf(p: float, dfn: float, dfd: float) -> float:
+    """Inverse CDF (percent point function) of Fisher's F-distribution.
+
+    Args:
+        p: the probability
+        dfn: the numerator degrees of freedom
+        dfd: the denominator degrees of freedom
+
+    Returns:
+        float: the ``p`` quantile
+    """
+    if (
+        math.isnan(p)
+        or dfn <= 0
+        or dfd <= 0
+        or not 0.0 <= p <= 1.0
+        or math.isnan(dfn)
+        or math.isnan(dfd)
+    ):
+        return math.nan
+    if p == 0.0:
+        return 0.0
+    if p == 1.0:
+        return math.inf
+
+    if p < 0.5:
+        x = betaincinv(dfn / 2.0, dfd / 2.0, p)
+        f = dfd * x / (dfn * (1.0 - x))
+    else:
+        y = betaincinv(dfd / 2.0, dfn / 2.0, 1.0 - p)
+        f = dfd * (1.0 - y) / (dfn * y)
+
+    # Newton refinement on the tail that holds the smaller probability
+    for _ in range(8):
+        if f <= 0.0 or math.isinf(f):
+            break
+        density = _f_pdf(f, dfn, dfd)
+        if density <= 0.0:
+            break
+        cdf, sf = _f_tail(f, dfn, dfd)
+        step = (p - cdf) / density if p < 0.5 else (sf - (1.0 - p)) / density
+        f += step
+        if abs(step) <= _INV_EPS * f:
+            break
+
+    return f
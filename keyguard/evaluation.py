@@ -0,0 +1,190 @@
+"""Error-rate evaluation.
+
+Measures how well a profile separates its user from impostors. Every labeled
+attempt is scored once with :meth:`~keyguard.template.AuthTemplate.margins`,
+the smallest threshold factor that would accept it, so whether an attempt is
+accepted at a threshold factor ``f`` is just ``score <= f``. After sorting the
+genuine and the impostor scores, the false acceptance rate (FAR) and false
+rejection rate (FRR) at any number of threshold factors come from a single
+:func:`numpy.searchsorted` pass; no attempt is scored again per threshold.
+
+The minimum threshold changes the scores themselves, so sweeping it
+(:func:`sweep`) scores the attempts once per minimum threshold.
+"""
+
+from collections.abc import Iterable
+from typing import NamedTuple
+
+import numpy as np
+
+from keyguard.template import AuthTemplate
+
+THRESHOLD_STEPS: int = 2001
+
+
+class Evaluation(NamedTuple):
+    """Error rates of one minimum threshold over a range of threshold factors.
+
+    Attributes:
+        min_threshold: the minimum threshold the attempts were scored with
+        thresholds: ``(steps,)`` the threshold factors, ascending
+        far: ``(steps,)`` the share of impostor attempts accepted
+        frr: ``(steps,)`` the share of genuine attempts rejected
+        eer: the equal error rate, where FAR and FRR cross
+        eer_threshold: the threshold factor of the equal error rate
+        genuine: the sorted scores of the genuine attempts
+        impostor: the sorted scores of the impostor attempts
+    """
+
+    min_threshold: float
+    thresholds: np.ndarray
+    far: np.ndarray
+    frr: np.ndarray
+    eer: float
+    eer_threshold: float
+    genuine: np.ndarray
+    impostor: np.ndarray
+
+    def rates(self, threshold_factor: float) -> tuple[float, float]:
+        """Return the FAR and FRR at one threshold factor.
+
+        Args:
+            threshold_factor: the number of standard deviations allowed
+
+        Returns:
+            tuple[float, float]: the false acceptance and rejection rates
+        """
+        far, frr = error_rates(self.genuine, self.impostor, [threshold_factor])
+        return float(far[0]), float(frr[0])
+
+
+def error_rates(
+    genuine: np.ndarray,
+    impostor: np.ndarray,
+    thresholds: np.ndarray | list[float],
+) -> tuple[np.ndarray, np.ndarray]:
+    """Compute FAR and FRR at many threshold factors from sorted scores.
+
+    Args:
+        genuine: the sorted margin scores of the genuine attempts
+        impostor: the sorted margin scores of the impostor attempts
+        thresholds: the threshold factors
+
+    Returns:
+        tuple[np.ndarray, np.ndarray]: the false acceptance and false
+        rejection rates at every threshold factor, 0 for an empty set
+    """
+    thresholds = np.asarray(thresholds, dtype=float)
+    far = np.searchsorted(impostor, thresholds, side="right") / max(len(impostor), 1)
+    accepted = np.searchsorted(genuine, thresholds, side="right")
+    frr = (len(genuine) - accepted) / max(len(genuine), 1)
+    return far, frr
+
+
+def equal_error_rate(
+    thresholds: np.ndarray, far: np.ndarray, frr: np.ndarray
+) -> tuple[float, float]:
+    """Find where the FAR and FRR curves cross.
+
+    FAR grows and FRR falls with the threshold factor; the crossing is
+    interpolated linearly between the two thresholds around it.
+
+    Args:
+        thresholds: the ascending threshold factors
+        far: the false acceptance rates
+        frr: the false rejection rates
+
+    Returns:
+        tuple[float, float]: the equal error rate and its threshold factor
+    """
+    diff = far - frr
+    idx = int(np.searchsorted(diff, 0.0))
+    if idx == 0:
+        return float((far[0] + frr[0]) / 2), float(thresholds[0])
+    if idx == len(diff):
+        return float((far[-1] + frr[-1]) / 2), float(thresholds[-1])
+    t = diff[idx - 1] / (diff[idx - 1] - diff[idx])
+    eer = far[idx - 1] + t * (far[idx] - far[idx - 1])
+    threshold = thresholds[idx - 1] + t * (thresholds[idx] - thresholds[idx - 1])
+    return float(eer), float(threshold)
+
+
+def _thresholds(
+    genuine: np.ndarray, impostor: np.ndarray, steps: int | None
+) -> np.ndarray:
+    """Pick the threshold factors to evaluate.
+
+    With ``steps`` they are evenly spaced from 0 to the largest finite score,
+    otherwise every distinct score is used, which traces the exact curves.
+    """
+    scores = np.concatenate([genuine, impostor])
+    scores = scores[np.isfinite(scores)]
+    if steps is None:
+        return np.unique(np.concatenate([[0.0], scores]))
+    return np.linspace(0.0, scores.max(initial=0.0), steps)
+
+
+def evaluate(
+    template: AuthTemplate,
+    genuine: np.ndarray | list[list[float]],
+    impostor: np.ndarray | list[list[float]],
+    min_threshold: float | None = None,
+    steps: int | None = THRESHOLD_STEPS,
+) -> Evaluation:
+    """Compute the error-rate curves of a profile on labeled attempts.
+
+    Args:
+        template: the compiled profile, see :func:`keyguard.template.get_template`
+        genuine: the ``(attempts, positions)`` attempts of the user
+        impostor: the ``(attempts, positions)`` attempts of others
+        min_threshold: the minimum threshold, the profile's own if omitted
+        steps: the number of evenly spaced threshold factors, or None for
+            every distinct score
+
+    Returns:
+        Evaluation: the FAR, FRR and equal error rate over the thresholds
+    """
+    if min_threshold is None:
+        min_threshold = template.min_threshold
+    genuine_scores = np.sort(template.margins(genuine, min_threshold))
+    impostor_scores = np.sort(template.margins(impostor, min_threshold))
+    thresholds = _thresholds(genuine_scores, impostor_scores, steps)
+    far, frr = error_rates(genuine_scores, impostor_scores, thresholds)
+    eer, eer_threshold = equal_error_rate(thresholds, far, frr)
+    return Evaluation(
+        min_threshold,
+        thresholds,
+        far,
+        frr,
+        eer,
+        eer_threshold,
+        genuine_scores,
+        impostor_scores,
+    )
+
+
+def sweep(
+    template: AuthTemplate,
+    genuine: np.ndarray | list[list[float]],
+    impostor: np.ndarray | list[list[float]],
+    min_thresholds: Iterable[float],
+    steps: int | None = THRESHOLD_STEPS,
+) -> list[Evaluation]:
+    """Evaluate a profile at several minimum thresholds.
+
+    Args:
+        template: the compiled profile
+        genuine: the ``(attempts, positions)`` attempts of the user
+        impostor: the ``(attempts, positions)`` attempts of others
+        min_thresholds: the minimum thresholds to evaluate
+        steps: the number of threshold factors per minimum threshold
+
+    Returns:
+        list[Evaluation]: one evaluation per minimum threshold, in order
+    """
+    genuine = np.asarray(genuine, dtype=float)
+    impostor = np.asarray(impostor, dtype=float)
+    return [
+        evaluate(template, genuine, impostor, min_threshold, steps)
+        for min_threshold in min_thresholds
+    ]
@@ -0,0 +1,267 @@
+"""Fonts and SVG images.
+
+Resources are read from the package ``resources`` folder or, when it exists,
+from a prebuilt ``resources.zip`` archive next to it: one file to open instead
+of one per resource, which matters most in a PyInstaller onefile build where
+every resource is unpacked to a temporary directory first.
+
+* Fonts are registered per weight on first request instead of registering
+  every face at start-up; :func:`load_fonts` registers the weights the theme
+  uses.
+* SVG files are parsed once into a :class:`QSvgRenderer` and rendered once per
+  ``(path, size, device pixel ratio)`` into a cached pixmap, which
+  :class:`SvgWidget` paints.
+
+Build the archive with::
+
+    python -m keyguard.gui.assets
+"""
+
+import argparse
+import re
+import zipfile
+from functools import cache, lru_cache
+from pathlib import Path
+
+from PyQt6.QtCore import QByteArray, QSize, Qt
+from PyQt6.QtGui import QFontDatabase, QPainter, QPaintEvent, QPixmap
+from PyQt6.QtSvg import QSvgRenderer
+from PyQt6.QtWidgets import QWidget
+
+from keyguard.utils import get_resource_path
+
+ARCHIVE_NAME: str = "resources.zip"
+PIXMAP_CACHE_SIZE: int = 64
+
+FONT_DIR: str = "resources/font"
+FONT_FILES: dict[tuple[int, bool], str] = {
+    (400, False): "IBMPlexMono-Regular.ttf",
+    (400, True): "IBMPlexMono-Italic.ttf",
+    (500, False): "IBMPlexMono-Medium.ttf",
+    (500, True): "IBMPlexMono-MediumItalic.ttf",
+    (600, False): "IBMPlexMono-SemiBold.ttf",
+    (600, True): "IBMPlexMono-SemiBoldItalic.ttf",
+    (700, False): "IBMPlexMono-Bold.ttf",
+    (700, True): "IBMPlexMono-BoldItalic.ttf",
+}
+
+
+def _member(relative_path: str | Path) -> str:
+    """Return the archive member name of a resource path."""
+    path = Path(relative_path)
+    if path.is_absolute():
+        path = path.relative_to(get_resource_path(""))
+    return path.as_posix()
+
+
+@cache
+def _archive() -> zipfile.ZipFile | None:
+    """Open the resource archive once, None if there is none."""
+    path = get_resource_path(ARCHIVE_NAME)
+    return zipfile.ZipFile(path) if path.is_file() else None
+
+
+def _archived(relative_path: str | Path) -> bytes | None:
+    """Read a resource from the archive, None if it is not archived."""
+    archive = _archive()
+    member = _member(relative_path)
+    if archive is None or member not in archive.NameToInfo:
+        return None
+    return archive.read(member)
+
+
+def read_resource(relative_path: str | Path) -> bytes:
+    """Read a resource from the archive, or from the resources folder.
+
+    Args:
+        relative_path: path relative to the package, e.g. ``resources/a.svg``
+
+    Returns:
+        bytes: the file contents
+    """
+    data = _archived(relative_path)
+    if data is None:
+        data = get_resource_path(_member(relative_path)).read_bytes()
+    return data
+
+
+@cache
+def load_font(weight: int = 400, italic: bool = False) -> bool:
+    """Register one face of the application font.
+
+    Args:
+        weight: the CSS font weight, 400 to 700
+        italic: whether to register the italic face
+
+    Returns:
+        bool: whether the face is registered
+    """
+    file_name = FONT_FILES.get((weight, italic))
+    if file_name is None:
+        print(f"No font file for weight {weight}")
+        return False
+    relative_path = f"{FONT_DIR}/{file_name}"
+    data = _archived(relative_path)
+    if data is not None:
+        font_id = QFontDatabase.addApplicationFontFromData(QByteArray(data))
+    else:
+        font_id = QFontDatabase.addApplicationFont(
+            str(get_resource_path(relative_path))
+        )
+    if font_id < 0:
+        print(f"Failed to load font {file_name}")
+        return False
+    return True
+
+
+def theme_font_weights() -> set[int]:
+    """Return the font weights the theme stylesheet asks for.
+
+    Returns:
+        set[int]: the regular weight plus every ``font-weight`` in the theme
+    """
+    from keyguard.gui.theme import stylesheet
+
+    return {400} | {int(w) for w in re.findall(r"font-weight:\s*(\d+)", stylesheet())}
+
+
+def load_fonts(weights: set[int] | None = None) -> None:
+    """Register the upright faces of the given weights.
+
+    Args:
+        weights: the weights to register, those of the theme by default
+    """
+    if weights is None:
+        weights = theme_font_weights()
+    loaded = [load_font(weight) for weight in sorted(weights)]
+    if all(loaded):
+        print("✅ Fonts loaded successfully")
+
+
+@cache
+def svg_renderer(relative_path: str | Path) -> QSvgRenderer:
+    """Return the parsed renderer of an SVG resource.
+
+    Args:
+        relative_path: path relative to the package
+
+    Returns:
+        QSvgRenderer: the shared renderer, parsed on the first call
+    """
+    return QSvgRenderer(QByteArray(read_resource(relative_path)))
+
+
+@lru_cache(maxsize=PIXMAP_CACHE_SIZE)
+def svg_pixmap(
+    relative_path: str | Path, width: int, height: int, ratio: float = 1.0
+) -> QPixmap:
+    """Render an SVG resource into a cached pixmap.
+
+    Args:
+        relative_path: path relative to the package
+        width: the logical width
+        height: the logical height
+        ratio: the device pixel ratio of the target screen
+
+    Returns:
+        QPixmap: a transparent pixmap of ``width`` x ``height`` logical pixels
+    """
+    pixmap = QPixmap(round(width * ratio), round(height * ratio))
+    pixmap.setDevicePixelRatio(ratio)
+    pixmap.fill(Qt.GlobalColor.transparent)
+    painter = QPainter(pixmap)
+    svg_renderer(relative_path).render(painter)
+    painter.end()
+    return pixmap
+
+
+class SvgWidget(QWidget):
+    """Paints an SVG resource from the pixmap cache."""
+
+    def __init__(
+        self, relative_path: str | Path, parent: QWidget | None = None
+    ) -> None:
+        """Initialize SvgWidget.
+
+        Args:
+            relative_path: path relative to the package
+            parent: the parent widget
+        """
+        super().__init__(parent)
+        self.path = _member(relative_path)
+
+    def sizeHint(self) -> QSize:  # noqa: N802
+        """Return the SVG's default size."""
+        return svg_renderer(self.path).defaultSize()
+
+    def paintEvent(self, event: QPaintEvent) -> None:  # noqa: N802
+        """Draw the cached pixmap."""
+        if self.width() <= 0 or self.height() <= 0:
+            return
+        pixmap = svg_pixmap(
+            self.path, self.width(), self.height(), self.devicePixelRatioF()
+        )
+        QPainter(self).drawPixmap(0, 0, pixmap)
+
+
+def get_svg(
+    relative_path: str | Path,
+    parent: QWidget | None = None,
+    width: int | None = None,
+    height: int | None = None,
+) -> SvgWidget:
+    """Create a widget showing an SVG file located in resources.
+
+    Optionally set fixed width/height to scale.
+
+    Args:
+        relative_path: Path inside resources folder
+        parent: parent widget
+        width: use as fixed width
+        height: use as fixed height
+
+    Returns:
+        configured SvgWidget
+    """
+    svg = SvgWidget(relative_path, parent=parent)
+
+    if width is not None:
+        svg.setFixedWidth(width)
+
+    if height is not None:
+        svg.setFixedHeight(height)
+
+    return svg
+
+
+def build_archive(destination: Path | None = None) -> Path:
+    """Pack the resources folder into an uncompressed archive.
+
+    Members are stored rather than deflated: the fonts barely compress, and
+    stored members are read without inflating them.
+
+    Args:
+        destination: the archive path, ``keyguard/resources.zip`` by default
+
+    Returns:
+        Path: the written archive
+    """
+    root = get_resource_path("")
+    destination = destination or root / ARCHIVE_NAME
+    with zipfile.ZipFile(destination, "w", zipfile.ZIP_STORED) as archive:
+        for path in sorted(get_resource_path("resources").rglob("*")):
+            if path.is_file():
+                archive.write(path, path.relative_to(root).as_posix())
+    return destination
+
+
+def main() -> None:
+    """Build the resource archive."""
+    parser = argparse.ArgumentParser(description="Build the resource archive.")
+    parser.add_argument("--output", type=Path, help="the archive path")
+    args = parser.parse_args()
+    print(f"Wrote {build_archive(args.output)}")
+
+
+if __name__ == "__main__":
+    main()
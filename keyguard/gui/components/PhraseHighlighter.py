@@ -0,0 +1,141 @@
+"""PhraseHighlighter component."""
+
+from bisect import bisect_right
+from typing import ClassVar
+
+from PyQt6.QtCore import QEvent, QPointF, QRect, QSize
+from PyQt6.QtGui import QColor, QFontMetricsF, QPainter, QPaintEvent
+from PyQt6.QtWidgets import QWidget
+
+PENDING, CORRECT, INCORRECT = 0, 1, 2
+
+
+class PhraseHighlighter(QWidget):
+    """Phrase painted in correct, incorrect and pending colors.
+
+    Glyph positions are measured once per font with ``QFontMetricsF``; a
+    highlight change only invalidates the characters whose color changed, and
+    ``paintEvent`` draws just the characters inside the invalidated rectangle.
+    """
+
+    COLORS: ClassVar[dict[int, QColor]] = {
+        PENDING: QColor("#666666"),
+        CORRECT: QColor("#69FF6E"),
+        INCORRECT: QColor("#f44336"),
+    }
+
+    def __init__(self, phrase: str, parent: QWidget | None = None) -> None:
+        """Initialize PhraseHighlighter component.
+
+        Args:
+            phrase: the phrase to display
+            parent: the parent widget
+        """
+        super().__init__(parent)
+        self.phrase = phrase
+        self.matched = 0
+        self.incorrect = 0
+        self._x: list[float] = []
+        self._ascent = 0.0
+        self._height = 0
+        self._layout_glyphs()
+
+    def _layout_glyphs(self) -> None:
+        """Measure the x offset of every character in the current font."""
+        metrics = QFontMetricsF(self.font())
+        self._x = [
+            metrics.horizontalAdvance(self.phrase[:i])
+            for i in range(len(self.phrase) + 1)
+        ]
+        self._ascent = metrics.ascent()
+        self._height = int(metrics.height()) + 1
+        self.setMinimumSize(self.sizeHint())
+        self.updateGeometry()
+        self.update()
+
+    def changeEvent(self, event: QEvent) -> None:  # noqa: N802
+        """Re-measure the glyphs when the font changes.
+
+        Args:
+            event: the change event
+        """
+        if event.type() == QEvent.Type.FontChange:
+            self._layout_glyphs()
+        super().changeEvent(event)
+
+    def sizeHint(self) -> QSize:  # noqa: N802
+        """Return the size of the whole phrase.
+
+        Returns:
+            QSize: the preferred size
+        """
+        return QSize(int(self._x[-1]) + 1, self._height)
+
+    def state(self, pos: int) -> int:
+        """Return the highlight state of a character.
+
+        Args:
+            pos: the character position
+
+        Returns:
+            int: ``CORRECT``, ``INCORRECT`` or ``PENDING``
+        """
+        if pos < self.matched:
+            return CORRECT
+        if pos < self.incorrect:
+            return INCORRECT
+        return PENDING
+
+    def set_phrase(self, phrase: str) -> None:
+        """Replace the phrase and clear the highlight.
+
+        Args:
+            phrase: the phrase to display
+        """
+        self.phrase = phrase
+        self.matched = self.incorrect = 0
+        self._layout_glyphs()
+
+    def highlight_match(self, matched: int, incorrect: int = 0) -> None:
+        """Highlight the match in the phrase.
+
+        Args:
+            matched: number of leading characters to color as "correct"
+            incorrect: number of characters to color as "incorrect" (after correct ones)
+        """
+        incorrect = incorrect if incorrect > matched else matched
+        bounds = (self.matched, self.incorrect, matched, incorrect)
+        if bounds[:2] == bounds[2:]:
+            return
+
+        self.matched, self.incorrect = matched, incorrect
+        first = min(bounds)
+        last = min(max(bounds), len(self.phrase))
+        if last > first:
+            left = int(self._x[first])
+            right = int(self._x[last]) + 1
+            self.update(QRect(left, 0, right - left + 1, self.height()))
+
+    def paintEvent(self, event: QPaintEvent) -> None:  # noqa: N802
+        """Paint the characters inside the invalidated rectangle.
+
+        Args:
+            event: the paint event
+        """
+        rect = event.rect()
+        first = max(bisect_right(self._x, rect.left()) - 1, 0)
+        last = min(bisect_right(self._x, rect.right()), len(self.phrase))
+
+        painter = QPainter(self)
+        painter.setFont(self.font())
+        baseline = (self.height() - self._height) / 2 + self._ascent
+        start = first
+        while start < last:
+            state = self.state(start)
+            stop = start + 1
+            while stop < last and self.state(stop) == state:
+                stop += 1
+            painter.setPen(self.COLORS[state])
+            painter.drawText(QPointF(self._x[start], baseline), self.phrase[start:stop])
+            start = stop
+        painter.end()
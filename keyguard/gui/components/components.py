@@ -1,8 +1,14 @@
-"""UI components with black and white theme."""
+"""UI components with black and white theme.
+
+The components only set their style classes; the rules are in
+:mod:`keyguard.gui.theme`.
+"""
 
 from PyQt6.QtCore import Qt
 from PyQt6.QtWidgets import QLineEdit, QProgressBar, QPushButton, QSpinBox, QWidget
 
+from keyguard.gui.theme import add_class
+
 
 class LineEdit(QLineEdit):
     """Custom LineEdit."""
@@ -15,24 +21,7 @@ class LineEdit(QLineEdit):
         """
         super().__init__(parent)
 
-        self.setStyleSheet("""
-            QLineEdit {
-                background-color: #000000;
-                border: 1px solid #333333;
-                padding: 8px 12px;
-                color: #FFFFFF;
-                font-size: 14px;
-            }
-            QLineEdit:focus {
-                border: 1px solid #007AFF;
-                background-color: #000000;
-            }
-            QLineEdit:disabled {
-                background-color: #000000;
-                color: #666666;
-                border-color: #333333;
-            }
-        """)
+        add_class(self, "line-edit")
 
 
 class SpinBox(QSpinBox):
@@ -45,36 +34,7 @@ class SpinBox(QSpinBox):
             parent: The parent widget.
         """
         super().__init__(parent)
-        self.setStyleSheet("""
-            QSpinBox {
-                background-color: #000000;
-                border: 1px solid #333333;
-                padding: 8px 12px;
-                color: #FFFFFF;
-                font-size: 14px;
-            }
-            QSpinBox:focus {
-                border: 1px solid #007AFF;
-                background-color: #000000;
-            }
-            QSpinBox:disabled {
-                background-color: #000000;
-                color: #666666;
-                border-color: #333333;
-            }
-            QSpinBox::up-button, QSpinBox::down-button {
-                background-color: #000000;
-                border: 1px solid #333333;
-                width: 20px;
-            }
-            QSpinBox::up-button:hover, QSpinBox::down-button:hover {
-                background-color: #1A1A1A;
-                border-color: #007AFF;
-            }
-            QSpinBox::up-button:pressed, QSpinBox::down-button:pressed {
-                background-color: #333333;
-            }
-        """)
+        add_class(self, "spin-box")
 
 
 class Button(QPushButton):
@@ -91,31 +51,7 @@ class Button(QPushButton):
             parent: The parent widget.
         """
         super().__init__(text, parent)
-        self.setStyleSheet(f"""
-            QPushButton {{
-                background-color: {"#FFFFFF" if primary else "#000000"};
-                color: {"#000000" if primary else "#FFFFFF"};
-                border: 1px solid {"#FFFFFF" if primary else "#333333"};
-                padding: 8px 16px;
-                font-size: 14px;
-                font-weight: 500;
-            }}
-            QPushButton:hover {{
-                background-color: {"#F5F5F5" if primary else "#1A1A1A"};
-                border-color: #007AFF;
-            }}
-            QPushButton:pressed {{
-                background-color: {"#E5E5E5" if primary else "#333333"};
-            }}
-            QPushButton:disabled {{
-                background-color: {"#CCCCCC" if primary else "#000000"};
-                color: #666666;
-                border-color: {"#CCCCCC" if primary else "#333333"};
-            }}
-            QPushButton:focus {{
-                border: 1px solid #007AFF;
-            }}
-        """)
+        add_class(self, "button", *(["button--primary"] if primary else []))
         self.setCursor(Qt.CursorShape.PointingHandCursor)
 
 
@@ -129,27 +65,6 @@ class ProgressBar(QProgressBar):
             parent: The parent widget.
         """
         super().__init__(parent)
-        self.setStyleSheet("""
-            QProgressBar {
-                background-color: #000000;
-                border: 1px solid #333333;
-                text-align: center;
-                color: #FFFFFF;
-                font-size: 14px;
-                height: 24px;
-            }
-            QProgressBar::chunk {
-                background-color: #007AFF;
-                border-radius: 1px;
-            }
-            QProgressBar:disabled {
-                background-color: #000000;
-                color: #666666;
-                border-color: #333333;
-            }
-            QProgressBar:disabled::chunk {
-                background-color: #333333;
-            }
-        """)
+        add_class(self, "progress-bar")
         self.setTextVisible(True)
         self.setFormat("%p%")
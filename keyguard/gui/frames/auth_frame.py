@@ -11,11 +11,12 @@ from PyQt6.QtWidgets import (
 )
 
 from keyguard.config import MIN_SESSIONS_FOR_AUTH
+from keyguard.gui.assets import get_svg
 from keyguard.gui.components.components import Button
 from keyguard.gui.views.AuthView import AuthView
 from keyguard.gui.views.DashboardView import DashboardView
 from keyguard.gui.views.NoProfile import NoProfile
-from keyguard.utils import get_svg, load_profile
+from keyguard.utils import load_profile, load_profile_summary
 
 
 class AuthFrame(QWidget):
@@ -68,9 +69,6 @@ class AuthFrame(QWidget):
 
         content_frame = QFrame(self)
         content_frame.setObjectName("content-frame")
-        content_frame.setStyleSheet(
-            "#content-frame { border: 1px solid #333333; background: #000; }"
-        )
         content_layout = QVBoxLayout(content_frame)
         content_layout.setContentsMargins(0, 0, 0, 0)
         content_layout.setSpacing(0)
@@ -100,29 +98,21 @@ class AuthFrame(QWidget):
 
     def _update_state(self) -> None:
         """Update the view state based on profile existence and runs."""
-        profile = load_profile("profile.json")
+        summary = load_profile_summary("profile.json")
 
-        if (
-            not profile
-            or not profile.get("sessions")
-            or len(profile.get("sessions", [])) < MIN_SESSIONS_FOR_AUTH
-        ):
+        if not summary or summary.get("session_count", 0) < MIN_SESSIONS_FOR_AUTH:
             self.content_stack.setCurrentWidget(self.no_profile_widget)
             return
 
+        profile = load_profile("profile.json", include_sessions=False)
+
         if self.auth_view:
-            self.content_stack.removeWidget(self.auth_view)
-            self.auth_view.deleteLater()
-
-        if self.dashboard_view:
-            self.content_stack.removeWidget(self.dashboard_view)
-            self.dashboard_view.deleteLater()
-            self.dashboard_view = None
-
-        self.auth_view = AuthView(profile)
-        self.auth_view.auth_success.connect(self._on_auth_success)
-        self.auth_view.auth_failed.connect(self._on_auth_failed)
-        self.content_stack.addWidget(self.auth_view)
+            self.auth_view.reset(profile)
+        else:
+            self.auth_view = AuthView(profile)
+            self.auth_view.auth_success.connect(self._on_auth_success)
+            self.auth_view.auth_failed.connect(self._on_auth_failed)
+            self.content_stack.addWidget(self.auth_view)
         self.content_stack.setCurrentWidget(self.auth_view)
 
     def _on_auth_success(self) -> None:
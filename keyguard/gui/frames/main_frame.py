@@ -1,5 +1,6 @@
 """Main Frame."""
 
+from PyQt6.QtCore import QTimer
 from PyQt6.QtWidgets import (
     QHBoxLayout,
     QSizePolicy,
@@ -8,6 +9,8 @@ from PyQt6.QtWidgets import (
     QWidget,
 )
 
+from keyguard.config import PAGE_PREWARM_DELAY_MS
+
 from .auth_frame import AuthFrame
 from .card_frame import CardFrame
 from .training_frame import TrainingFrame
@@ -16,11 +19,24 @@ from .training_frame import TrainingFrame
 class MainFrame(QWidget):
     """MainFrame class."""
 
-    def __init__(self, parent: QWidget | None = None) -> None:
+    HOME_PAGE: int = 0
+    TRAINING_PAGE: int = 1
+    AUTH_PAGE: int = 2
+
+    def __init__(
+        self,
+        parent: QWidget | None = None,
+        prewarm_delay: int | None = PAGE_PREWARM_DELAY_MS,
+    ) -> None:
         """Initialize MainFrame.
 
+        Only the home page is built here; the training and authentication pages
+        are built on first visit or, after ``prewarm_delay`` ms of idle time,
+        one per event-loop tick.
+
         Args:
             parent: the parent widget
+            prewarm_delay: the idle delay before prewarming, None to disable
         """
         super().__init__(parent)
 
@@ -43,20 +59,21 @@ class MainFrame(QWidget):
         home_layout.addWidget(self.train_card, stretch=1)
         home_layout.addWidget(self.auth_card, stretch=1)
 
-        self.training_page = TrainingFrame(parent=self)
-        self.auth_page = AuthFrame(parent=self)
+        # pages are built on first visit (or by the idle prewarm)
+        self.training_page: TrainingFrame | None = None
+        self.auth_page: AuthFrame | None = None
+        self._builders = {
+            self.TRAINING_PAGE: self._build_training_page,
+            self.AUTH_PAGE: self._build_auth_page,
+        }
 
         self.stack = QStackedWidget(self)
         self.stack.addWidget(home_page)
-        self.stack.addWidget(self.training_page)
-        self.stack.addWidget(self.auth_page)
+        for _ in self._builders:
+            self.stack.addWidget(QWidget(self))
 
-        self.train_card.clicked.connect(lambda: self.stack.setCurrentIndex(1))
-        self.training_page.back_clicked.connect(lambda: self.stack.setCurrentIndex(0))
-
-        self.auth_card.clicked.connect(lambda: self.stack.setCurrentIndex(2))
-        self.auth_page.back_clicked.connect(lambda: self.stack.setCurrentIndex(0))
-        self.auth_page.switch_to_training.connect(lambda: self.stack.setCurrentIndex(1))
+        self.train_card.clicked.connect(lambda: self.show_page(self.TRAINING_PAGE))
+        self.auth_card.clicked.connect(lambda: self.show_page(self.AUTH_PAGE))
 
         layout = QVBoxLayout(self)
         layout.setContentsMargins(0, 0, 0, 0)
@@ -65,6 +82,58 @@ class MainFrame(QWidget):
 
         self.setLayout(layout)
 
+        if prewarm_delay is not None:
+            QTimer.singleShot(prewarm_delay, self._prewarm)
+
+    def show_page(self, index: int) -> None:
+        """Switch to a page, building it first if needed.
+
+        Args:
+            index: the page index (``HOME_PAGE``, ``TRAINING_PAGE`` or ``AUTH_PAGE``)
+        """
+        self.ensure_page(index)
+        self.stack.setCurrentIndex(index)
+
+    def ensure_page(self, index: int) -> QWidget:
+        """Build a page if it has not been built yet.
+
+        Args:
+            index: the page index
+
+        Returns:
+            QWidget: the page
+        """
+        builder = self._builders.pop(index, None)
+        if builder is None:
+            return self.stack.widget(index)
+
+        placeholder = self.stack.widget(index)
+        page = builder()
+        self.stack.insertWidget(index, page)
+        self.stack.removeWidget(placeholder)
+        placeholder.deleteLater()
+        return page
+
+    def _prewarm(self) -> None:
+        """Build one pending page per idle tick until all are built."""
+        if self._builders:
+            self.ensure_page(next(iter(self._builders)))
+        if self._builders:
+            QTimer.singleShot(0, self._prewarm)
+
+    def _build_training_page(self) -> TrainingFrame:
+        self.training_page = TrainingFrame(parent=self)
+        self.training_page.back_clicked.connect(lambda: self.show_page(self.HOME_PAGE))
+        return self.training_page
+
+    def _build_auth_page(self) -> AuthFrame:
+        self.auth_page = AuthFrame(parent=self)
+        self.auth_page.back_clicked.connect(lambda: self.show_page(self.HOME_PAGE))
+        self.auth_page.switch_to_training.connect(
+            lambda: self.show_page(self.TRAINING_PAGE)
+        )
+        return self.auth_page
+
     def open_training(self) -> None:
         """Open the training window."""
         self.training_window = TrainingFrame()
@@ -13,15 +13,15 @@ from PyQt6.QtWidgets import (
 )
 
 from keyguard.config import PHRASE
+from keyguard.gui.assets import get_svg
 from keyguard.gui.components.components import Button
 from keyguard.gui.views.LearningView import LearningView
 from keyguard.gui.views.NoProfile import NoProfile
 from keyguard.gui.views.SessionStatsView import SessionStatsView
-from keyguard.logic import update_aggregate_profile
+from keyguard.gui.workers import SessionFinalizer
 from keyguard.utils import (
     create_profile,
-    get_svg,
-    load_profile,
+    load_profile_summary,
     save_profile,
 )
 
@@ -74,13 +74,14 @@ class TrainingFrame(QWidget):
 
         content_frame = QFrame(self)
         content_frame.setObjectName("content-frame")
-        content_frame.setStyleSheet(
-            "#content-frame { border: 1px solid #333333; background: #000; }"
-        )
         content_layout = QVBoxLayout(content_frame)
         content_layout.setContentsMargins(0, 0, 0, 0)
         content_layout.setSpacing(0)
 
+        self.finalizer = SessionFinalizer(self)
+        self.finalizer.session_finalized.connect(self._on_session_finalized)
+        self.finalizer.failed.connect(self._on_session_failed)
+
         self.content_stack = QStackedWidget()
 
         # stack 0: No Profile
@@ -106,28 +107,20 @@ class TrainingFrame(QWidget):
 
     def _update_state(self) -> None:
         """Update the state of the training frame."""
-        profile = load_profile("profile.json")
-        if not profile:
+        summary = load_profile_summary("profile.json")
+        if not summary:
             self.content_stack.setCurrentWidget(self.no_profile_widget)
             return
 
-        phrase = profile["phrase"]
-
         if self.learning_view:
-            self.content_stack.removeWidget(self.learning_view)
-            self.learning_view.deleteLater()
-
-        if self.stats_view:
-            self.content_stack.removeWidget(self.stats_view)
-            self.stats_view.deleteLater()
-            self.stats_view = None
-
-        self.learning_view = LearningView(phrase, profile)
-        self.learning_view.session_complete.connect(self._on_session_complete)
-        self.learning_view.session_cancelled.connect(self._update_state)
-        self.learning_view.show_stats.connect(self._show_stats)
-        self.learning_view.state_changed.connect(self._on_state_changed)
-        self.content_stack.addWidget(self.learning_view)
+            self.learning_view.reset(summary)
+        else:
+            self.learning_view = LearningView(summary["phrase"], summary)
+            self.learning_view.session_complete.connect(self._on_session_complete)
+            self.learning_view.session_cancelled.connect(self._update_state)
+            self.learning_view.show_stats.connect(self._show_stats)
+            self.learning_view.state_changed.connect(self._on_state_changed)
+            self.content_stack.addWidget(self.learning_view)
         self.content_stack.setCurrentWidget(self.learning_view)
 
     def _start_training(self) -> None:
@@ -153,26 +146,34 @@ class TrainingFrame(QWidget):
         self.content_stack.setCurrentWidget(self.stats_view)
 
     def _on_session_complete(self, session: dict) -> None:
-        """Handle session completion.
+        """Hand a finished session over to the finalizer.
 
         Args:
-            session: the session data
+            session: the raw session data
         """
-        profile = load_profile("profile.json")
-
         session["timestamp"] = int(time.time())
+        self.finalizer.submit(session, "profile.json")
 
-        if "sessions" not in profile:
-            profile["sessions"] = []
-        profile["sessions"].append(session)
+    def _on_session_finalized(self, filename: str, session: dict) -> None:
+        """Show the saved session.
 
-        update_aggregate_profile(profile, session)
-        profile["updated"] = time.strftime(
-            "%Y-%m-%d %H:%M", time.localtime(int(time.time()))
-        )
+        Args:
+            filename: the name of the profile file
+            session: the cleaned session data
+        """
+        self._update_state()
+        self._show_stats(session)
 
-        save_profile(profile, "profile.json")
+    def _on_session_failed(self, filename: str, error: str) -> None:
+        """Tell the user that a finished session was not saved.
+
+        Args:
+            filename: the name of the profile file
+            error: the error message
+        """
         self._update_state()
+        if self.content_stack.currentWidget() is self.learning_view:
+            self.learning_view.show_error(f"Сесію не збережено: {error}")
 
     def _on_state_changed(self, state: int) -> None:
         """Handle state changes from LearningView.
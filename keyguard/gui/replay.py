@@ -0,0 +1,253 @@
+"""Keystroke recording and deterministic replay.
+
+:class:`KeyRecorder` records the raw press/release events a view's input
+receives. It filters the events before the view does and drives the view's
+capture with an :class:`~keyguard.recording.EventClock` set to each event's
+time, so the dwell times the view captures are a pure function of the
+recorded timestamps.
+
+:class:`KeyReplayer` sends recorded events into a view's input as synthetic
+``QKeyEvent`` objects with the same kind of clock, which makes a replay
+reproduce the recorded dwell runs exactly, bit for bit. It also times how long
+the view takes to handle each event. Replays run on any platform, including
+``offscreen``.
+
+Usage:
+------
+    python -m keyguard.gui.replay record session.jsonl.gz [--auth]
+    python -m keyguard.gui.replay replay session.jsonl.gz [--auth] [--repeat N]
+"""
+
+import argparse
+import os
+import sys
+import time
+from collections.abc import Iterable
+
+import numpy as np
+from PyQt6.QtCore import QEvent, QObject, Qt
+from PyQt6.QtGui import QKeyEvent
+from PyQt6.QtWidgets import QApplication
+
+from keyguard.config import PHRASE
+from keyguard.gui.views.AuthView import AuthView
+from keyguard.gui.views.LearningView import LearningView
+from keyguard.recording import (
+    PRESS,
+    RELEASE,
+    EventClock,
+    KeyEvent,
+    iter_runs,
+    read_events,
+    read_runs,
+    write_events,
+)
+from keyguard.utils import load_profile
+
+_EVENT_TYPES = {
+    QEvent.Type.KeyPress: PRESS,
+    QEvent.Type.KeyRelease: RELEASE,
+}
+_QT_TYPES = {kind: qt_type for qt_type, kind in _EVENT_TYPES.items()}
+
+
+class KeyRecorder(QObject):
+    """Records the key events of a view's input together with its runs."""
+
+    def __init__(self, view: LearningView) -> None:
+        """Start recording a view.
+
+        Args:
+            view: the view; its capture is switched to the recorder's clock
+        """
+        super().__init__(view)
+        self.view = view
+        self.clock = EventClock()
+        self.events: list[KeyEvent] = []
+        self.runs: list[list[float]] = []
+        view.capture.clock = self.clock
+        view.run_accepted.connect(self.runs.append)
+        # installed after the view's own filter, so it sees every event first
+        view.input.installEventFilter(self)
+
+    def eventFilter(self, obj: QObject, event: QEvent) -> bool:  # noqa: N802
+        """Record a key event and set the clock to its time.
+
+        Args:
+            obj: the input widget
+            event: the event
+
+        Returns:
+            bool: always False, the view handles the event
+        """
+        kind = _EVENT_TYPES.get(event.type())
+        if kind is not None:
+            t = float(event.timestamp()) or time.perf_counter() * 1000
+            self.clock.t = t
+            self.events.append(KeyEvent(t, kind, event.key(), event.text()))
+        return False
+
+    def save(self, path: str) -> int:
+        """Write the recording.
+
+        Args:
+            path: the recording file, see :mod:`keyguard.recording`
+
+        Returns:
+            int: the number of events written
+        """
+        return write_events(path, self.events, self.runs)
+
+
+class KeyReplayer:
+    """Replays recorded key events into a view."""
+
+    def __init__(self, view: LearningView) -> None:
+        """Prepare a view for replay.
+
+        Args:
+            view: the view; its capture is switched to the replay clock
+        """
+        self.view = view
+        self.clock = EventClock()
+        self.runs: list[list[float]] = []
+        view.capture.clock = self.clock
+        view.run_accepted.connect(self.runs.append)
+
+    def replay(self, events: Iterable[KeyEvent]) -> np.ndarray:
+        """Send events to the view's input and apply its pending updates.
+
+        Args:
+            events: the recorded events
+
+        Returns:
+            np.ndarray: how long the view took to handle each event, in
+            microseconds
+        """
+        target = self.view.input
+        latencies = []
+        for event in events:
+            self.clock.t = event.t
+            qt_event = QKeyEvent(
+                _QT_TYPES[event.type],
+                event.key,
+                Qt.KeyboardModifier.NoModifier,
+                event.text,
+            )
+            start = time.perf_counter()
+            QApplication.sendEvent(target, qt_event)
+            latencies.append(time.perf_counter() - start)
+        self.view.ui_updates.flush()
+        return np.array(latencies) * 1e6
+
+
+def restart_after_sessions(view: LearningView) -> None:
+    """Start a new session whenever one ends, as the view's frame would.
+
+    Args:
+        view: a standalone view
+    """
+
+    def restart() -> None:
+        view.reset(view.profile)
+
+    if isinstance(view, AuthView):
+        view.auth_success.connect(restart)
+        view.auth_failed.connect(restart)
+    else:
+        view.session_complete.connect(restart)
+
+
+def _build_view(auth: bool) -> LearningView:
+    """Create the view to record or replay into."""
+    if not auth:
+        return LearningView(PHRASE, show_panel=False)
+    profile = load_profile(include_sessions=False)
+    if not profile:
+        raise SystemExit("An enrolled profile is needed to authenticate")
+    return AuthView(profile)
+
+
+def record(path: str, auth: bool) -> None:
+    """Record typing in a view until its window is closed.
+
+    Args:
+        path: the recording file
+        auth: whether to record an authentication attempt
+    """
+    from keyguard.gui.assets import load_fonts
+    from keyguard.gui.theme import apply_theme
+
+    app = QApplication(sys.argv)
+    load_fonts()
+    apply_theme()
+    view = _build_view(auth)
+    restart_after_sessions(view)
+    recorder = KeyRecorder(view)
+    view.resize(900, 400)
+    view.show()
+    app.exec()
+    count = recorder.save(path)
+    print(f"Recorded {count} events and {len(recorder.runs)} runs to {path}")
+
+
+def replay(path: str, auth: bool, repeat: int) -> bool:
+    """Replay a recording and check the runs it produces.
+
+    Args:
+        path: the recording file
+        auth: whether to replay into an authentication view
+        repeat: how many times to replay it
+
+    Returns:
+        bool: whether every replay reproduced the recorded runs exactly
+    """
+    os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+    app = QApplication(sys.argv)  # noqa: F841
+    events = list(read_events(path))
+    view = _build_view(auth)
+    restart_after_sessions(view)
+    recorded = list(read_runs(path)) or list(iter_runs(events, view.phrase))
+
+    replayer = KeyReplayer(view)
+    latencies = []
+    exact = True
+    start = time.perf_counter()
+    for _ in range(repeat):
+        view.reset(view.profile)
+        replayer.runs.clear()
+        latencies.append(replayer.replay(events))
+        exact &= replayer.runs == recorded
+    elapsed = time.perf_counter() - start
+
+    latency = np.concatenate(latencies)
+    print(
+        f"{repeat} replays of {len(events)} events in {elapsed:.2f} s "
+        f"({repeat / elapsed * 60:.0f} replays/min)"
+    )
+    print(
+        f"per event: mean {latency.mean():.1f} us, "
+        f"p50 {np.percentile(latency, 50):.1f} us, "
+        f"p99 {np.percentile(latency, 99):.1f} us"
+    )
+    print(f"runs reproduced exactly: {exact} ({len(recorded)} runs)")
+    return exact
+
+
+def main() -> None:
+    """Record or replay from the command line."""
+    parser = argparse.ArgumentParser(description="Record or replay typing.")
+    parser.add_argument("command", choices=("record", "replay"))
+    parser.add_argument("path", help="the recording (.jsonl/.csv[.gz])")
+    parser.add_argument("--auth", action="store_true", help="use AuthView")
+    parser.add_argument("--repeat", type=int, default=1, help="replays to run")
+    args = parser.parse_args()
+
+    if args.command == "record":
+        record(args.path, args.auth)
+    elif not replay(args.path, args.auth, args.repeat):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,67 @@
+"""Frame-coalesced UI updates."""
+
+from collections.abc import Callable
+from typing import Any
+
+from PyQt6.QtCore import QObject, Qt, QTimer
+from PyQt6.QtGui import QGuiApplication
+
+DEFAULT_REFRESH_RATE: float = 60.0
+
+
+class UpdateScheduler(QObject):
+    """Applies the latest posted widget updates once per display frame.
+
+    Event handlers post updates under a key instead of touching widgets; a
+    later post under the same key replaces the earlier one. A single-shot timer
+    running at the display refresh rate applies the surviving updates, in the
+    order their keys were first posted, so a burst of keystrokes costs one
+    repaint per frame and capture never waits on widget work. The timer only
+    runs while updates are pending.
+    """
+
+    def __init__(
+        self, parent: QObject | None = None, refresh_rate: float | None = None
+    ) -> None:
+        """Initialize UpdateScheduler.
+
+        Args:
+            parent: the parent object
+            refresh_rate: updates per second, the primary screen's by default
+        """
+        super().__init__(parent)
+        if refresh_rate is None:
+            screen = QGuiApplication.primaryScreen()
+            refresh_rate = screen.refreshRate() if screen else DEFAULT_REFRESH_RATE
+        self._pending: dict[str, tuple[Callable[..., Any], tuple]] = {}
+        self._timer = QTimer(self)
+        self._timer.setSingleShot(True)
+        self._timer.setTimerType(Qt.TimerType.PreciseTimer)
+        self._timer.setInterval(
+            max(1, round(1000 / (refresh_rate or DEFAULT_REFRESH_RATE)))
+        )
+        self._timer.timeout.connect(self.flush)
+
+    def post(self, key: str, func: Callable[..., Any], *args: Any) -> None:  # noqa: ANN401
+        """Schedule ``func(*args)`` for the next frame, replacing ``key``'s update.
+
+        Args:
+            key: what the update changes, e.g. ``"progress"``
+            func: the widget method to call
+            *args: its arguments
+        """
+        self._pending[key] = (func, args)
+        if not self._timer.isActive():
+            self._timer.start()
+
+    def flush(self) -> None:
+        """Apply every pending update now."""
+        self._timer.stop()
+        pending, self._pending = self._pending, {}
+        for func, args in pending.values():
+            func(*args)
+
+    def discard(self) -> None:
+        """Drop every pending update."""
+        self._timer.stop()
+        self._pending.clear()
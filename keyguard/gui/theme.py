@@ -0,0 +1,168 @@
+"""Application theme.
+
+All styling lives in one stylesheet installed on the ``QApplication``: the
+global rules from :mod:`keyguard.config` plus the component rules below. It is
+built and whitespace-compacted once per process, so Qt parses it a single time
+and widgets only set properties (``class``, ``objectName``) to select their
+rules. A widget must get its classes before it is first shown; changing them
+later requires ``style().polish(widget)``.
+"""
+
+from functools import cache
+
+from PyQt6.QtWidgets import QApplication, QWidget
+
+from keyguard.config import BORDER_PRIMARY, FG_PRIMARY, GLOBAL_STYLESHEET
+
+ACCENT: str = "#007AFF"
+BG_PRIMARY: str = "#000000"
+FG_DISABLED: str = "#666666"
+
+COMPONENT_STYLESHEET = f"""
+.line-edit, .spin-box {{
+    background-color: {BG_PRIMARY};
+    border: 1px solid {BORDER_PRIMARY};
+    padding: 8px 12px;
+    color: {FG_PRIMARY};
+    font-size: 14px;
+}}
+.line-edit:focus, .spin-box:focus {{
+    border: 1px solid {ACCENT};
+    background-color: {BG_PRIMARY};
+}}
+.line-edit:disabled, .spin-box:disabled {{
+    background-color: {BG_PRIMARY};
+    color: {FG_DISABLED};
+    border-color: {BORDER_PRIMARY};
+}}
+.spin-box::up-button, .spin-box::down-button {{
+    background-color: {BG_PRIMARY};
+    border: 1px solid {BORDER_PRIMARY};
+    width: 20px;
+}}
+.spin-box::up-button:hover, .spin-box::down-button:hover {{
+    background-color: #1A1A1A;
+    border-color: {ACCENT};
+}}
+.spin-box::up-button:pressed, .spin-box::down-button:pressed {{
+    background-color: #333333;
+}}
+
+.button {{
+    background-color: {BG_PRIMARY};
+    color: {FG_PRIMARY};
+    border: 1px solid {BORDER_PRIMARY};
+    padding: 8px 16px;
+    font-size: 14px;
+    font-weight: 500;
+}}
+.button:hover {{
+    background-color: #1A1A1A;
+    border-color: {ACCENT};
+}}
+.button:pressed {{
+    background-color: #333333;
+}}
+.button:disabled {{
+    background-color: {BG_PRIMARY};
+    color: {FG_DISABLED};
+    border-color: {BORDER_PRIMARY};
+}}
+.button--primary {{
+    background-color: #FFFFFF;
+    color: #000000;
+    border: 1px solid #FFFFFF;
+}}
+.button--primary:hover {{
+    background-color: #F5F5F5;
+    border-color: {ACCENT};
+}}
+.button--primary:pressed {{
+    background-color: #E5E5E5;
+}}
+.button--primary:disabled {{
+    background-color: #CCCCCC;
+    color: {FG_DISABLED};
+    border-color: #CCCCCC;
+}}
+.button:focus {{
+    border: 1px solid {ACCENT};
+}}
+
+.progress-bar {{
+    background-color: {BG_PRIMARY};
+    border: 1px solid {BORDER_PRIMARY};
+    text-align: center;
+    color: {FG_PRIMARY};
+    font-size: 14px;
+    height: 24px;
+}}
+.progress-bar::chunk {{
+    background-color: {ACCENT};
+    border-radius: 1px;
+}}
+.progress-bar:disabled {{
+    background-color: {BG_PRIMARY};
+    color: {FG_DISABLED};
+    border-color: {BORDER_PRIMARY};
+}}
+.progress-bar:disabled::chunk {{
+    background-color: {BORDER_PRIMARY};
+}}
+
+.card-frame {{
+    border: 1px solid #3c3c3c;
+    background-color: {BG_PRIMARY};
+    text-align: left;
+    padding: 24px;
+}}
+.card-frame:hover {{
+    background-color: #1c1b1b;
+}}
+.card-frame QLabel {{
+    background: transparent;
+    color: white;
+    font-weight: 500;
+    font-size: 22px;
+}}
+
+#content-frame {{
+    border: 1px solid {BORDER_PRIMARY};
+    background: {BG_PRIMARY};
+}}
+.hint {{
+    color: #f55;
+    font-size: 14px;
+}}
+"""
+
+
+@cache
+def stylesheet() -> str:
+    """Return the combined application stylesheet, built once.
+
+    Returns:
+        str: the global and component rules with whitespace compacted
+    """
+    return " ".join((GLOBAL_STYLESHEET + COMPONENT_STYLESHEET).split())
+
+
+def apply_theme(app: QApplication | None = None) -> None:
+    """Install the stylesheet on the application.
+
+    Args:
+        app: the application, the running instance by default
+    """
+    (app or QApplication.instance()).setStyleSheet(stylesheet())
+
+
+def add_class(widget: QWidget, *names: str) -> None:
+    """Add style classes to a widget's ``class`` property.
+
+    Args:
+        widget: the widget
+        *names: the classes to add
+    """
+    classes = str(widget.property("class") or "").split()
+    classes += [name for name in names if name not in classes]
+    widget.setProperty("class", " ".join(classes))
@@ -1,12 +1,13 @@
 # keyguard/gui/views/AuthView.py
 
-import numpy as np
 from PyQt6.QtCore import pyqtSignal
 from PyQt6.QtWidgets import QWidget
 
+from keyguard.capture import Clock
 from keyguard.config import MAX_AUTH_ATTEMPTS
 from keyguard.gui.views.LearningView import LearningView
-from keyguard.logic import calculate_authentication_delta
+from keyguard.pipeline import clean_session
+from keyguard.template import get_template
 
 
 class AuthView(LearningView):
@@ -15,56 +16,44 @@ class AuthView(LearningView):
     auth_success = pyqtSignal()
     auth_failed = pyqtSignal()
 
-    def __init__(self, profile: dict, parent: QWidget | None = None) -> None:
+    def __init__(
+        self,
+        profile: dict,
+        parent: QWidget | None = None,
+        clock: Clock | None = None,
+    ) -> None:
         """Initialize AuthView.
 
         Args:
             profile: the profile data
             parent: the parent widget
+            clock: a time source overriding the key event timestamps
         """
         super().__init__(
             phrase=profile.get("phrase", ""),
             profile=profile,
             parent=parent,
             show_panel=False,
+            clock=clock,
         )
         self.attempts = 0
         self.max_attempts = MAX_AUTH_ATTEMPTS
 
-        self.profile_stats = self._get_profile_stats()
+        self.template = get_template(self.profile)
 
-    def _get_profile_stats(self) -> dict:
-        """Compute per-position mean and variance from all saved runs.
+    def reset(self, profile: dict | None = None) -> None:
+        """Start a new attempt in place against a possibly updated profile.
 
-        Returns:
-            dict: the profile statistics
+        Args:
+            profile: the profile data
         """
-        profile = self.profile or {}
-        sessions = profile.get("sessions", [])
-        phrase_len = len(profile.get("phrase", ""))
-
-        all_dwells = []
-        for sess in sessions:
-            for run in sess.get("runs", []):
-                if isinstance(run, list) and len(run) == phrase_len:
-                    all_dwells.append(run)
-
-        if not all_dwells:
-            return {"means": [], "variances": []}
-
-        try:
-            arr = np.array(all_dwells)
-            means = arr.mean(axis=0).tolist()
-            variances = arr.var(axis=0, ddof=1).tolist()
-        except Exception:
-            cols = list(zip(*all_dwells, strict=False))
-            means = [sum(col) / len(col) for col in cols]
-            variances = [
-                sum((x - m) ** 2 for x in col) / (len(col) - 1)
-                for col, m in zip(cols, means, strict=False)
-            ]
+        super().reset(profile)
+        self.attempts = 0
+        self.template = get_template(self.profile)
 
-        return {"means": means, "variances": variances}
+    def _finish_session(self) -> None:
+        """Check the attempt right away; it is a single run and is not saved."""
+        self.show_stats.emit(clean_session(self._build_session()))
 
     def _on_session_complete(self, session: dict) -> None:
         """Handle a single authentication attempt.
@@ -73,26 +62,14 @@ class AuthView(LearningView):
             session: the session data
         """
         runs = session.get("runs", [])
-        stats = self.profile_stats
-        if not runs or not stats:
+        if not runs or not runs[0]:
             self.auth_failed.emit()
             return
 
-        actual = runs[0]
-        if not actual:
-            self.auth_failed.emit()
-            return
-
-        means = stats["means"]
-        variances = stats["variances"]
-
-        deltas, thresholds, ok_flags = calculate_authentication_delta(
-            actual, means, variances, threshold_factor=2.85
-        )
-
-        if all(ok_flags):
+        if self.template.verify(runs[0]):
             self.auth_success.emit()
         else:
-            self.hint.setText("Автентифікація не вдалася. Спробуйте знову")
             self._reset_session()
             self.auth_failed.emit()
+            # after auth_failed, whose handler resets this view
+            self._show_hint("Автентифікація не вдалася. Спробуйте знову")
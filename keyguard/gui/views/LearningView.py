@@ -11,10 +11,12 @@ from PyQt6.QtWidgets import (
     QWidget,
 )
 
+from keyguard.capture import Clock, KeystrokeCapture
 from keyguard.config import MAX_MISTAKES, MAX_TRAINING_RUNS
 from keyguard.gui.components.components import Button, LineEdit, ProgressBar
 from keyguard.gui.components.LabelValue import LabelValue
-from keyguard.logic import compute_session_stats, remove_outliers_per_position
+from keyguard.gui.components.PhraseHighlighter import PhraseHighlighter
+from keyguard.gui.scheduler import UpdateScheduler
 from keyguard.utils import delete_profile, profile_exists
 
 
@@ -26,6 +28,7 @@ class LearningView(QWidget):
     state_changed = pyqtSignal(int)
     show_stats = pyqtSignal(dict)
     back_clicked = pyqtSignal()
+    run_accepted = pyqtSignal(list)
 
     def __init__(
         self,
@@ -33,14 +36,16 @@ class LearningView(QWidget):
         profile: dict | None = None,
         parent: QWidget | None = None,
         show_panel: bool = True,
+        clock: Clock | None = None,
     ) -> None:
         """Initialize LearningView.
 
         Args:
             phrase: the phrase to learn
-            profile: the profile data
+            profile: the profile or its summary (``load_profile_summary``)
             parent: the parent widget
             show_panel: whether to show the profile panel
+            clock: a time source overriding the key event timestamps
         """
         super().__init__(parent)
         self.phrase = phrase
@@ -49,7 +54,8 @@ class LearningView(QWidget):
         self.max_mistakes = MAX_MISTAKES
         self.current_run = 0
         self.mistakes = 0
-        self.timestamps = []
+        self.capture = KeystrokeCapture(len(phrase), clock)
+        self.ui_updates = UpdateScheduler(self)
         self.session_runs = []
         self.session_start_ts = int(time.time())
         self.accepted_runs = 0
@@ -81,13 +87,21 @@ class LearningView(QWidget):
         phrase_layout.setContentsMargins(0, 0, 0, 0)
         phrase_layout.setSpacing(24)
 
-        self.phrase_label = LabelValue(
-            "Фраза", str(self.phrase), size="large", bold=True
-        )
+        phrase_box = QWidget()
+        phrase_box_layout = QVBoxLayout(phrase_box)
+        phrase_box_layout.setContentsMargins(0, 0, 0, 0)
+        phrase_box_layout.setSpacing(8)
+        phrase_caption = QLabel("Фраза")
+        phrase_caption.setProperty("class", "label-value_label--large")
+        self.phrase_label = PhraseHighlighter(str(self.phrase))
+        self.phrase_label.setProperty("class", "label-value_value--large bold")
+        phrase_box_layout.addWidget(phrase_caption)
+        phrase_box_layout.addWidget(self.phrase_label)
+
         self.session_id_label = LabelValue("Session ID", self.session_id, size="large")
 
         phrase_layout.addWidget(self.session_id_label)
-        phrase_layout.addWidget(self.phrase_label)
+        phrase_layout.addWidget(phrase_box)
         phrase_layout.addStretch(1)
 
         session_content_layout.addWidget(phrase_container)
@@ -125,7 +139,7 @@ class LearningView(QWidget):
         hint_layout.setContentsMargins(0, 0, 0, 0)
         hint_layout.setSpacing(0)
         self.hint = QLabel()
-        self.hint.setStyleSheet("color:#f55; font-size:14px;")
+        self.hint.setProperty("class", "hint")
         hint_layout.addWidget(self.hint, alignment=Qt.AlignmentFlag.AlignCenter)
         session_content_layout.addWidget(hint_container)
 
@@ -154,30 +168,14 @@ class LearningView(QWidget):
             title.setProperty("class", "profile-panel_title")
             profile_layout.addWidget(title)
 
-            self.profile_labels = {}
-            self.profile_labels["USERID"] = LabelValue(
-                "USERID", str(self.profile.get("uuid", "N/A")), size="medium", bold=True
-            )
-            self.profile_labels["Created"] = LabelValue(
-                "Created", str(self.profile.get("created", "N/A")), size="medium"
-            )
-            self.profile_labels["Updated"] = LabelValue(
-                "Updated", str(self.profile.get("updated", "N/A")), size="medium"
-            )
-            self.profile_labels["RUNS"] = LabelValue(
-                "Total runs",
-                str(self.profile.get("total_runs", "N/A")),
-                size="medium",
-                bold=True,
-            )
-
-            avg_dwell = "N/A"
-            means = self.profile.get("means")
-            if means and isinstance(means, list) and len(means) > 0:
-                avg_dwell = f"{sum(means) / len(means):.0f} ms"
-            self.profile_labels["Avg Dwell"] = LabelValue(
-                "Avg Dwell", avg_dwell, size="medium", bold=True
-            )
+            self.profile_labels = {
+                "USERID": LabelValue("USERID", "", size="medium", bold=True),
+                "Created": LabelValue("Created", "", size="medium"),
+                "Updated": LabelValue("Updated", "", size="medium"),
+                "RUNS": LabelValue("Total runs", "", size="medium", bold=True),
+                "Avg Dwell": LabelValue("Avg Dwell", "", size="medium", bold=True),
+            }
+            self._refresh_profile_panel()
 
             for label in self.profile_labels.values():
                 profile_layout.addWidget(label)
@@ -204,49 +202,49 @@ class LearningView(QWidget):
         """
         if obj is self.input:
             if event.type() == QEvent.Type.KeyPress:
-                self._press_ts = time.perf_counter()
+                self.capture.press(event.key(), event.timestamp())
                 return False
 
             if event.type() == QEvent.Type.KeyRelease:
                 char = event.text()
-                rel_ts = time.perf_counter()
+                dwell = self.capture.release(event.key(), event.timestamp())
 
                 if event.key() == Qt.Key.Key_Return:
                     entered = self.input.text()
                     if entered == self.phrase:
-                        # compute dwell-times for this run
-                        dwells = [(r - p) * 1000 for (p, r) in self.timestamps]
-                        self.session_runs.append(dwells)
+                        self.session_runs.append(self.capture.dwells())
+                        self.run_accepted.emit(self.session_runs[-1])
                         self.accepted_runs += 1
                         self.current_run += 1
-                        self.progress.setValue(self.current_run)
+                        self._show_progress(self.current_run)
                         self.input.clear()
-                        self.hint.clear()
+                        self._show_hint("")
                         # Reset highlighting
-                        self.phrase_label.highlight_match(0)
+                        self._show_highlight(0)
                         if self.current_run >= self.max_runs:
                             self._finish_session()
                         else:
-                            self.timestamps.clear()
+                            self.capture.clear()
                         return True
                     else:
                         self.mistakes += 1
-                        self.hint.setText("Невірний текст, спробуйте знову")
+                        self._show_hint("Невірний текст, спробуйте знову")
                         self.input.clear()
-                        self.timestamps.clear()
+                        self.capture.clear()
                         # Reset highlighting
-                        self.phrase_label.highlight_match(0)
+                        self._show_highlight(0)
                         if self.mistakes > self.max_mistakes:
-                            self.hint.setText("Забагато помилок. Починаємо спочатку.")
+                            self._show_hint("Забагато помилок. Починаємо спочатку.")
                             self._reset_session()
                         return True
 
-                if char and len(self.timestamps) < len(self.phrase):
-                    pos = len(self.timestamps)
+                if char and not self.capture.full:
+                    pos = self.capture.count
                     correct = self.phrase[pos]
 
-                    if char == correct:
-                        self.timestamps.append((self._press_ts, rel_ts))
+                    # a release without a seen press has no dwell time
+                    if char == correct and dwell is not None:
+                        self.capture.record(dwell)
                         matched = pos + 1
                         incorrect = 0
                     else:
@@ -254,43 +252,126 @@ class LearningView(QWidget):
                         matched = pos
                         incorrect = pos + 1
 
-                        self.hint.setText("Невірний текст, спробуйте знову")
+                        self._show_hint("Невірний текст, спробуйте знову")
                         self.input.clear()
-                        self.timestamps.clear()
+                        self.capture.clear()
 
                         if self.mistakes > self.max_mistakes:
-                            self.hint.setText("Забагато помилок. Починаємо спочатку.")
+                            self._show_hint("Забагато помилок. Починаємо спочатку.")
                             self._reset_session()
 
-                    self.phrase_label.highlight_match(matched, incorrect)
+                    self._show_highlight(matched, incorrect)
 
         return super().eventFilter(obj, event)
 
+    def _show_progress(self, value: int) -> None:
+        """Show the run progress on the next frame."""
+        self.ui_updates.post("progress", self.progress.setValue, value)
+
+    def _show_hint(self, text: str) -> None:
+        """Show a hint on the next frame."""
+        self.ui_updates.post("hint", self.hint.setText, text)
+
+    def show_error(self, text: str) -> None:
+        """Show an error message in place of the hint.
+
+        Args:
+            text: the message
+        """
+        self._show_hint(text)
+
+    def _show_highlight(self, matched: int, incorrect: int = 0) -> None:
+        """Highlight the typed part of the phrase on the next frame."""
+        self.ui_updates.post(
+            "phrase", self.phrase_label.highlight_match, matched, incorrect
+        )
+
     def _reset_session(self) -> None:
         """Reset the session."""
         self.current_run = 0
         self.mistakes = 0
         self.session_runs.clear()
-        self.timestamps = []
+        self.capture.clear()
+        self._show_progress(0)
+        self._show_highlight(0)
+
+    def reset(self, profile: dict | None = None) -> None:
+        """Start a new session in place, keeping every widget.
+
+        Clears the input, progress, captured keystrokes and pending UI updates,
+        draws a new session id and shows the given profile in the panel.
+
+        Args:
+            profile: the profile or its summary; its ``phrase`` replaces the
+                current one if it differs
+        """
+        self.profile = profile or {}
+        phrase = self.profile.get("phrase", self.phrase)
+        if phrase != self.phrase:
+            self.phrase = phrase
+            self.phrase_label.set_phrase(phrase)
+            self.capture = KeystrokeCapture(len(phrase), self.capture.clock)
+
+        self.ui_updates.discard()
+        self.current_run = 0
+        self.mistakes = 0
+        self.accepted_runs = 0
+        self.session_runs = []
+        self.capture.reset()
+        self.session_start_ts = int(time.time())
+        self.session_id = str(uuid.uuid4())[:8]
+        self.session_id_label.set_value(self.session_id)
+
+        self.input.clear()
+        self.input.setEnabled(True)
+        self.hint.clear()
         self.progress.setValue(0)
         self.phrase_label.highlight_match(0)
+        self._refresh_profile_panel()
+        self._update_delete_button()
+
+    def _refresh_profile_panel(self) -> None:
+        """Show the current profile in the panel labels."""
+        if not hasattr(self, "profile_labels"):
+            return
+
+        avg_dwell = "N/A"
+        if self.profile.get("avg_dwell") is not None:
+            avg_dwell = f"{self.profile['avg_dwell']:.0f} ms"
+        values = {
+            "USERID": self.profile.get("uuid", "N/A"),
+            "Created": self.profile.get("created", "N/A"),
+            "Updated": self.profile.get("updated", "N/A"),
+            "RUNS": self.profile.get("total_runs", "N/A"),
+            "Avg Dwell": avg_dwell,
+        }
+        for key, value in values.items():
+            self.profile_labels[key].set_value(str(value))
 
-    def _finish_session(self) -> None:
-        """Finish the session."""
-        cleaned = remove_outliers_per_position(self.session_runs)
-        mean_s, std_s, _ = compute_session_stats(cleaned)
-        session = {
+    def _build_session(self) -> dict:
+        """Collect the raw runs of the session.
+
+        Returns:
+            dict: the session data, with uncleaned runs
+        """
+        return {
             "session_id": self.session_id,
             "phrase": self.phrase,
             "timestamp": self.session_start_ts,
             "total_runs": self.current_run,
             "accepted_runs": self.accepted_runs,
-            "runs": cleaned,
-            "mean": mean_s,
-            "stddev": std_s,
+            "runs": list(self.session_runs),
         }
-        self.session_complete.emit(session)
-        self.show_stats.emit(session)
+
+    def _finish_session(self) -> None:
+        """Finish the session.
+
+        Cleaning, aggregation and saving run off the UI thread (see
+        ``SessionFinalizer``); the input is disabled until the owner calls
+        :meth:`reset`.
+        """
+        self.input.setEnabled(False)
+        self.session_complete.emit(self._build_session())
 
     def _on_profile_created(self) -> None:
         """Update UI when profile is created."""
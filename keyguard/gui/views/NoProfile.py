@@ -2,6 +2,7 @@ from PyQt6.QtCore import Qt, pyqtSignal
 from PyQt6.QtWidgets import QLabel, QVBoxLayout, QWidget
 
 from keyguard.gui.components.components import Button
+from keyguard.gui.theme import add_class
 
 
 class NoProfile(QWidget):
@@ -62,7 +63,7 @@ class NoProfile(QWidget):
         subtext.setAlignment(Qt.AlignmentFlag.AlignCenter)
 
         btn = Button("Почати тренування", primary=True)
-        btn.setProperty("class", "blank_state-action")
+        add_class(btn, "blank_state-action")
         btn.setFixedWidth(180)
         btn.clicked.connect(self.start_training.emit)
 
@@ -0,0 +1,97 @@
+"""Background workers for the GUI."""
+
+import threading
+
+from PyQt6.QtCore import QObject, QRunnable, QThreadPool, pyqtSignal
+
+from keyguard.pipeline import finalize_sessions
+from keyguard.utils import ProfileRepository, profiles
+
+
+class _DrainTask(QRunnable):
+    """Runs the pending sessions of one profile through the pipeline."""
+
+    def __init__(self, finalizer: "SessionFinalizer", filename: str) -> None:
+        super().__init__()
+        self.finalizer = finalizer
+        self.filename = filename
+
+    def run(self) -> None:
+        self.finalizer._drain(self.filename)
+
+
+class SessionFinalizer(QObject):
+    """Finalizes training sessions on a thread pool.
+
+    Sessions submitted for the same profile are coalesced: while a batch is
+    being processed, newly submitted sessions queue up and are then cleaned,
+    aggregated and saved together with a single header commit. Results are
+    delivered through queued signals on the thread that owns the finalizer;
+    a batch that cannot be saved is reported by ``failed`` with the profile
+    file name and the error.
+    """
+
+    session_finalized = pyqtSignal(str, dict)
+    profile_saved = pyqtSignal(str, dict)
+    failed = pyqtSignal(str, str)
+
+    def __init__(
+        self,
+        parent: QObject | None = None,
+        repository: ProfileRepository = profiles,
+    ) -> None:
+        """Initialize SessionFinalizer.
+
+        Args:
+            parent: the parent object
+            repository: the profile repository to save to
+        """
+        super().__init__(parent)
+        self.repository = repository
+        self.pool = QThreadPool(self)
+        self._lock = threading.Lock()
+        self._pending: dict[str, list[dict]] = {}
+        self._running: set[str] = set()
+
+    def submit(self, session: dict, filename: str = "profile.json") -> None:
+        """Queue a raw session for finalization.
+
+        Args:
+            session: the session data, with uncleaned ``runs``
+            filename: the name of the profile file
+        """
+        with self._lock:
+            self._pending.setdefault(filename, []).append(session)
+            if filename in self._running:
+                return
+            self._running.add(filename)
+        self.pool.start(_DrainTask(self, filename))
+
+    def wait(self, msecs: int = -1) -> bool:
+        """Block until every queued session is saved.
+
+        Args:
+            msecs: the timeout in milliseconds, -1 for none
+
+        Returns:
+            bool: False if the timeout expired
+        """
+        return self.pool.waitForDone(msecs)
+
+    def _drain(self, filename: str) -> None:
+        while True:
+            with self._lock:
+                batch = self._pending.pop(filename, [])
+                if not batch:
+                    self._running.discard(filename)
+                    return
+
+            try:
+                header, cleaned = finalize_sessions(self.repository, batch, filename)
+            except Exception as e:
+                self.failed.emit(filename, str(e))
+                continue
+
+            for session in cleaned:
+                self.session_finalized.emit(filename, session)
+            self.profile_saved.emit(filename, header)
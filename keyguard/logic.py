@@ -2,10 +2,15 @@
 
 import math
 import statistics
-from typing import Any
+from typing import Any, NamedTuple
 
-from scipy.stats import f as f_dist
-from scipy.stats import t as t_dist
+import numpy as np
+
+from keyguard.quantiles import f_critical, t_critical, t_critical_many
+
+# headers written by RunAccumulator; older ones hold sample variances only,
+# version 2 stored population variances, version 3 sample variances again
+AGGREGATES_VERSION: int = 3
 
 
 def compute_session_stats(
@@ -29,84 +34,316 @@ def compute_session_stats(
     return mean_session, stddev, runs
 
 
+class RunAccumulator:
+    """Streaming per-position statistics of dwell runs.
+
+    Holds the per-position sample count, mean and sum of squared deviations
+    (M2). Runs are folded in one at a time with Welford's update, and two
+    accumulators can be combined with Chan's parallel formula, so profile
+    aggregates never have to be recomputed from the full session history.
+
+    Feeding the same runs in the same order always produces bit-for-bit
+    identical state, whether they arrive in one batch or across many sessions.
+    """
+
+    __slots__ = ("count", "m2", "mean", "runs")
+
+    def __init__(self, positions: int = 0) -> None:
+        """Initialize an empty accumulator.
+
+        Args:
+            positions: the number of phrase positions
+        """
+        self.count = np.zeros(positions, dtype=np.int64)
+        self.mean = np.zeros(positions)
+        self.m2 = np.zeros(positions)
+        self.runs = 0
+
+    @property
+    def positions(self) -> int:
+        """Number of phrase positions tracked."""
+        return len(self.mean)
+
+    @classmethod
+    def from_profile(cls, profile: dict[str, Any]) -> "RunAccumulator":
+        """Restore an accumulator from the aggregates stored in a profile.
+
+        Profiles written before ``m2``/``counts`` were stored are restored from
+        their means and sample variances, ``m2 = variance * (runs - 1)``; only
+        ``aggregates_version`` 2 headers stored population variances.
+
+        Args:
+            profile: the profile data
+
+        Returns:
+            RunAccumulator: the restored accumulator
+        """
+        acc = cls()
+        means = profile.get("means") or []
+        total_runs = profile.get("total_runs", 0)
+        if not means or not total_runs:
+            return acc
+
+        acc.mean = np.array(means, dtype=float)
+        if "m2" in profile and "counts" in profile:
+            acc.m2 = np.array(profile["m2"], dtype=float)
+            acc.count = np.array(profile["counts"], dtype=np.int64)
+        else:
+            acc.count = np.full(len(means), total_runs, dtype=np.int64)
+            variances = np.array(profile.get("variances", []), dtype=float)
+            if profile.get("aggregates_version") == 2:
+                acc.m2 = variances * total_runs
+            else:
+                acc.m2 = variances * (total_runs - 1)
+        acc.runs = total_runs
+        return acc
+
+    def push(self, run: list[float]) -> None:
+        """Fold a single run into the statistics.
+
+        The first run fixes the number of positions. Longer runs are truncated
+        to it, shorter runs only update the positions they cover.
+
+        Args:
+            run: the dwell times of the run
+        """
+        if not self.positions:
+            self.count = np.zeros(len(run), dtype=np.int64)
+            self.mean = np.zeros(len(run))
+            self.m2 = np.zeros(len(run))
+
+        x = np.asarray(run[: self.positions], dtype=float)
+        k = len(x)
+        n = self.count[:k] + 1
+        delta = x - self.mean[:k]
+        self.mean[:k] += delta / n
+        self.m2[:k] += delta * (x - self.mean[:k])
+        self.count[:k] = n
+        self.runs += 1
+
+    def merge(self, other: "RunAccumulator") -> None:
+        """Fold another accumulator into this one (Chan et al.).
+
+        Args:
+            other: the accumulator to merge
+        """
+        if not other.runs:
+            return
+        if not self.runs:
+            self.count = other.count.copy()
+            self.mean = other.mean.copy()
+            self.m2 = other.m2.copy()
+            self.runs = other.runs
+            return
+
+        k = min(self.positions, other.positions)
+        n_a, n_b = self.count[:k], other.count[:k]
+        n = n_a + n_b
+        delta = other.mean[:k] - self.mean[:k]
+        with np.errstate(divide="ignore", invalid="ignore"):
+            self.mean[:k] = np.where(n > 0, self.mean[:k] + delta * n_b / n, 0.0)
+            self.m2[:k] += other.m2[:k] + np.where(
+                n > 0, delta * delta * n_a * n_b / n, 0.0
+            )
+        self.count[:k] = n
+        self.runs += other.runs
+
+    def variances(self) -> np.ndarray:
+        """Sample variance of each position, as used for authentication.
+
+        Returns:
+            np.ndarray: the variances, ``0`` where fewer than two values were
+            seen
+        """
+        with np.errstate(divide="ignore", invalid="ignore"):
+            return np.where(self.count > 1, self.m2 / (self.count - 1), 0.0)
+
+    def to_profile(self, profile: dict[str, Any]) -> None:
+        """Store the aggregates in a profile.
+
+        Args:
+            profile: the profile data to update
+        """
+        profile["means"] = self.mean.tolist()
+        profile["variances"] = self.variances().tolist()
+        profile["m2"] = self.m2.tolist()
+        profile["counts"] = self.count.tolist()
+        profile["total_runs"] = self.runs
+        profile["aggregates_version"] = AGGREGATES_VERSION
+
+
 def update_aggregate_profile(profile: dict[str, Any], session: dict[str, Any]) -> None:
     """Incrementally update profile['means'] and profile['variances'].
 
+    Only the stored aggregates are used; earlier sessions are not rescanned.
+
     Args:
         profile: the profile data
         session: the session data
 
     Profile fields used:
       profile["means"]: List[float]
-      profile["variances"]: List[float]  (population variance)
+      profile["variances"]: List[float]  (sample variance)
+      profile["m2"]: List[float]  (sum of squared deviations)
+      profile["counts"]: List[int]  (values seen per position)
       profile["total_runs"]: int
+      profile["revision"]: int  (bumped on every change of the aggregates)
+      profile["aggregates_version"]: int  (AGGREGATES_VERSION)
 
     Session fields required:
       session["runs"]: List[List[float]]  (accepted dwell runs)
     """
     new_runs = session["runs"]
-    num_new = len(new_runs)
-    if num_new == 0:
+    if len(new_runs) == 0:
         return
 
-    cols = list(zip(*new_runs, strict=False))
-    session_means = [statistics.mean(c) for c in cols]
-    session_vars = [statistics.stdev(c) ** 2 for c in cols]
+    acc = RunAccumulator.from_profile(profile)
+    for run in new_runs:
+        acc.push(run)
+    acc.to_profile(profile)
+    profile["revision"] = profile.get("revision", 0) + 1
 
-    if profile.get("total_runs", 0) == 0 or not profile.get("means"):
-        profile["means"] = session_means
-        profile["variances"] = session_vars
-        profile["total_runs"] = num_new
-        return
 
-    old_means = profile["means"]
-    old_vars = profile["variances"]
-    old_n = profile["total_runs"]
+def rebuild_profile_from_history(
+    profile: dict[str, Any], runs: np.ndarray | None = None
+) -> None:
+    """Completely recompute profile['means'], ['variances'], and ['total_runs'].
 
-    updated_means = []
-    updated_vars = []
+    Runs are replayed in the same order as incremental updates would have seen
+    them, so the result matches :func:`update_aggregate_profile` exactly.
 
-    for _, (m_old, v_old, m_s, v_s) in enumerate(
-        zip(old_means, old_vars, session_means, session_vars, strict=False)
-    ):
-        total_n = old_n + num_new
-        m_new = (m_old * old_n + m_s * num_new) / total_n
+    Args:
+        profile: the profile data to rebuild
+        runs: the ``(runs, positions)`` matrix of every stored run, e.g. a
+            memory-mapped view; read from ``profile["sessions"]`` if omitted
+    """
+    acc = RunAccumulator()
+    if runs is not None:
+        for run in runs:
+            acc.push(run)
+    else:
+        for sess in profile.get("sessions", []):
+            for run in sess.get("runs", []):
+                acc.push(run)
+    acc.to_profile(profile)
+    profile["revision"] = profile.get("revision", 0) + 1
 
-        delta = m_old - m_s
-        pooled = (
-            v_old * old_n
-            + v_s * num_new
-            + (delta * delta) * (old_n * num_new / total_n)
-        )
-        v_new = pooled / total_n
 
-        updated_means.append(m_new)
-        updated_vars.append(v_new)
+class BatchScore(NamedTuple):
+    """Result of scoring many candidate runs against one profile.
+
+    Attributes:
+        deltas: ``(attempts, positions)`` absolute deviations from the means
+        thresholds: ``(attempts, positions)`` read-only view of the thresholds
+        ok: ``(attempts, positions)`` whether each delta is within its threshold
+        accepted: ``(attempts,)`` whether every position of an attempt is ok
+    """
 
-    profile["means"] = updated_means
-    profile["variances"] = updated_vars
-    profile["total_runs"] = total_n
+    deltas: np.ndarray
+    thresholds: np.ndarray
+    ok: np.ndarray
+    accepted: np.ndarray
 
 
-def rebuild_profile_from_history(profile: dict[str, Any]) -> None:
-    """Completely recompute profile['means'], ['variances'], and ['total_runs'].
+def floored_thresholds(
+    variances: np.ndarray | list[float],
+    threshold_factor: float = 2.0,
+    min_threshold: float = 5.0,
+) -> np.ndarray:
+    """Compute per-position acceptance thresholds.
 
     Args:
-        profile: the profile data to rebuild
+        variances: the variances of the dwell times
+        threshold_factor: the number of standard deviations allowed
+        min_threshold: the minimum threshold
+
+    Returns:
+        np.ndarray: ``threshold_factor * std``, but never below ``min_threshold``
     """
-    all_runs = []
-    for sess in profile.get("sessions", []):
-        all_runs.extend(sess.get("runs", []))
-    if not all_runs:
-        profile["means"] = []
-        profile["variances"] = []
-        profile["total_runs"] = 0
-        return
+    raw = threshold_factor * np.sqrt(np.asarray(variances, dtype=float))
+    # enforce a floor so you never get a zero threshold
+    return np.where(raw >= min_threshold, raw, min_threshold)
+
+
+def score_attempts(
+    attempts: np.ndarray | list[list[float]],
+    means: np.ndarray | list[float],
+    variances: np.ndarray | list[float],
+    threshold_factor: float = 2.0,
+    min_threshold: float = 5.0,
+) -> BatchScore:
+    """Score a batch of candidate runs against a profile in one pass.
+
+    Args:
+        attempts: the ``(attempts, positions)`` dwell-time matrix
+        means: the means of the dwell times
+        variances: the variances of the dwell times
+        threshold_factor: the threshold factor
+        min_threshold: the minimum threshold
+
+    Returns:
+        BatchScore: the delta, threshold and ok matrices and accept decisions
 
-    cols = list(zip(*all_runs, strict=False))
-    profile["means"] = [statistics.mean(c) for c in cols]
-    profile["variances"] = [statistics.stdev(c) ** 2 for c in cols]
-    profile["total_runs"] = len(all_runs)
+    Raises:
+      ValueError if the attempt width differs from the profile length.
+    """
+    attempts = np.atleast_2d(np.asarray(attempts, dtype=float))
+    means = np.asarray(means, dtype=float)
+    variances = np.asarray(variances, dtype=float)
+    if not (attempts.shape[1] == len(means) == len(variances)):
+        raise ValueError(
+            f"Input length mismatch: actual={attempts.shape[1]}, "
+            f"means={len(means)}, variances={len(variances)}"
+        )
+
+    thresholds = floored_thresholds(variances, threshold_factor, min_threshold)
+    deltas = np.abs(attempts - means)
+    ok = deltas <= thresholds
+    return BatchScore(
+        deltas=deltas,
+        thresholds=np.broadcast_to(thresholds, deltas.shape),
+        ok=ok,
+        accepted=ok.all(axis=1),
+    )
+
+
+def margin_scores(
+    attempts: np.ndarray | list[list[float]],
+    means: np.ndarray | list[float],
+    variances: np.ndarray | list[float],
+    min_threshold: float | np.ndarray | list[float] = 5.0,
+) -> np.ndarray:
+    """Compute the smallest threshold factor that accepts each attempt.
+
+    A position is within its threshold if its delta is at most
+    ``min_threshold`` or at most ``threshold_factor`` standard deviations, so
+    an attempt is accepted by :func:`score_attempts` exactly when its score is
+    at most ``threshold_factor``. Scoring once therefore gives the decision for
+    every threshold factor.
+
+    Args:
+        attempts: the ``(attempts, positions)`` dwell-time matrix
+        means: the means of the dwell times
+        variances: the variances of the dwell times
+        min_threshold: the minimum threshold, or a sequence of them to score
+            against in one pass
+
+    Returns:
+        np.ndarray: ``(attempts,)`` the largest delta in standard deviations
+        over the positions beyond ``min_threshold``, 0 if there are none and
+        ``inf`` if such a position has no variance; ``(thresholds, attempts)``
+        for a sequence of minimum thresholds
+    """
+    attempts = np.atleast_2d(np.asarray(attempts, dtype=float))
+    deltas = np.abs(attempts - np.asarray(means, dtype=float))
+    with np.errstate(divide="ignore", invalid="ignore"):
+        ratios = deltas / np.sqrt(np.asarray(variances, dtype=float))
+    floors = np.asarray(min_threshold, dtype=float)
+    scores = [
+        np.where(deltas > floor, ratios, 0.0).max(axis=1, initial=0.0)
+        for floor in floors.ravel()
+    ]
+    return scores[0] if floors.ndim == 0 else np.stack(scores)
 
 
 def calculate_authentication_delta(
@@ -118,10 +355,13 @@ def calculate_authentication_delta(
 ) -> tuple[list[float], list[float], list[bool]]:
     """Compute the delta, threshold, and ok flag for a single candidate run.
 
+    Single-attempt wrapper around :func:`score_attempts`.
+
     Args:
         actual: the actual dwell times
         means: the means of the dwell times
-        variances: the variances of the dwell times
+        variances: the sample variances of the dwell times, as stored in the
+            profile and used by :class:`keyguard.template.AuthTemplate`
         threshold_factor: the threshold factor
         min_threshold: the minimum threshold
 
@@ -137,24 +377,12 @@ def calculate_authentication_delta(
             f"means={len(means)}, variances={len(variances)}"
         )
 
-    deltas: list[float] = []
-    thresholds: list[float] = []
-    ok_flags: list[bool] = []
-
-    for a, m, v in zip(actual, means, variances, strict=False):
-        delta = abs(a - m)
-        # compute raw threshold
-        raw_th = threshold_factor * (v**0.5)
-
-        # enforce a floor so you never get a zero threshold
-        thresh = raw_th if raw_th >= min_threshold else min_threshold
-        ok = delta <= thresh
-
-        deltas.append(delta)
-        thresholds.append(thresh)
-        ok_flags.append(ok)
-
-    return deltas, thresholds, ok_flags
+    score = score_attempts([actual], means, variances, threshold_factor, min_threshold)
+    return (
+        score.deltas[0].tolist(),
+        score.thresholds[0].tolist(),
+        score.ok[0].tolist(),
+    )
 
 
 def remove_outliers(data: list[float], alpha: float = 0.05) -> list[float]:
@@ -178,7 +406,7 @@ def remove_outliers(data: list[float], alpha: float = 0.05) -> list[float]:
             break
         max_dev = max(data, key=lambda x: abs(x - mean))
         t_stat = abs(max_dev - mean) / (std / math.sqrt(n))
-        t_crit = t_dist.ppf(1 - alpha / 2, n - 2)
+        t_crit = t_critical(alpha, n - 2)
         if t_stat > t_crit:
             data.remove(max_dev)
             n -= 1
@@ -220,7 +448,7 @@ def t_test(sample1: list[float], sample2: list[float], alpha: float = 0.05) -> b
         df_den = (var1 / n1) ** 2 / (n1 - 1) + (var2 / n2) ** 2 / (n2 - 1)
         df = df_num / df_den if df_den != 0 else 1
 
-    t_crit = t_dist.ppf(1 - alpha / 2, df)
+    t_crit = t_critical(alpha, df)
     return t_value < t_crit
 
 
@@ -245,15 +473,42 @@ def f_test(var1: float, var2: float, n1: int, n2: int, alpha: float = 0.05) -> b
     else:
         fisher = var2 / var1 if var1 != 0 else float("inf")
         dfn, dfd = n2 - 1, n1 - 1
-    fisher_crit = f_dist.ppf(1 - alpha / 2, dfn, dfd)
+    fisher_crit = f_critical(alpha, dfn, dfd)
     return fisher_crit > fisher
 
 
+def _run_matrix(runs: list[list[float]]) -> tuple[np.ndarray, np.ndarray]:
+    """Pack ragged dwell runs into a dense matrix and a presence mask.
+
+    The number of positions is taken from the first run, matching the
+    per-position loop of the original implementation. Missing values of
+    shorter runs are stored as ``nan`` and flagged ``False`` in the mask.
+
+    Args:
+        runs: the dwell-time runs
+
+    Returns:
+        tuple[np.ndarray, np.ndarray]: the ``(runs, positions)`` matrix and mask
+    """
+    num_positions = len(runs[0])
+    values = np.full((len(runs), num_positions), np.nan)
+    for idx, run in enumerate(runs):
+        row = run[:num_positions]
+        values[idx, : len(row)] = row
+    return values, ~np.isnan(values)
+
+
 def remove_outliers_per_position(
     runs: list[list[float]], alpha: float = 0.05
 ) -> list[list[float]]:
     """Remove outlier runs based on per-position t-tests.
 
+    Runs are held as one ``(runs, positions)`` matrix and the iterative Grubbs
+    test is applied to every position at once: each pass computes the masked
+    mean and standard deviation of all still-active positions, drops the most
+    deviating value where it fails the test, and deactivates positions that
+    pass it. A run is removed if it was an outlier at any position.
+
     Args:
         runs: the runs to remove outliers from
         alpha: the significance level
@@ -264,49 +519,66 @@ def remove_outliers_per_position(
     if not runs:
         return []
 
-    num_positions = len(runs[0])
-    outliner_indices: set[int] = set()
+    values, mask = _run_matrix(runs)
+    outliers = np.zeros(len(runs), dtype=bool)
+    active = np.flatnonzero(mask.sum(axis=0) > 2)
 
-    for pos in range(num_positions):
-        values_with_idx = [
-            (run[pos], idx) for idx, run in enumerate(runs) if len(run) > pos
-        ]
-        data = values_with_idx
-        n = len(data)
+    while active.size:
+        sub_mask = mask[:, active]
+        sub = np.where(sub_mask, values[:, active], 0.0)
+        n = sub_mask.sum(axis=0)
 
-        if n < 3:
-            continue
+        mean = sub.sum(axis=0) / n
+        dev = np.where(sub_mask, sub - mean, 0.0)
+        std = np.sqrt((dev * dev).sum(axis=0) / (n - 1))
+        abs_dev = np.where(sub_mask, np.abs(dev), -1.0)
 
-        while n > 2:
-            mean = statistics.mean(v for v, _ in data)
-            std = statistics.stdev(v for v, _ in data)
+        worst = abs_dev.argmax(axis=0)
+        max_dev = abs_dev[worst, np.arange(active.size)]
+        with np.errstate(divide="ignore", invalid="ignore"):
+            t_stat = max_dev / (std / np.sqrt(n))
+        t_crit = t_critical_many(alpha, n - 2)
 
-            if std == 0:
-                break
+        reject = (std != 0) & (t_stat > t_crit)
+        rows, cols = worst[reject], active[reject]
+        outliers[rows] = True
+        mask[rows, cols] = False
 
-            value, idx = max(data, key=lambda item: abs(item[0] - mean))
-            t_stat = abs(value - mean) / (std / math.sqrt(n))
-            t_crit = t_dist.ppf(1 - alpha / 2, n - 2)
+        active = cols[n[reject] > 3]
 
-            if t_stat > t_crit:
-                outliner_indices.add(idx)
-                data = [item for item in data if item[1] != idx]
-                n -= 1
-            else:
-                break
+    return [run for idx, run in enumerate(runs) if not outliers[idx]]
 
-    return [run for idx, run in enumerate(runs) if idx not in outliner_indices]
 
-
-def calculate_error_rates(results: list[bool]) -> tuple[float, float]:
+def calculate_error_rates(
+    results: list[bool], genuine: list[bool] | None = None
+) -> tuple[float, float]:
     """Calculate error rates of 1st and 2nd kind based on a list of boolean results.
 
+    Without labels every rejection counts as an error of the 1st kind and
+    every acceptance as one of the 2nd kind. See :mod:`keyguard.evaluation`
+    for error rates over a whole range of thresholds.
+
     Args:
         results: the list of boolean results
+        genuine: whether each attempt came from the legitimate user; with
+            labels the rates are the false rejection rate of the genuine
+            attempts and the false acceptance rate of the others
 
     Returns:
         tuple[float, float]: the error rates
     """
+    if genuine is not None:
+        accepted = np.asarray(results, dtype=bool)
+        labels = np.asarray(genuine, dtype=bool)
+        n_genuine = np.count_nonzero(labels)
+        n_impostor = len(labels) - n_genuine
+        false_rejects = np.count_nonzero(labels & ~accepted)
+        false_accepts = np.count_nonzero(~labels & accepted)
+        return (
+            float(false_rejects / n_genuine) if n_genuine else 0.0,
+            float(false_accepts / n_impostor) if n_impostor else 0.0,
+        )
+
     n_0 = len(results)
 
     # 1-го роду: легітимний не ідентифікований  # noqa: RUF003
@@ -0,0 +1,112 @@
+"""Session finalization pipeline.
+
+A finished training session goes through three stages before it is part of
+the profile:
+
+1. :func:`clean_session` -- drop outlier runs and compute the session stats;
+2. :func:`aggregate_sessions` -- fold the cleaned runs into the profile
+   aggregates, exactly as they will be stored (float32);
+3. :func:`save_sessions` -- append the sessions to the session log and commit
+   the header in a single write.
+
+The stages are plain functions without any Qt dependency so they can run on a
+worker thread; :func:`finalize_sessions` chains them for a batch of sessions of
+one profile.
+"""
+
+import time
+from typing import TYPE_CHECKING, Any
+
+import numpy as np
+
+from keyguard.logic import (
+    compute_session_stats,
+    remove_outliers_per_position,
+    update_aggregate_profile,
+)
+from keyguard.storage import RUN_DTYPE
+
+if TYPE_CHECKING:
+    from keyguard.utils import ProfileRepository
+
+
+def clean_session(session: dict[str, Any]) -> dict[str, Any]:
+    """Remove outlier runs from a session and compute its statistics.
+
+    Args:
+        session: the raw session data
+
+    Returns:
+        dict[str, Any]: a copy of the session with cleaned ``runs`` and
+        ``mean`` / ``stddev`` filled in
+    """
+    cleaned = remove_outliers_per_position(session.get("runs", []))
+    mean_s, std_s, _ = compute_session_stats(cleaned)
+    return {**session, "runs": cleaned, "mean": mean_s, "stddev": std_s}
+
+
+def aggregate_sessions(
+    header: dict[str, Any], sessions: list[dict[str, Any]]
+) -> dict[str, Any]:
+    """Fold cleaned sessions into the aggregates of a profile.
+
+    The runs are rounded to the storage precision first, so the result equals
+    what :meth:`keyguard.storage.ProfileStore.append_sessions` would compute.
+
+    Args:
+        header: the profile header, left unchanged
+        sessions: the cleaned sessions
+
+    Returns:
+        dict[str, Any]: the updated copy of the header
+    """
+    header = dict(header)
+    for session in sessions:
+        runs = np.asarray(session["runs"], dtype=RUN_DTYPE)
+        if len(runs):
+            update_aggregate_profile(
+                header, {"runs": runs.reshape(len(runs), -1).astype(float)}
+            )
+    header["updated"] = time.strftime("%Y-%m-%d %H:%M", time.localtime())
+    return header
+
+
+def save_sessions(
+    repository: "ProfileRepository",
+    header: dict[str, Any],
+    sessions: list[dict[str, Any]],
+    filename: str = "profile.json",
+) -> None:
+    """Append aggregated sessions to a profile with a single header commit.
+
+    Args:
+        repository: the profile repository
+        header: the header returned by :func:`aggregate_sessions`
+        sessions: the cleaned sessions
+        filename: the name of the profile file
+    """
+    repository.append_sessions(header, sessions, filename, aggregate=False)
+
+
+def finalize_sessions(
+    repository: "ProfileRepository",
+    sessions: list[dict[str, Any]],
+    filename: str = "profile.json",
+) -> tuple[dict[str, Any], list[dict[str, Any]]]:
+    """Clean, aggregate and save a batch of sessions of one profile.
+
+    Cleaning needs no profile data and runs first; loading the header,
+    aggregating and saving then happen as one repository operation (see
+    :meth:`keyguard.utils.ProfileRepository.finalize`).
+
+    Args:
+        repository: the profile repository
+        sessions: the raw sessions, in order
+        filename: the name of the profile file
+
+    Returns:
+        tuple[dict[str, Any], list[dict[str, Any]]]: the committed header and
+        the cleaned sessions
+    """
+    cleaned = [clean_session(session) for session in sessions]
+    return repository.finalize(cleaned, filename), cleaned
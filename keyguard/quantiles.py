@@ -0,0 +1,185 @@
+"""Critical values of the Student-t and Fisher-F distributions.
+
+The statistical tests in :mod:`keyguard.logic` repeatedly ask for the same
+two-sided critical values, mostly with small integer degrees of freedom. This
+module memoizes them in bounded LRU caches keyed by ``(alpha, df)`` and
+``(alpha, dfn, dfd)``, and optionally serves them from precomputed tables for
+the common significance levels. For fractional (Welch) degrees of freedom the
+table interpolates the logarithm of the critical value linearly in ``1 / df``.
+"""
+
+from bisect import bisect_right
+from functools import lru_cache
+from typing import NamedTuple
+
+import numpy as np
+
+from keyguard.distributions import f_ppf, t_ppf
+
+CACHE_SIZE: int = 1024
+TABLE_ALPHAS: tuple[float, ...] = (0.01, 0.05, 0.1)
+T_TABLE_MAX_DF: int = 512
+F_TABLE_MAX_DF: int = 64
+
+# fine steps where the t quantile changes fastest, integers above
+_T_TABLE_DF: tuple[float, ...] = tuple(
+    [1 + i / 16 for i in range(15 * 16)] + list(range(16, T_TABLE_MAX_DF + 1))
+)
+
+
+class QuantileCacheInfo(NamedTuple):
+    """Hit/miss counters of the quantile caches."""
+
+    hits: int
+    misses: int
+    table_hits: int
+    currsize: int
+    maxsize: int
+
+
+_t_table: dict[float, np.ndarray] = {}
+_f_table: dict[float, np.ndarray] = {}
+_table_enabled = False
+_table_hits = 0
+
+
+@lru_cache(maxsize=CACHE_SIZE)
+def _t_critical(alpha: float, df: float) -> float:
+    return t_ppf(1 - alpha / 2, df)
+
+
+@lru_cache(maxsize=CACHE_SIZE)
+def _f_critical(alpha: float, dfn: float, dfd: float) -> float:
+    return f_ppf(1 - alpha / 2, dfn, dfd)
+
+
+def use_table(enabled: bool = True) -> None:
+    """Enable or disable the precomputed critical-value tables.
+
+    Tables are built lazily, per significance level, on first use. Values on
+    the table grid are exact up to rounding; values between grid points are
+    interpolated to within a relative error of about ``3e-4``.
+
+    Args:
+        enabled: whether lookups should consult the tables first
+    """
+    global _table_enabled
+    _table_enabled = enabled
+
+
+def _t_row(alpha: float) -> np.ndarray:
+    row = _t_table.get(alpha)
+    if row is None:
+        row = _t_table[alpha] = np.log([t_ppf(1 - alpha / 2, df) for df in _T_TABLE_DF])
+    return row
+
+
+def _f_grid(alpha: float) -> np.ndarray:
+    grid = _f_table.get(alpha)
+    if grid is None:
+        df = range(1, F_TABLE_MAX_DF + 1)
+        grid = _f_table[alpha] = np.array(
+            [[f_ppf(1 - alpha / 2, dfn, dfd) for dfd in df] for dfn in df]
+        )
+    return grid
+
+
+def _t_from_table(alpha: float, df: float) -> float | None:
+    if not _table_enabled or alpha not in TABLE_ALPHAS:
+        return None
+    if not 1 <= df <= T_TABLE_MAX_DF:
+        return None
+
+    row = _t_row(alpha)
+    i = bisect_right(_T_TABLE_DF, df) - 1
+    lo = _T_TABLE_DF[i]
+    if lo == df:
+        return float(np.exp(row[i]))
+
+    w = (1 / lo - 1 / df) / (1 / lo - 1 / _T_TABLE_DF[i + 1])
+    return float(np.exp(row[i] + w * (row[i + 1] - row[i])))
+
+
+def t_critical(alpha: float, df: float) -> float:
+    """Two-sided critical value of Student's t-distribution.
+
+    Args:
+        alpha: the significance level
+        df: the degrees of freedom, possibly fractional
+
+    Returns:
+        float: the ``1 - alpha / 2`` quantile
+    """
+    global _table_hits
+    value = _t_from_table(alpha, df)
+    if value is not None:
+        _table_hits += 1
+        return value
+    return _t_critical(alpha, df)
+
+
+def t_critical_many(alpha: float, df: np.ndarray) -> np.ndarray:
+    """Vectorized :func:`t_critical` over an array of degrees of freedom.
+
+    Each distinct value is looked up once.
+
+    Args:
+        alpha: the significance level
+        df: the degrees of freedom
+
+    Returns:
+        np.ndarray: the critical values, shaped like ``df``
+    """
+    unique, inverse = np.unique(df, return_inverse=True)
+    values = np.array([t_critical(alpha, float(d)) for d in unique])
+    return values[inverse].reshape(np.shape(df))
+
+
+def f_critical(alpha: float, dfn: float, dfd: float) -> float:
+    """Two-sided critical value of Fisher's F-distribution.
+
+    Args:
+        alpha: the significance level
+        dfn: the numerator degrees of freedom
+        dfd: the denominator degrees of freedom
+
+    Returns:
+        float: the ``1 - alpha / 2`` quantile
+    """
+    global _table_hits
+    if (
+        _table_enabled
+        and alpha in TABLE_ALPHAS
+        and int(dfn) == dfn
+        and int(dfd) == dfd
+        and 1 <= dfn <= F_TABLE_MAX_DF
+        and 1 <= dfd <= F_TABLE_MAX_DF
+    ):
+        _table_hits += 1
+        return float(_f_grid(alpha)[int(dfn) - 1, int(dfd) - 1])
+    return _f_critical(alpha, dfn, dfd)
+
+
+def cache_info() -> QuantileCacheInfo:
+    """Return the combined counters of the t and F caches.
+
+    Returns:
+        QuantileCacheInfo: the cache statistics
+    """
+    t_info = _t_critical.cache_info()
+    f_info = _f_critical.cache_info()
+    return QuantileCacheInfo(
+        hits=t_info.hits + f_info.hits,
+        misses=t_info.misses + f_info.misses,
+        table_hits=_table_hits,
+        currsize=t_info.currsize + f_info.currsize,
+        maxsize=2 * CACHE_SIZE,
+    )
+
+
+def cache_clear() -> None:
+    """Empty the caches and reset all counters."""
+    global _table_hits
+    _t_critical.cache_clear()
+    _f_critical.cache_clear()
+    _table_hits = 0
@@ -0,0 +1,242 @@
+"""Recorded keystroke events.
+
+A recording is a stream of key press/release events, one per line:
+
+* JSONL -- ``{"t": 1043.0, "type": "press", "key": 1065, "text": "щ"}``;
+* CSV -- a ``t,type,key,text`` header followed by one event per row.
+
+``t`` is the event time in milliseconds, ``key`` the Qt key code and ``text``
+the typed text of the key. A ``.gz`` suffix compresses either format, and
+``-`` stands for standard input/output (JSONL). A JSONL recording may also
+hold the dwell runs captured while it was recorded, as
+``{"type": "run", "dwells": [...]}`` rows, to check replays against.
+
+Events are read and turned into dwell runs lazily, one at a time, so
+recordings of any length are processed in constant memory. Runs are extracted
+by the same :class:`~keyguard.capture.KeystrokeCapture` the GUI uses, timed by
+an :class:`EventClock`, so a recording yields exactly the dwell times the
+views compute when it is replayed into them.
+"""
+
+import csv
+import gzip
+import json
+import sys
+from collections.abc import Iterable, Iterator
+from contextlib import contextmanager
+from pathlib import Path
+from typing import IO, NamedTuple
+
+from keyguard.capture import KeystrokeCapture
+
+PRESS: str = "press"
+RELEASE: str = "release"
+RUN: str = "run"
+FIELDS: tuple[str, ...] = ("t", "type", "key", "text")
+
+# Qt.Key.Key_Return, the key that submits the typed phrase
+RETURN_KEY: int = 0x01000004
+
+
+class KeyEvent(NamedTuple):
+    """One recorded key event.
+
+    Attributes:
+        t: the event time in milliseconds
+        type: ``"press"`` or ``"release"``
+        key: the Qt key code
+        text: the text the key types, empty for modifiers and the like
+    """
+
+    t: float
+    type: str
+    key: int
+    text: str = ""
+
+
+class EventClock:
+    """Clock reporting the time of the event being processed.
+
+    Passed as the ``clock`` of a :class:`KeystrokeCapture` (or a view) so
+    dwell times come from recorded timestamps instead of the wall clock.
+    """
+
+    __slots__ = ("t",)
+
+    def __init__(self, t: float = 0.0) -> None:
+        """Initialize an EventClock.
+
+        Args:
+            t: the current time in milliseconds
+        """
+        self.t = t
+
+    def __call__(self) -> float:
+        """Return the current time in seconds."""
+        return self.t / 1000
+
+
+def _is_csv(path: str | Path) -> bool:
+    """Whether a path names a CSV recording, compressed or not."""
+    return Path(str(path).removesuffix(".gz")).suffix.lower() == ".csv"
+
+
+@contextmanager
+def _open(path: str | Path, mode: str) -> Iterator[IO[str]]:
+    """Open a recording as text, decompressing ``.gz`` files."""
+    if str(path) == "-":
+        yield sys.stdin if mode == "r" else sys.stdout
+    elif str(path).endswith(".gz"):
+        with gzip.open(path, mode + "t", encoding="utf-8", newline="") as file:
+            yield file
+    else:
+        with open(path, mode, encoding="utf-8", newline="") as file:
+            yield file
+
+
+def _event(row: dict | list, line: int) -> KeyEvent:
+    """Validate one parsed row.
+
+    Raises:
+        ValueError: if the row is not a key event
+    """
+    try:
+        if isinstance(row, dict):
+            row = [row["t"], row["type"], row["key"], row.get("text", "")]
+        t, kind, key, text = row
+        if kind not in (PRESS, RELEASE):
+            raise ValueError(f"unknown event type {kind!r}")
+        return KeyEvent(float(t), kind, int(key), text or "")
+    except (KeyError, TypeError, ValueError) as e:
+        raise ValueError(f"line {line}: invalid key event: {e}") from e
+
+
+def read_events(path: str | Path) -> Iterator[KeyEvent]:
+    """Stream the events of a recording.
+
+    Args:
+        path: a ``.jsonl`` or ``.csv`` file, optionally ``.gz``, or ``-``
+
+    Yields:
+        KeyEvent: the events in file order
+
+    Raises:
+        ValueError: if a line is not a valid key event
+    """
+    with _open(path, "r") as file:
+        if _is_csv(path):
+            reader = csv.reader(file)
+            if next(reader, None) != list(FIELDS):
+                raise ValueError(f"{path}: expected a {','.join(FIELDS)} header")
+            for line, row in enumerate(reader, 2):
+                yield _event(row, line)
+            return
+
+        for line, row in _iter_rows(file):
+            if not (isinstance(row, dict) and row.get("type") == RUN):
+                yield _event(row, line)
+
+
+def _iter_rows(file: IO[str]) -> Iterator[tuple[int, dict | list]]:
+    """Parse the non-empty lines of a JSONL file.
+
+    Raises:
+        ValueError: if a line is not valid JSON
+    """
+    for line, text in enumerate(file, 1):
+        if text.strip():
+            try:
+                yield line, json.loads(text)
+            except json.JSONDecodeError as e:
+                raise ValueError(f"line {line}: {e}") from e
+
+
+def read_runs(path: str | Path) -> Iterator[list[float]]:
+    """Stream the dwell runs stored in a JSONL recording.
+
+    Args:
+        path: a ``.jsonl`` file, optionally ``.gz``, or ``-``
+
+    Yields:
+        list[float]: the recorded runs in file order
+    """
+    if _is_csv(path):
+        return
+    with _open(path, "r") as file:
+        for _, row in _iter_rows(file):
+            if isinstance(row, dict) and row.get("type") == RUN:
+                yield [float(dwell) for dwell in row["dwells"]]
+
+
+def write_events(
+    path: str | Path,
+    events: Iterable[KeyEvent],
+    runs: Iterable[list[float]] = (),
+) -> int:
+    """Write events to a recording.
+
+    Args:
+        path: a ``.jsonl`` or ``.csv`` file, optionally ``.gz``, or ``-``
+        events: the events to write
+        runs: captured dwell runs stored after the events (JSONL only)
+
+    Returns:
+        int: the number of events written
+    """
+    count = 0
+    with _open(path, "w") as file:
+        if _is_csv(path):
+            writer = csv.writer(file, lineterminator="\n")
+            writer.writerow(FIELDS)
+            for event in events:
+                writer.writerow(event)
+                count += 1
+        else:
+            for event in events:
+                row = json.dumps(
+                    event._asdict(), ensure_ascii=False, separators=(",", ":")
+                )
+                file.write(row + "\n")
+                count += 1
+            for dwells in runs:
+                row = json.dumps({"type": RUN, "dwells": dwells}, separators=(",", ":"))
+                file.write(row + "\n")
+    return count
+
+
+def iter_runs(events: Iterable[KeyEvent], phrase: str) -> Iterator[list[float]]:
+    """Extract the accepted dwell runs of a phrase from an event stream.
+
+    Follows the rules of the training view: correctly typed characters are
+    captured per key, a wrong character restarts the run, and Return accepts
+    the run if exactly the phrase was typed.
+
+    Args:
+        events: the key events, in order
+        phrase: the phrase being typed
+
+    Yields:
+        list[float]: the dwell times of every accepted run
+    """
+    clock = EventClock()
+    capture = KeystrokeCapture(len(phrase), clock)
+    overflow = False
+    for event in events:
+        clock.t = event.t
+        if event.type == PRESS:
+            capture.press(event.key)
+            continue
+
+        dwell = capture.release(event.key)
+        if event.key == RETURN_KEY:
+            if capture.full and not overflow:
+                yield capture.dwells()
+            capture.clear()
+            overflow = False
+        elif event.text and capture.full:
+            overflow = True
+        elif event.text:
+            if event.text == phrase[capture.count] and dwell is not None:
+                capture.record(dwell)
+            else:
+                capture.clear()
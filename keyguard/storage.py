@@ -0,0 +1,503 @@
+"""Profile storage engine.
+
+A profile is kept in two files inside the data directory:
+
+* ``<name>.json`` -- a small header with everything except the session history
+  (uuid, phrase, aggregates, revision, ...). It is always replaced atomically:
+  written to a temporary file, fsynced and renamed over the old one.
+* ``<name>.sessions.jsonl`` -- an append-only log with one session per line.
+  Sessions reference their dwell runs by a ``[run_start, run_stop)`` range.
+* ``<name>.manifest.json`` -- a few summary fields (uuid, phrase, dates, run
+  and session counts, average dwell) rewritten atomically with every header,
+  so that UI state checks never parse the aggregates or the history.
+* ``<name>.runs.bin`` -- a columnar float32 matrix of shape runs x positions
+  holding every stored run, opened through :class:`numpy.memmap` and grown by
+  doubling its capacity.
+
+The header records ``log_size`` and ``run_count``, the parts of the log and the
+run matrix that belong to the committed state. Data past them (a torn append)
+is ignored when reading and overwritten by the next append, so saving a session
+costs O(session) instead of rewriting the whole history.
+
+Rewriting the history (saving a profile with its sessions) writes a new
+generation of the log and the run matrix, ``<name>.sessions.<g>.jsonl`` and
+``<name>.runs.<g>.bin``, next to the committed one. The header names its
+``generation``, so committing it switches to the new files in a single atomic
+rename; the files of other generations are removed afterwards. Generation 0
+uses the plain names above.
+
+Profiles written by earlier versions -- a single ``profile.json`` embedding the
+sessions, or a session log with inline runs -- are migrated to this layout the
+first time they are read. Their aggregates are then rebuilt from the stored
+float32 runs so that later incremental updates stay consistent with them.
+"""
+
+import glob
+import json
+import os
+import struct
+from collections.abc import Iterator
+from pathlib import Path
+from typing import Any
+
+import numpy as np
+
+from keyguard.logic import rebuild_profile_from_history, update_aggregate_profile
+
+FORMAT_VERSION: int = 3
+RUN_DTYPE = np.dtype("<f4")
+SUMMARY_FIELDS: tuple[str, ...] = (
+    "uuid",
+    "phrase",
+    "created",
+    "updated",
+    "revision",
+    "total_runs",
+    "session_count",
+)
+
+
+def _fsync_dir(directory: Path) -> None:
+    """Flush a directory entry so a rename survives a crash (POSIX only)."""
+    if os.name != "posix":
+        return
+    fd = os.open(directory, os.O_RDONLY)
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
+
+def profile_summary(profile: dict[str, Any]) -> dict[str, Any]:
+    """Extract the manifest fields of a profile.
+
+    Args:
+        profile: the profile header
+
+    Returns:
+        dict[str, Any]: the summary fields plus ``avg_dwell`` (None if unknown)
+    """
+    summary = {field: profile[field] for field in SUMMARY_FIELDS if field in profile}
+    means = profile.get("means")
+    summary["avg_dwell"] = float(np.mean(means)) if means else None
+    return summary
+
+
+def write_atomic(path: Path, data: bytes) -> None:
+    """Replace a file atomically with fsync and rename.
+
+    Args:
+        path: the file to replace
+        data: the new content
+    """
+    tmp_path = path.with_name(path.name + ".tmp")
+    with open(tmp_path, "wb") as f:
+        f.write(data)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, path)
+    _fsync_dir(path.parent)
+
+
+class RunMatrix:
+    """Growable on-disk float32 matrix of dwell runs (runs x positions).
+
+    The file starts with a fixed header (magic, positions, capacity) followed
+    by ``capacity`` row slots. The number of valid rows is tracked by the
+    owner, so a partially written append never becomes visible.
+    """
+
+    MAGIC: bytes = b"KGRUNS01"
+    HEADER = struct.Struct("<8sIIQ")
+    OFFSET: int = 64
+    MIN_CAPACITY: int = 16
+
+    def __init__(self, path: Path) -> None:
+        """Initialize a RunMatrix.
+
+        Args:
+            path: the path of the matrix file
+        """
+        self.path = path
+
+    def _read_header(self) -> tuple[int, int]:
+        with open(self.path, "rb") as f:
+            magic, positions, _, capacity = self.HEADER.unpack(f.read(self.HEADER.size))
+        if magic != self.MAGIC:
+            raise ValueError(f"{self.path} is not a run matrix file")
+        return positions, capacity
+
+    def view(self, count: int) -> np.ndarray:
+        """Map the first ``count`` runs read-only without copying them.
+
+        Args:
+            count: the number of committed runs
+
+        Returns:
+            np.ndarray: a ``(count, positions)`` float32 memmap view
+        """
+        if not count:
+            return np.empty((0, 0), dtype=RUN_DTYPE)
+        positions, _ = self._read_header()
+        return np.memmap(
+            self.path,
+            dtype=RUN_DTYPE,
+            mode="r",
+            offset=self.OFFSET,
+            shape=(count, positions),
+        )
+
+    def write(self, start: int, runs: np.ndarray) -> None:
+        """Store runs at row ``start``, growing the file if needed.
+
+        Args:
+            start: the first row to write
+            runs: the ``(k, positions)`` runs to store
+
+        Raises:
+            ValueError: if the run width does not match the file
+        """
+        count, positions = runs.shape
+        if self.path.exists():
+            stored_positions, capacity = self._read_header()
+            if stored_positions != positions:
+                raise ValueError(
+                    f"Run length mismatch: stored={stored_positions}, new={positions}"
+                )
+        else:
+            capacity = 0
+
+        needed = start + count
+        if needed > capacity:
+            capacity = max(capacity * 2, needed, self.MIN_CAPACITY)
+            with open(self.path, "ab") as f:
+                f.truncate(self.OFFSET + capacity * positions * RUN_DTYPE.itemsize)
+            with open(self.path, "r+b") as f:
+                f.write(self.HEADER.pack(self.MAGIC, positions, 0, capacity))
+
+        rows = np.memmap(
+            self.path,
+            dtype=RUN_DTYPE,
+            mode="r+",
+            offset=self.OFFSET + start * positions * RUN_DTYPE.itemsize,
+            shape=(count, positions),
+        )
+        rows[:] = runs
+        rows.flush()
+        del rows
+        with open(self.path, "rb+") as f:
+            os.fsync(f.fileno())
+
+    def delete(self) -> None:
+        """Remove the matrix file."""
+        self.path.unlink(missing_ok=True)
+
+
+class ProfileStore:
+    """Header, append-only session log and run matrix of a single profile."""
+
+    def __init__(self, path: Path) -> None:
+        """Initialize a ProfileStore.
+
+        Args:
+            path: the path of the profile header file
+        """
+        self.path = path
+        self.manifest_path = path.with_name(f"{path.stem}.manifest.json")
+
+    def log_file(self, header: dict[str, Any]) -> Path:
+        """Return the session log of a header's generation.
+
+        Args:
+            header: the profile header
+
+        Returns:
+            Path: the path of the session log
+        """
+        return self._data_file("sessions", "jsonl", header.get("generation", 0))
+
+    def run_matrix(self, header: dict[str, Any]) -> RunMatrix:
+        """Return the run matrix of a header's generation.
+
+        Args:
+            header: the profile header
+
+        Returns:
+            RunMatrix: the run matrix
+        """
+        return RunMatrix(self._data_file("runs", "bin", header.get("generation", 0)))
+
+    def _data_file(self, kind: str, suffix: str, generation: int) -> Path:
+        if not generation:
+            return self.path.with_name(f"{self.path.stem}.{kind}.{suffix}")
+        return self.path.with_name(f"{self.path.stem}.{kind}.{generation}.{suffix}")
+
+    def _data_files(self) -> Iterator[Path]:
+        """Yield the logs and run matrices of every generation on disk."""
+        stem = glob.escape(self.path.stem)
+        for pattern in (f"{stem}.sessions*.jsonl", f"{stem}.runs*.bin"):
+            yield from self.path.parent.glob(pattern)
+
+    def exists(self) -> bool:
+        """Check whether the profile header exists.
+
+        Returns:
+            bool: True if the profile exists
+        """
+        return self.path.exists()
+
+    def load_header(self) -> dict[str, Any]:
+        """Read the profile header, migrating a legacy profile first.
+
+        Returns:
+            dict[str, Any]: the header, without the session history
+
+        Raises:
+            FileNotFoundError: if the profile does not exist
+            json.JSONDecodeError: if the header is corrupt
+        """
+        with open(self.path, encoding="utf-8") as f:
+            header = json.load(f)
+        if header.get("format") != FORMAT_VERSION:
+            header = self._migrate(header)
+        return header
+
+    def load_summary(self) -> dict[str, Any]:
+        """Read the profile manifest, creating it from the header if missing.
+
+        Returns:
+            dict[str, Any]: the summary fields, see :func:`profile_summary`
+
+        Raises:
+            FileNotFoundError: if the profile does not exist
+        """
+        try:
+            with open(self.manifest_path, encoding="utf-8") as f:
+                return json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            if not self.path.exists():
+                raise
+        header = self.load_header()
+        self._write_manifest(header)
+        return profile_summary(header)
+
+    def runs(self, header: dict[str, Any] | None = None) -> np.ndarray:
+        """Map every committed run as one zero-copy matrix.
+
+        Args:
+            header: the already loaded header, read from disk if omitted
+
+        Returns:
+            np.ndarray: the read-only ``(runs, positions)`` float32 matrix
+        """
+        if header is None:
+            header = self.load_header()
+        return self.run_matrix(header).view(header.get("run_count", 0))
+
+    def iter_sessions(
+        self, header: dict[str, Any] | None = None, as_arrays: bool = False
+    ) -> Iterator[dict]:
+        """Stream the committed sessions from the log.
+
+        Args:
+            header: the already loaded header, read from disk if omitted
+            as_arrays: give ``runs`` as zero-copy float32 views instead of lists
+
+        Yields:
+            dict: the sessions in the order they were saved
+        """
+        if header is None:
+            header = self.load_header()
+        matrix = self.runs(header)
+        for record in self._iter_log(header):
+            if "runs" not in record:
+                runs = matrix[record.pop("run_start") : record.pop("run_stop")]
+                record["runs"] = runs if as_arrays else runs.astype(float).tolist()
+            yield record
+
+    def _iter_log(self, header: dict[str, Any]) -> Iterator[dict]:
+        remaining = header.get("log_size", 0)
+        if not remaining:
+            return
+
+        with open(self.log_file(header), "rb") as f:
+            for line in f:
+                if len(line) > remaining:
+                    break
+                remaining -= len(line)
+                yield json.loads(line)
+
+    def load(self) -> dict[str, Any]:
+        """Read the header together with the full session history.
+
+        Returns:
+            dict[str, Any]: the profile, with ``sessions`` filled in
+        """
+        header = self.load_header()
+        header["sessions"] = list(self.iter_sessions(header))
+        return header
+
+    def save(self, profile: dict[str, Any]) -> None:
+        """Write a profile.
+
+        If ``profile`` holds a ``sessions`` list, the log and the run matrix are
+        rewritten from it as a new generation and the aggregates are rebuilt
+        from the stored runs. The committed files are left alone until the
+        header naming the new generation has replaced the old one, so a crash
+        leaves either the old or the new profile. Otherwise only the header is
+        replaced.
+
+        Args:
+            profile: the profile data
+        """
+        header = {k: v for k, v in profile.items() if k != "sessions"}
+        if "sessions" not in profile:
+            self._commit(header)
+            return
+
+        header["generation"] = (
+            max(self._committed_generation(), header.get("generation", 0)) + 1
+        )
+        log_path = self.log_file(header)
+        log_path.unlink(missing_ok=True)
+        self.run_matrix(header).delete()
+        header["log_size"] = header["run_count"] = header["session_count"] = 0
+        write_atomic(log_path, b"")
+        for session in profile["sessions"]:
+            self._append(header, session)
+        rebuild_profile_from_history(header, runs=self.runs(header))
+        self._commit(header)
+
+        current = {log_path, self.run_matrix(header).path}
+        for path in self._data_files():
+            if path not in current:
+                path.unlink(missing_ok=True)
+
+    def _committed_generation(self) -> int:
+        """Return the generation of the header on disk, 0 if there is none."""
+        try:
+            with open(self.path, encoding="utf-8") as f:
+                return json.load(f).get("generation", 0)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return 0
+
+    def append_session(self, header: dict[str, Any], session: dict[str, Any]) -> None:
+        """Append a session and fold it into the aggregates.
+
+        The runs and the log entry are written and fsynced before the header
+        that references them is committed. The aggregates are updated from the
+        runs as stored (float32), so they always match a rebuild. ``header`` is
+        updated in place, including its ``sessions`` list if it has one.
+
+        Args:
+            header: the current profile header
+            session: the session data
+        """
+        self.append_sessions(header, [session])
+
+    def append_sessions(
+        self,
+        header: dict[str, Any],
+        sessions: list[dict[str, Any]],
+        aggregate: bool = True,
+    ) -> None:
+        """Append several sessions with a single header commit.
+
+        Args:
+            header: the current profile header
+            sessions: the sessions, in order
+            aggregate: fold the sessions into the aggregates; pass False if
+                ``header`` already holds them (computed from float32 runs)
+
+        Raises:
+            ValueError: if the log is shorter than ``header`` says, i.e. the
+                header is stale
+        """
+        for session in sessions:
+            stored = self._append(header, session)
+            if aggregate:
+                update_aggregate_profile(header, {"runs": stored})
+            if "sessions" in header:
+                header["sessions"].append(session)
+        self._commit(header)
+
+    def rebuild(self, header: dict[str, Any] | None = None) -> dict[str, Any]:
+        """Recompute the aggregates from the run matrix and commit them.
+
+        Args:
+            header: the already loaded header, read from disk if omitted
+
+        Returns:
+            dict[str, Any]: the updated header
+        """
+        if header is None:
+            header = self.load_header()
+        rebuild_profile_from_history(header, runs=self.runs(header))
+        self._commit(header)
+        return header
+
+    def _append(self, header: dict[str, Any], session: dict[str, Any]) -> np.ndarray:
+        """Write a session's runs and log entry; return the stored runs."""
+        runs = np.asarray(session.get("runs", []), dtype=RUN_DTYPE)
+        start = header.get("run_count", 0)
+        stop = start + len(runs)
+        matrix = self.run_matrix(header)
+        if len(runs):
+            matrix.write(start, runs.reshape(len(runs), -1))
+
+        record = {k: v for k, v in session.items() if k != "runs"}
+        record["run_start"], record["run_stop"] = start, stop
+        line = _encode_session(record)
+        committed = header.get("log_size", 0)
+        log_path = self.log_file(header)
+        with open(log_path, "ab") as f:
+            if f.tell() < committed:
+                raise ValueError(
+                    f"{log_path} is shorter than its header says "
+                    f"({f.tell()} < {committed} bytes)"
+                )
+            if f.tell() > committed:
+                f.truncate(committed)
+            f.write(line)
+            f.flush()
+            os.fsync(f.fileno())
+
+        header["run_count"] = stop
+        header["session_count"] = header.get("session_count", 0) + 1
+        header["log_size"] = committed + len(line)
+        return matrix.view(stop)[start:stop].astype(float)
+
+    def delete(self) -> None:
+        """Remove the header, the manifest, the session logs and run matrices."""
+        self.manifest_path.unlink(missing_ok=True)
+        self.path.unlink(missing_ok=True)
+        for path in self._data_files():
+            path.unlink(missing_ok=True)
+
+    def _commit(self, header: dict[str, Any]) -> None:
+        header["format"] = FORMAT_VERSION
+        header.setdefault("session_count", 0)
+        header.setdefault("log_size", 0)
+        header.setdefault("run_count", 0)
+        fields = {k: v for k, v in header.items() if k != "sessions"}
+        data = json.dumps(fields, ensure_ascii=False, indent=2).encode("utf-8")
+        write_atomic(self.path, data)
+        self._write_manifest(header)
+
+    def _write_manifest(self, header: dict[str, Any]) -> None:
+        summary = profile_summary(header)
+        data = json.dumps(summary, ensure_ascii=False, indent=2).encode("utf-8")
+        write_atomic(self.manifest_path, data)
+
+    def _migrate(self, legacy: dict[str, Any]) -> dict[str, Any]:
+        """Convert an older profile layout to the current one."""
+        if "sessions" not in legacy:
+            # format 2: session log with inline runs
+            legacy["sessions"] = list(self._iter_log(legacy))
+        self.save(legacy)
+        return self.load_header()
+
+
+def _encode_session(session: dict[str, Any]) -> bytes:
+    text = json.dumps(session, ensure_ascii=False, separators=(",", ":"))
+    return (text + "\n").encode("utf-8")
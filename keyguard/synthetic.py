@@ -0,0 +1,263 @@
+"""Synthetic typists.
+
+A :class:`Typist` models one person typing a phrase: the dwell time of every
+phrase position follows its own log-normal distribution, with a median and a
+log-space spread drawn once per typist. Genuine attempts are drawn from a
+typist, impostor attempts from a different typist (optionally one imitating
+the genuine user), and both can be degraded with outliers -- keys held far
+too long -- and with drift, a gradual change of the typing speed over the
+generated runs.
+
+Every typist owns a seeded ``numpy`` generator, so the same seed always gives
+the same runs. Runs come as ``(runs, positions)`` matrices, as training
+sessions in the profile format or as key events of a recording (see
+:mod:`keyguard.recording`).
+
+Usage:
+------
+    python -m keyguard.synthetic typist.jsonl [--runs N] [--seed S] [--impostor]
+"""
+
+import argparse
+import time
+from collections.abc import Iterator
+from typing import Any
+
+import numpy as np
+
+from keyguard.config import MAX_TRAINING_RUNS, PHRASE
+from keyguard.recording import (
+    PRESS,
+    RELEASE,
+    RETURN_KEY,
+    KeyEvent,
+    iter_runs,
+    write_events,
+)
+
+Seed = int | np.random.SeedSequence | np.random.Generator | None
+
+MEDIAN_RANGE: tuple[float, float] = (60.0, 160.0)
+SIGMA_RANGE: tuple[float, float] = (0.08, 0.25)
+FLIGHT_MS: tuple[float, float] = (40.0, 120.0)
+
+
+class Typist:
+    """Per-position log-normal dwell-time model of one person."""
+
+    __slots__ = ("mu", "rng", "sigma")
+
+    def __init__(self, mu: np.ndarray, sigma: np.ndarray, seed: Seed = None) -> None:
+        """Initialize a Typist.
+
+        Args:
+            mu: the per-position mean of the log dwell time (log milliseconds)
+            sigma: the per-position standard deviation of the log dwell time
+            seed: the seed or generator the runs are drawn with
+        """
+        self.mu = np.asarray(mu, dtype=float)
+        self.sigma = np.asarray(sigma, dtype=float)
+        self.rng = np.random.default_rng(seed)
+
+    @classmethod
+    def random(
+        cls,
+        positions: int = len(PHRASE),
+        seed: Seed = None,
+        median_range: tuple[float, float] = MEDIAN_RANGE,
+        sigma_range: tuple[float, float] = SIGMA_RANGE,
+    ) -> "Typist":
+        """Draw a typist.
+
+        Args:
+            positions: the phrase length
+            seed: the seed or generator of the typist
+            median_range: the range of the per-position median dwell times, ms
+            sigma_range: the range of the per-position log-space spreads
+
+        Returns:
+            Typist: a typist whose runs continue the same generator
+        """
+        rng = np.random.default_rng(seed)
+        mu = np.log(rng.uniform(*median_range, positions))
+        sigma = rng.uniform(*sigma_range, positions)
+        return cls(mu, sigma, rng)
+
+    @property
+    def positions(self) -> int:
+        """The phrase length."""
+        return len(self.mu)
+
+    @property
+    def means(self) -> np.ndarray:
+        """The true per-position mean dwell times in milliseconds."""
+        return np.exp(self.mu + self.sigma**2 / 2)
+
+    @property
+    def variances(self) -> np.ndarray:
+        """The true per-position dwell-time variances."""
+        return (np.exp(self.sigma**2) - 1) * np.exp(2 * self.mu + self.sigma**2)
+
+    def impostor(self, seed: Seed = None, similarity: float = 0.0) -> "Typist":
+        """Draw an impostor for this typist.
+
+        Args:
+            seed: the seed or generator of the impostor, spawned from this
+                typist's generator if omitted
+            similarity: how closely the impostor imitates this typist, from
+                0 (an unrelated typist) to 1 (the same distributions)
+
+        Returns:
+            Typist: the impostor
+        """
+        if seed is None:
+            seed = self.rng.spawn(1)[0]
+        other = Typist.random(self.positions, seed)
+        other.mu = (1 - similarity) * other.mu + similarity * self.mu
+        other.sigma = (1 - similarity) * other.sigma + similarity * self.sigma
+        return other
+
+    def runs(
+        self,
+        count: int,
+        outlier_rate: float = 0.0,
+        outlier_scale: float = 4.0,
+        drift: float = 0.0,
+        dtype: type = np.float64,
+    ) -> np.ndarray:
+        """Draw dwell runs.
+
+        Args:
+            count: the number of runs
+            outlier_rate: the probability of any one dwell time being an
+                outlier, a key held ``outlier_scale / 2`` to ``outlier_scale``
+                times longer than drawn
+            outlier_scale: the largest outlier factor
+            drift: the relative change of the typing speed over the runs,
+                e.g. ``0.2`` for dwell times 20 % longer by the last run
+            dtype: the dtype of the matrix
+
+        Returns:
+            np.ndarray: the ``(count, positions)`` dwell times in milliseconds
+        """
+        runs = self.rng.standard_normal((count, self.positions), dtype=dtype)
+        runs *= self.sigma.astype(dtype)
+        runs += self.mu.astype(dtype)
+        if drift and count > 1:
+            runs += np.linspace(0, np.log1p(drift), count, dtype=dtype)[:, None]
+        np.exp(runs, out=runs)
+        if outlier_rate:
+            hit = self.rng.random(runs.shape) < outlier_rate
+            runs[hit] *= self.rng.uniform(
+                outlier_scale / 2, outlier_scale, np.count_nonzero(hit)
+            )
+        return runs
+
+    def sessions(
+        self,
+        count: int,
+        runs_per_session: int = MAX_TRAINING_RUNS,
+        phrase: str = PHRASE,
+        **noise: float,
+    ) -> list[dict[str, Any]]:
+        """Draw training sessions in the profile format.
+
+        Args:
+            count: the number of sessions
+            runs_per_session: the runs of every session
+            phrase: the typed phrase
+            **noise: ``outlier_rate``, ``outlier_scale`` and ``drift`` of
+                :meth:`runs`, applied over all sessions
+
+        Returns:
+            list[dict[str, Any]]: the sessions, oldest first
+        """
+        runs = self.runs(count * runs_per_session, **noise).round(3)
+        start = int(time.time()) - count * 60
+        return [
+            {
+                "session_id": f"{self.rng.integers(1 << 32):08x}",
+                "phrase": phrase,
+                "timestamp": start + idx * 60,
+                "total_runs": runs_per_session,
+                "accepted_runs": runs_per_session,
+                "runs": chunk.tolist(),
+            }
+            for idx, chunk in enumerate(np.split(runs, count))
+        ]
+
+    def events(
+        self, runs: np.ndarray, phrase: str = PHRASE, start: float = 0.0
+    ) -> Iterator[KeyEvent]:
+        """Turn dwell runs into the key events of typing them.
+
+        Every character is pressed after a random flight time and released
+        after its dwell time; every run is submitted with Return. Reading the
+        events back with :func:`keyguard.recording.iter_runs` yields the runs,
+        up to floating-point rounding of the timestamps.
+
+        Args:
+            runs: the ``(runs, len(phrase))`` dwell times in milliseconds
+            phrase: the typed phrase
+            start: the time of the first event in milliseconds
+
+        Yields:
+            KeyEvent: the events in time order
+        """
+        keys = [ord(char.upper()) for char in phrase]
+        t = start
+        for run in runs:
+            flights = self.rng.uniform(*FLIGHT_MS, len(phrase) + 1)
+            for key, char, dwell, flight in zip(
+                keys, phrase, run.tolist(), flights.tolist(), strict=False
+            ):
+                t += flight
+                yield KeyEvent(t, PRESS, key, char)
+                t += dwell
+                yield KeyEvent(t, RELEASE, key, char)
+            t += flights[-1]
+            yield KeyEvent(t, PRESS, RETURN_KEY, "\r")
+            t += FLIGHT_MS[0]
+            yield KeyEvent(t, RELEASE, RETURN_KEY, "\r")
+
+
+def population(
+    count: int, positions: int = len(PHRASE), seed: Seed = 0
+) -> list[Typist]:
+    """Draw independent typists.
+
+    Args:
+        count: the number of typists
+        positions: the phrase length
+        seed: the seed of the population
+
+    Returns:
+        list[Typist]: typists with independent generators spawned from the seed
+    """
+    rng = np.random.default_rng(seed)
+    return [Typist.random(positions, child) for child in rng.spawn(count)]
+
+
+def main() -> None:
+    """Write a synthetic recording."""
+    parser = argparse.ArgumentParser(description="Write a synthetic recording.")
+    parser.add_argument("path", help="the recording (.jsonl/.csv[.gz], -)")
+    parser.add_argument("--runs", type=int, default=40, help="runs to type")
+    parser.add_argument("--seed", type=int, default=0, help="the typist's seed")
+    parser.add_argument(
+        "--impostor", action="store_true", help="type as an impostor of the typist"
+    )
+    parser.add_argument("--outlier-rate", type=float, default=0.0)
+    parser.add_argument("--drift", type=float, default=0.0)
+    args = parser.parse_args()
+
+    typist = Typist.random(len(PHRASE), args.seed)
+    if args.impostor:
+        typist = typist.impostor()
+    runs = typist.runs(args.runs, args.outlier_rate, drift=args.drift).round(3)
+    events = list(typist.events(runs))
+    write_events(args.path, events, iter_runs(events, PHRASE))
+
+
+if __name__ == "__main__":
+    main()
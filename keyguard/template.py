@@ -0,0 +1,255 @@
+"""Compiled authentication templates.
+
+An :class:`AuthTemplate` is the read-only form of a profile that verification
+needs: contiguous arrays of per-position means and standard deviations, plus
+floored thresholds memoized per ``(threshold_factor, min_threshold)``. It is
+built from the stored aggregates, so no session history is scanned, and is
+cached per profile uuid and revision.
+
+A template also carries the profile's own ``threshold_factor`` and
+``min_threshold`` (chosen by :mod:`keyguard.tuning`, the global defaults until
+then); scoring uses them unless other values are passed.
+"""
+
+from collections import OrderedDict
+from typing import Any
+
+import numpy as np
+
+from keyguard.config import AUTH_MIN_THRESHOLD, AUTH_THRESHOLD_FACTOR
+from keyguard.logic import (
+    BatchScore,
+    RunAccumulator,
+    floored_thresholds,
+    margin_scores,
+)
+
+TEMPLATE_CACHE_SIZE: int = 32
+
+TemplateKey = tuple[str, int, int]
+
+
+class AuthTemplate:
+    """Immutable per-position means and thresholds of one profile revision."""
+
+    __slots__ = (
+        "_thresholds",
+        "key",
+        "means",
+        "min_threshold",
+        "threshold_factor",
+        "variances",
+    )
+
+    def __init__(
+        self,
+        key: TemplateKey,
+        means: np.ndarray,
+        variances: np.ndarray,
+        threshold_factor: float = AUTH_THRESHOLD_FACTOR,
+        min_threshold: float = AUTH_MIN_THRESHOLD,
+    ) -> None:
+        """Initialize an AuthTemplate.
+
+        Args:
+            key: the cache key of the profile revision
+            means: the per-position means
+            variances: the per-position sample variances
+            threshold_factor: the profile's number of standard deviations
+                allowed
+            min_threshold: the profile's minimum threshold
+        """
+        self.key = key
+        self.means = np.ascontiguousarray(means, dtype=float)
+        self.variances = np.ascontiguousarray(variances, dtype=float)
+        self.means.flags.writeable = False
+        self.variances.flags.writeable = False
+        self.threshold_factor = float(threshold_factor)
+        self.min_threshold = float(min_threshold)
+        self._thresholds: dict[tuple[float, float], np.ndarray] = {}
+        self.thresholds()
+
+    @classmethod
+    def from_profile(cls, profile: dict[str, Any]) -> "AuthTemplate":
+        """Compile a template from the aggregates stored in a profile.
+
+        Args:
+            profile: the profile data
+
+        Returns:
+            AuthTemplate: the compiled template
+        """
+        acc = RunAccumulator.from_profile(profile)
+        return cls(
+            template_key(profile),
+            acc.mean,
+            acc.variances(),
+            profile.get("threshold_factor", AUTH_THRESHOLD_FACTOR),
+            profile.get("min_threshold", AUTH_MIN_THRESHOLD),
+        )
+
+    @property
+    def positions(self) -> int:
+        """Number of phrase positions."""
+        return len(self.means)
+
+    def thresholds(
+        self,
+        threshold_factor: float | None = None,
+        min_threshold: float | None = None,
+    ) -> np.ndarray:
+        """Return the floored thresholds for a threshold factor.
+
+        Args:
+            threshold_factor: the number of standard deviations allowed, the
+                profile's own if omitted
+            min_threshold: the minimum threshold, the profile's own if omitted
+
+        Returns:
+            np.ndarray: the read-only per-position thresholds
+        """
+        if threshold_factor is None:
+            threshold_factor = self.threshold_factor
+        if min_threshold is None:
+            min_threshold = self.min_threshold
+        key = (threshold_factor, min_threshold)
+        thresholds = self._thresholds.get(key)
+        if thresholds is None:
+            thresholds = floored_thresholds(
+                self.variances, threshold_factor, min_threshold
+            )
+            thresholds.flags.writeable = False
+            self._thresholds[key] = thresholds
+        return thresholds
+
+    def score(
+        self,
+        attempts: np.ndarray | list[list[float]],
+        threshold_factor: float | None = None,
+        min_threshold: float | None = None,
+    ) -> BatchScore:
+        """Score a batch of attempts against the template.
+
+        Args:
+            attempts: the ``(attempts, positions)`` dwell-time matrix
+            threshold_factor: the number of standard deviations allowed, the
+                profile's own if omitted
+            min_threshold: the minimum threshold, the profile's own if omitted
+
+        Returns:
+            BatchScore: the delta, threshold and ok matrices and decisions
+
+        Raises:
+          ValueError if the attempt width differs from the template.
+        """
+        attempts = np.atleast_2d(np.asarray(attempts, dtype=float))
+        if attempts.shape[1] != self.positions:
+            raise ValueError(
+                f"Input length mismatch: actual={attempts.shape[1]}, "
+                f"template={self.positions}"
+            )
+
+        thresholds = self.thresholds(threshold_factor, min_threshold)
+        deltas = np.abs(attempts - self.means)
+        ok = deltas <= thresholds
+        return BatchScore(
+            deltas=deltas,
+            thresholds=np.broadcast_to(thresholds, deltas.shape),
+            ok=ok,
+            accepted=ok.all(axis=1),
+        )
+
+    def margins(
+        self,
+        attempts: np.ndarray | list[list[float]],
+        min_threshold: float | None = None,
+    ) -> np.ndarray:
+        """Return the smallest threshold factor that accepts each attempt.
+
+        Args:
+            attempts: the ``(attempts, positions)`` dwell-time matrix
+            min_threshold: the minimum threshold, the profile's own if omitted
+
+        Returns:
+            np.ndarray: ``(attempts,)`` the scores, see
+            :func:`~keyguard.logic.margin_scores`
+
+        Raises:
+          ValueError if the attempt width differs from the template.
+        """
+        attempts = np.atleast_2d(np.asarray(attempts, dtype=float))
+        if attempts.shape[1] != self.positions:
+            raise ValueError(
+                f"Input length mismatch: actual={attempts.shape[1]}, "
+                f"template={self.positions}"
+            )
+        if min_threshold is None:
+            min_threshold = self.min_threshold
+        return margin_scores(attempts, self.means, self.variances, min_threshold)
+
+    def verify(
+        self,
+        attempt: np.ndarray | list[float],
+        threshold_factor: float | None = None,
+        min_threshold: float | None = None,
+    ) -> bool:
+        """Check a single attempt against the template.
+
+        Args:
+            attempt: the dwell times of the attempt
+            threshold_factor: the number of standard deviations allowed, the
+                profile's own if omitted
+            min_threshold: the minimum threshold, the profile's own if omitted
+
+        Returns:
+            bool: whether every position is within its threshold
+        """
+        if not self.positions or len(attempt) != self.positions:
+            return False
+        thresholds = self.thresholds(threshold_factor, min_threshold)
+        return bool(np.all(np.abs(np.asarray(attempt) - self.means) <= thresholds))
+
+
+_cache: OrderedDict[TemplateKey, AuthTemplate] = OrderedDict()
+
+
+def template_key(profile: dict[str, Any]) -> TemplateKey:
+    """Return the cache key of a profile revision.
+
+    Args:
+        profile: the profile data
+
+    Returns:
+        TemplateKey: ``(uuid, revision, total_runs)``
+    """
+    return (
+        str(profile.get("uuid", "")),
+        int(profile.get("revision", 0)),
+        int(profile.get("total_runs", 0)),
+    )
+
+
+def get_template(profile: dict[str, Any]) -> AuthTemplate:
+    """Return the compiled template of a profile, building it at most once.
+
+    Args:
+        profile: the profile data
+
+    Returns:
+        AuthTemplate: the cached or newly compiled template
+    """
+    key = template_key(profile)
+    template = _cache.get(key)
+    if template is not None:
+        _cache.move_to_end(key)
+        return template
+
+    template = _cache[key] = AuthTemplate.from_profile(profile)
+    if len(_cache) > TEMPLATE_CACHE_SIZE:
+        _cache.popitem(last=False)
+    return template
+
+
+def clear_template_cache() -> None:
+    """Drop every cached template."""
+    _cache.clear()
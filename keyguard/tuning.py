@@ -0,0 +1,294 @@
+"""Per-user threshold tuning.
+
+Chooses a profile's ``threshold_factor`` and ``min_threshold`` by
+leave-one-session-out cross-validation: every training session is held out in
+turn, a template is built from the other sessions and the held-out runs are
+scored against it, so every run is judged by a template that never saw it.
+
+Fold templates are not recomputed from the runs. Every session is reduced
+once to its per-position count, mean and M2; the totals are combined from
+them and each fold's statistics are the totals with that one session
+subtracted, which costs O(positions) per fold. Scoring the folds -- the
+held-out runs and the impostor attempts, if there are any, against every fold
+template -- is spread over a :class:`~concurrent.futures.ProcessPoolExecutor`.
+
+Attempts are scored once per minimum threshold with
+:func:`~keyguard.logic.margin_scores`, and the error rates of every threshold
+factor are read from the sorted scores as in :mod:`keyguard.evaluation`.
+Among the thresholds whose cross-validated false rejection rate (FRR) is at
+most ``target_frr``, the ones letting in the fewest impostor attempts are
+chosen (FAR averaged over the fold templates). Without impostor attempts the
+FAR is unknown, and the smallest threshold factor meeting the target is chosen
+at the first minimum threshold.
+"""
+
+import os
+from collections.abc import Sequence
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, NamedTuple
+
+import numpy as np
+
+from keyguard.config import AUTH_MIN_THRESHOLD
+from keyguard.logic import margin_scores
+
+TARGET_FRR: float = 0.05
+THRESHOLD_FACTORS: np.ndarray = np.linspace(1.0, 10.0, 1801)
+MIN_THRESHOLDS: tuple[float, ...] = (0.0, 2.5, 5.0, 7.5, 10.0, 15.0, 20.0)
+CHUNKS_PER_WORKER: int = 4
+
+
+class TuningResult(NamedTuple):
+    """Thresholds chosen for a profile and their cross-validated error rates.
+
+    Attributes:
+        threshold_factor: the chosen number of standard deviations allowed
+        min_threshold: the chosen minimum threshold
+        frr: the share of held-out genuine runs rejected
+        far: the share of impostor attempts accepted, None without impostors
+        folds: the number of sessions held out
+        runs: the number of held-out runs
+    """
+
+    threshold_factor: float
+    min_threshold: float
+    frr: float
+    far: float | None
+    folds: int
+    runs: int
+
+
+class _Context(NamedTuple):
+    """What every fold is scored with."""
+
+    impostor: np.ndarray | None
+    min_thresholds: np.ndarray
+    factors: np.ndarray
+
+
+def session_statistics(
+    sessions: Sequence[np.ndarray],
+) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Reduce every session to its per-position sufficient statistics.
+
+    Args:
+        sessions: the ``(runs, positions)`` run matrix of every session
+
+    Returns:
+        tuple[np.ndarray, np.ndarray, np.ndarray]: the ``(sessions,)`` run
+        counts and the ``(sessions, positions)`` means and sums of squared
+        deviations (M2)
+    """
+    counts = np.array([len(runs) for runs in sessions], dtype=float)
+    means = np.stack([runs.mean(axis=0) for runs in sessions])
+    m2 = np.stack(
+        [
+            ((runs - mean) ** 2).sum(axis=0)
+            for runs, mean in zip(sessions, means, strict=True)
+        ]
+    )
+    return counts, means, m2
+
+
+def leave_one_out(
+    counts: np.ndarray, means: np.ndarray, m2: np.ndarray
+) -> tuple[np.ndarray, np.ndarray]:
+    """Compute the statistics of every fold by subtracting its session.
+
+    The totals are combined from the sessions with Chan's formula, and a
+    session is taken out of them by running it backwards:
+    ``M2' = M2 - M2_k - n_k * n / (n - n_k) * (mean_k - mean)**2``.
+
+    Args:
+        counts: the ``(sessions,)`` run counts
+        means: the ``(sessions, positions)`` session means
+        m2: the ``(sessions, positions)`` session M2
+
+    Returns:
+        tuple[np.ndarray, np.ndarray]: the ``(sessions, positions)`` means and
+        sample variances of the runs outside each session
+    """
+    total = counts.sum()
+    n_k = counts[:, None]
+    total_mean = (n_k * means).sum(axis=0) / total
+    deviation = means - total_mean
+    total_m2 = m2.sum(axis=0) + (n_k * deviation**2).sum(axis=0)
+
+    rest = total - n_k
+    fold_means = (total * total_mean - n_k * means) / rest
+    fold_m2 = total_m2 - m2 - n_k * total / rest * deviation**2
+    np.maximum(fold_m2, 0.0, out=fold_m2)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        variances = np.where(rest > 1, fold_m2 / (rest - 1), 0.0)
+    return fold_means, variances
+
+
+def _score_folds(
+    context: _Context,
+    means: np.ndarray,
+    variances: np.ndarray,
+    held_out: list[np.ndarray],
+) -> tuple[np.ndarray, np.ndarray]:
+    """Score the held-out runs and the impostors against some fold templates.
+
+    Returns:
+        tuple[np.ndarray, np.ndarray]: the ``(min thresholds, runs)`` scores
+        of the held-out runs and, per minimum threshold and threshold factor,
+        the number of impostor attempts accepted summed over the folds
+    """
+    thresholds = context.min_thresholds
+    genuine = []
+    accepted = np.zeros((len(thresholds), len(context.factors)))
+    for fold_means, fold_variances, runs in zip(
+        means, variances, held_out, strict=True
+    ):
+        genuine.append(margin_scores(runs, fold_means, fold_variances, thresholds))
+        if context.impostor is None:
+            continue
+        scores = margin_scores(context.impostor, fold_means, fold_variances, thresholds)
+        scores.sort(axis=1)
+        for idx, row in enumerate(scores):
+            accepted[idx] += np.searchsorted(row, context.factors, side="right")
+    return np.concatenate(genuine, axis=1), accepted
+
+
+_worker_context: _Context | None = None
+
+
+def _init_worker(context: _Context) -> None:
+    """Keep the shared inputs in a worker process."""
+    global _worker_context
+    _worker_context = context
+
+
+def _score_chunk(
+    chunk: tuple[np.ndarray, np.ndarray, list[np.ndarray]],
+) -> tuple[np.ndarray, np.ndarray]:
+    """Score a chunk of folds in a worker process."""
+    return _score_folds(_worker_context, *chunk)
+
+
+def tune(
+    sessions: Sequence[np.ndarray | list[list[float]]],
+    impostor: np.ndarray | list[list[float]] | None = None,
+    min_thresholds: Sequence[float] | None = None,
+    target_frr: float = TARGET_FRR,
+    factors: np.ndarray = THRESHOLD_FACTORS,
+    workers: int | None = None,
+) -> TuningResult:
+    """Choose a profile's thresholds by leave-one-session-out cross-validation.
+
+    Args:
+        sessions: the dwell runs of every training session
+        impostor: the ``(attempts, positions)`` attempts of other people
+        min_thresholds: the minimum thresholds to try, only the first one
+            without impostors; :data:`MIN_THRESHOLDS` with impostors and the
+            default minimum threshold without if omitted
+        target_frr: the false rejection rate to stay under
+        factors: the ascending threshold factors to try
+        workers: the processes to score the folds in, all CPUs if omitted;
+            1 scores them in this process
+
+    Returns:
+        TuningResult: the chosen thresholds and their error rates
+
+    Raises:
+        ValueError: if there are fewer than two non-empty sessions
+    """
+    session_runs = [np.asarray(runs, dtype=float) for runs in sessions if len(runs)]
+    if len(session_runs) < 2:
+        raise ValueError("tuning needs at least two sessions with runs")
+    if min_thresholds is None:
+        min_thresholds = (
+            MIN_THRESHOLDS if impostor is not None else (AUTH_MIN_THRESHOLD,)
+        )
+    context = _Context(
+        None if impostor is None else np.asarray(impostor, dtype=float),
+        np.array(min_thresholds, dtype=float),
+        np.asarray(factors, dtype=float),
+    )
+
+    means, variances = leave_one_out(*session_statistics(session_runs))
+    workers = workers or os.cpu_count() or 1
+    bounds = np.array_split(np.arange(len(session_runs)), workers * CHUNKS_PER_WORKER)
+    chunks = [
+        (means[idx], variances[idx], [session_runs[i] for i in idx])
+        for idx in bounds
+        if len(idx)
+    ]
+    if workers == 1:
+        results = [_score_folds(context, *chunk) for chunk in chunks]
+    else:
+        with ProcessPoolExecutor(
+            workers, initializer=_init_worker, initargs=(context,)
+        ) as pool:
+            results = list(pool.map(_score_chunk, chunks))
+
+    genuine = np.concatenate([result[0] for result in results], axis=1)
+    genuine.sort(axis=1)
+    frr = np.stack(
+        [
+            1 - np.searchsorted(row, context.factors, side="right") / len(row)
+            for row in genuine
+        ]
+    )
+    accepted = sum(result[1] for result in results)
+    return _choose(
+        context, frr, accepted, len(session_runs), genuine.shape[1], target_frr
+    )
+
+
+def _choose(
+    context: _Context,
+    frr: np.ndarray,
+    accepted: np.ndarray,
+    folds: int,
+    runs: int,
+    target_frr: float,
+) -> TuningResult:
+    """Pick the thresholds from the cross-validated error rates.
+
+    Among the pairs whose FRR meets the target, the one with the lowest FAR
+    wins, or the tightest threshold factor without impostors; ties go to the
+    lower FRR. If no pair meets the target, the lowest FRR wins.
+    """
+    if context.impostor is None:
+        far = None
+        frr = frr[:1]
+        cost = np.broadcast_to(context.factors, frr.shape)
+    else:
+        far = accepted / (folds * len(context.impostor))
+        cost = far
+    meets = frr <= target_frr
+    cost = np.where(meets, cost, np.inf) if meets.any() else frr
+    best = np.lexsort((frr.ravel(), cost.ravel()))[0]
+    threshold, factor = np.unravel_index(best, frr.shape)
+    return TuningResult(
+        round(float(context.factors[factor]), 6),
+        float(context.min_thresholds[threshold]),
+        round(float(frr[threshold, factor]), 6),
+        None if far is None else round(float(far[threshold, factor]), 6),
+        folds,
+        runs,
+    )
+
+
+def apply_tuning(profile: dict[str, Any], result: TuningResult) -> None:
+    """Store tuned thresholds in a profile.
+
+    The revision is bumped so that cached templates of the profile are
+    rebuilt with the new thresholds.
+
+    Args:
+        profile: the profile header, updated in place
+        result: the tuning result
+    """
+    profile["threshold_factor"] = result.threshold_factor
+    profile["min_threshold"] = result.min_threshold
+    profile["tuning"] = {
+        "frr": result.frr,
+        "far": result.far,
+        "folds": result.folds,
+        "runs": result.runs,
+    }
+    profile["revision"] = profile.get("revision", 0) + 1
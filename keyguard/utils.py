@@ -1,16 +1,18 @@
 """Utility functions."""
 
 import json
-import os
 import sys
+import threading
 import time
 import uuid
+from functools import cache
 from pathlib import Path
 
 from platformdirs import user_data_path
-from PyQt6.QtGui import QFontDatabase
-from PyQt6.QtSvgWidgets import QSvgWidget
-from PyQt6.QtWidgets import QWidget
+
+from keyguard.database import ProfileDatabase
+from keyguard.pipeline import aggregate_sessions
+from keyguard.storage import ProfileStore, profile_summary
 
 
 def get_resource_path(relative_path: str | Path) -> Path:
@@ -29,9 +31,12 @@ def get_resource_path(relative_path: str | Path) -> Path:
     return base_path / relative_path
 
 
+@cache
 def get_user_data_dir(app_name: str = "keyguard", app_author: str = "ange1o") -> Path:
     """Get the user data directory for the application.
 
+    The directory is created on the first call and then remembered.
+
     Args:
         app_name: The name of the application.
         app_author: The author of the application.
@@ -47,90 +52,302 @@ def get_user_data_dir(app_name: str = "keyguard", app_author: str = "ange1o") ->
     return data_dir
 
 
-def get_svg(
-    relative_path: str | Path,
-    parent: QWidget | None = None,
-    width: int | None = None,
-    height: int | None = None,
-) -> QSvgWidget:
-    """Create a QSvgWidget from an SVG file located in resources.
-
-    Optionally set fixed width/height to scale.
+class ProfileRepository:
+    """In-process cache of profile headers.
 
-    Args:
-        relative_path: Path inside resources folder
-        parent: parent widget
-        width: use as fixed width
-        height: use as fixed height
+    Parsed headers are kept per file name together with the ``(mtime_ns,
+    size)`` of the file they were read from; a cached header is reused until
+    that signature changes. Writes made through the repository refresh the
+    cache directly, so they never cause a re-read. The data directory is
+    resolved once.
 
-    Returns:
-        configured QSvgWidget
+    Callers receive shallow copies: top-level keys can be changed freely, while
+    nested values (e.g. ``means``) are shared and must be replaced, not
+    mutated in place -- which is how the logic module updates them. The
+    repository may be shared with worker threads; its operations are
+    serialized by a lock.
     """
-    path = get_resource_path(relative_path)
-    svg = QSvgWidget(str(path), parent=parent)
 
-    if width is not None:
-        svg.setFixedWidth(width)
+    def __init__(self, data_dir: Path | None = None) -> None:
+        """Initialize a ProfileRepository.
+
+        Args:
+            data_dir: the directory holding the profiles, resolved lazily
+        """
+        self._data_dir = data_dir
+        self._stores: dict[str, ProfileStore] = {}
+        self._headers: dict[str, tuple[tuple[int, int] | None, dict]] = {}
+        self._summaries: dict[str, tuple[tuple[int, int] | None, dict]] = {}
+        self._lock = threading.RLock()
+
+    @property
+    def data_dir(self) -> Path:
+        """The directory holding the profiles."""
+        if self._data_dir is None:
+            self._data_dir = get_user_data_dir()
+        return self._data_dir
+
+    def store(self, filename: str = "profile.json") -> ProfileStore:
+        """Return the storage engine of a profile.
+
+        Args:
+            filename: The name of the profile file.
+
+        Returns:
+            The profile store.
+        """
+        with self._lock:
+            store = self._stores.get(filename)
+            if store is None:
+                store = self._stores[filename] = ProfileStore(self.data_dir / filename)
+            return store
+
+    def load(
+        self, filename: str = "profile.json", include_sessions: bool = True
+    ) -> dict:
+        """Load a profile, reusing the cached header while the file is unchanged.
+
+        Args:
+            filename: The name of the profile file.
+            include_sessions: Whether to read the session history as well.
+
+        Returns:
+            The profile data.
+
+        Raises:
+            FileNotFoundError: if the profile does not exist
+        """
+        with self._lock:
+            store = self.store(filename)
+            signature = self._signature(store.path)
+            cached = self._headers.get(filename)
+            if cached is not None and signature is not None and cached[0] == signature:
+                header = cached[1]
+            else:
+                header = store.load_header()
+                self._remember(filename, header)
+
+        profile = dict(header)
+        if include_sessions:
+            profile["sessions"] = list(store.iter_sessions(header))
+        return profile
+
+    def summary(self, filename: str = "profile.json") -> dict:
+        """Load the manifest of a profile, cached like the headers.
+
+        Args:
+            filename: The name of the profile file.
+
+        Returns:
+            The summary fields of the profile.
+
+        Raises:
+            FileNotFoundError: if the profile does not exist
+        """
+        with self._lock:
+            store = self.store(filename)
+            cached = self._summaries.get(filename)
+            signature = self._signature(store.manifest_path)
+            if cached is None or signature is None or cached[0] != signature:
+                summary = store.load_summary()
+                cached = self._summaries[filename] = (
+                    self._signature(store.manifest_path),
+                    summary,
+                )
+            return dict(cached[1])
+
+    def save(self, profile: dict, filename: str = "profile.json") -> None:
+        """Write a profile and refresh the cache.
+
+        Args:
+            profile: The profile data.
+            filename: The name of the profile file.
+        """
+        with self._lock:
+            self.store(filename).save(profile)
+            self.invalidate(filename)
+
+    def append_session(
+        self, profile: dict, session: dict, filename: str = "profile.json"
+    ) -> None:
+        """Append a session to a profile and refresh the cache.
+
+        Args:
+            profile: The profile header, updated in place.
+            session: The session data.
+            filename: The name of the profile file.
+        """
+        self.append_sessions(profile, [session], filename)
+
+    def append_sessions(
+        self,
+        profile: dict,
+        sessions: list[dict],
+        filename: str = "profile.json",
+        aggregate: bool = True,
+    ) -> None:
+        """Append several sessions with one header write and refresh the cache.
+
+        Args:
+            profile: The profile header, updated in place.
+            sessions: The sessions, in order.
+            filename: The name of the profile file.
+            aggregate: Whether to fold the sessions into the aggregates.
+        """
+        with self._lock:
+            self.store(filename).append_sessions(profile, sessions, aggregate)
+            header = {k: v for k, v in profile.items() if k != "sessions"}
+            self._remember(filename, header)
+
+    def finalize(self, sessions: list[dict], filename: str = "profile.json") -> dict:
+        """Fold cleaned sessions into a profile and append them.
+
+        The header is loaded, aggregated and committed under a single hold of
+        the lock, so a profile deleted, recreated or rebuilt meanwhile on
+        another thread is never overwritten with a stale header.
+
+        Args:
+            sessions: The cleaned sessions, in order.
+            filename: The name of the profile file.
+
+        Returns:
+            The committed profile header.
+
+        Raises:
+            FileNotFoundError: if the profile does not exist
+        """
+        with self._lock:
+            header = self.load(filename, include_sessions=False)
+            header = aggregate_sessions(header, sessions)
+            self.append_sessions(header, sessions, filename, aggregate=False)
+        return header
+
+    def rebuild(self, filename: str = "profile.json") -> dict:
+        """Recompute a profile's aggregates from its stored runs.
+
+        Args:
+            filename: The name of the profile file.
+
+        Returns:
+            The rebuilt profile header.
+
+        Raises:
+            FileNotFoundError: if the profile does not exist
+        """
+        with self._lock:
+            header = self.load(filename, include_sessions=False)
+            header = self.store(filename).rebuild(header)
+            self._remember(filename, header)
+        return dict(header)
+
+    def delete(self, filename: str = "profile.json") -> None:
+        """Delete a profile and drop it from the cache.
+
+        Args:
+            filename: The name of the profile file.
+        """
+        with self._lock:
+            self.store(filename).delete()
+            self.invalidate(filename)
+
+    def exists(self, filename: str = "profile.json") -> bool:
+        """Check if a profile exists.
+
+        Args:
+            filename: The name of the profile file.
+
+        Returns:
+            bool: True if the profile exists.
+        """
+        return self.store(filename).exists()
+
+    def invalidate(self, filename: str | None = None) -> None:
+        """Forget a cached profile, or every profile.
+
+        Args:
+            filename: The name of the profile file, or None for all.
+        """
+        if filename is None:
+            self._headers.clear()
+            self._summaries.clear()
+        else:
+            self._headers.pop(filename, None)
+            self._summaries.pop(filename, None)
+
+    def _remember(self, filename: str, header: dict) -> None:
+        store = self.store(filename)
+        self._headers[filename] = (self._signature(store.path), header)
+        self._summaries[filename] = (
+            self._signature(store.manifest_path),
+            profile_summary(header),
+        )
 
-    if height is not None:
-        svg.setFixedHeight(height)
+    @staticmethod
+    def _signature(path: Path) -> tuple[int, int] | None:
+        try:
+            st = path.stat()
+        except FileNotFoundError:
+            return None
+        return st.st_mtime_ns, st.st_size
 
-    if width and height is not None:
-        svg.setMaximumSize(width, height)
 
-    svg.setStyleSheet("background-color: transparent")
+profiles = ProfileRepository()
 
-    return svg
 
+def load_profile(filename: str = "profile.json", include_sessions: bool = True) -> dict:
+    """Load a user profile from the user data directory.
 
-def load_font() -> None:
-    """Load custom font.
+    Args:
+        filename: The name of the profile file.
+        include_sessions: Whether to read the session history as well.
 
     Returns:
-        None
+        The profile data.
     """
-    fonts_dir = get_resource_path("resources/font")
-    loaded = False
-    for font_file in fonts_dir.iterdir():
-        if font_file.suffix.lower() in {".ttf", ".otf"}:
-            font_id = QFontDatabase.addApplicationFont(str(font_file))
-            if font_id < 0:
-                print(f"Failed to load font {font_file.name}")
-                return
-            loaded = True
-    if loaded:
-        print("✅ Fonts loaded successfully")
+    try:
+        return profiles.load(filename, include_sessions)
+    except FileNotFoundError:
+        print(f"Profile file not found at: {profiles.store(filename).path}")
+        return {}
+    except json.JSONDecodeError as e:
+        print(f"Error decoding JSON from {profiles.store(filename).path}: {e}")
+        return {}
+    except Exception as e:
+        print(
+            "An unexpected error occurred loading profile from "
+            f"{profiles.store(filename).path}: {e}"
+        )
+        return {}
 
 
-def load_profile(filename: str = "profile.json") -> dict:
-    """Load a user profile from the user data directory.
+def load_profile_summary(filename: str = "profile.json") -> dict:
+    """Load the summary of a user profile without its aggregates or history.
 
     Args:
         filename: The name of the profile file.
 
     Returns:
-        The profile data.
+        The summary fields (uuid, phrase, created, updated, total_runs,
+        session_count, avg_dwell), or an empty dict if there is no profile.
     """
-    profile_dir = get_user_data_dir()
-    profile_path = profile_dir / filename
-
     try:
-        with open(profile_path, encoding="utf-8") as f:
-            return json.load(f)
+        return profiles.summary(filename)
     except FileNotFoundError:
-        print(f"Profile file not found at: {profile_path}")
-        return {}
-    except json.JSONDecodeError as e:
-        print(f"Error decoding JSON from {profile_path}: {e}")
         return {}
     except Exception as e:
-        print(f"An unexpected error occurred loading profile from {profile_path}: {e}")
+        print(
+            "An unexpected error occurred loading profile summary from "
+            f"{profiles.store(filename).manifest_path}: {e}"
+        )
         return {}
 
 
 def save_profile(profile: dict, filename: str = "profile.json") -> None:
     """Save a user profile to the user data directory.
 
+    The session log is rewritten only if the profile carries its ``sessions``;
+    use :func:`append_session` to add a single session.
+
     Args:
         profile: The profile data.
         filename: The name of the profile file.
@@ -138,19 +355,41 @@ def save_profile(profile: dict, filename: str = "profile.json") -> None:
     Returns:
         None
     """
-    profile_dir = get_user_data_dir()
-    profile_path = profile_dir / filename
+    path = profiles.store(filename).path
+
+    try:
+        profiles.save(profile, filename)
+        print(f"Profile saved successfully to: {path}")
+    except Exception as e:
+        print(f"Error saving profile to {path}: {e}")
+
+
+def append_session(
+    profile: dict, session: dict, filename: str = "profile.json"
+) -> None:
+    """Append a session to a profile and update its aggregates.
+
+    Only the new session is written; the rest of the history is untouched.
+
+    Args:
+        profile: The profile header, updated in place.
+        session: The session data.
+        filename: The name of the profile file.
+
+    Returns:
+        None
+    """
+    log_path = profiles.store(filename).log_file(profile)
 
     try:
-        with open(profile_path, "w", encoding="utf-8") as f:
-            json.dump(profile, f, ensure_ascii=False, indent=2)
-        print(f"Profile saved successfully to: {profile_path}")
+        profiles.append_session(profile, session, filename)
+        print(f"Session saved successfully to: {log_path}")
     except Exception as e:
-        print(f"Error saving profile to {profile_path}: {e}")
+        print(f"Error saving session to {log_path}: {e}")
 
 
 def delete_profile(filename: str = "profile.json") -> bool:
-    """Delete a profile file from the user data directory.
+    """Delete a profile and its session log from the user data directory.
 
     Args:
         filename: The name of the profile file.
@@ -158,17 +397,14 @@ def delete_profile(filename: str = "profile.json") -> bool:
     Returns:
         bool: True if the profile was deleted, False otherwise.
     """
-    profile_dir = get_user_data_dir()
-    profile_path = profile_dir / filename
+    path = profiles.store(filename).path
     try:
-        if profile_path.exists():
-            os.remove(profile_path)
-            return True
-        else:
-            print(f"Profile file not found for deletion: {profile_path}")
-            return True
+        if not profiles.exists(filename):
+            print(f"Profile file not found for deletion: {path}")
+        profiles.delete(filename)
+        return True
     except Exception as e:
-        print(f"Error deleting profile {profile_path}: {e}")
+        print(f"Error deleting profile {path}: {e}")
     return False
 
 
@@ -181,9 +417,102 @@ def profile_exists(filename: str = "profile.json") -> bool:
     Returns:
         bool: True if the profile file exists, False otherwise.
     """
-    profile_dir = get_user_data_dir()
-    profile_path = profile_dir / filename
-    return profile_path.exists()
+    return profiles.exists(filename)
+
+
+@cache
+def get_profile_database(filename: str = "profiles.sqlite3") -> ProfileDatabase:
+    """Open the multi-user profile database in the user data directory.
+
+    Args:
+        filename: The name of the database file.
+
+    Returns:
+        The database, opened once per process.
+    """
+    return ProfileDatabase(get_user_data_dir() / filename)
+
+
+def load_user_profile(user_id: str, include_sessions: bool = True) -> dict:
+    """Load the profile of a user from the profile database.
+
+    Args:
+        user_id: The user id.
+        include_sessions: Whether to read the session history as well.
+
+    Returns:
+        The profile data, or an empty dict if the user has no profile.
+    """
+    try:
+        return get_profile_database().load(user_id, include_sessions)
+    except KeyError:
+        print(f"Profile not found for user: {user_id}")
+        return {}
+    except Exception as e:
+        print(f"An unexpected error occurred loading profile of {user_id}: {e}")
+        return {}
+
+
+def save_user_profile(user_id: str, profile: dict) -> None:
+    """Save the profile of a user to the profile database.
+
+    Args:
+        user_id: The user id.
+        profile: The profile data.
+
+    Returns:
+        None
+    """
+    try:
+        get_profile_database().save(user_id, profile)
+    except Exception as e:
+        print(f"Error saving profile of {user_id}: {e}")
+
+
+def append_user_session(user_id: str, profile: dict, session: dict) -> None:
+    """Append a session to the profile of a user and update its aggregates.
+
+    Args:
+        user_id: The user id.
+        profile: The profile header, updated in place.
+        session: The session data.
+
+    Returns:
+        None
+    """
+    try:
+        get_profile_database().append_session(user_id, profile, session)
+    except Exception as e:
+        print(f"Error saving session of {user_id}: {e}")
+
+
+def delete_user_profile(user_id: str) -> bool:
+    """Delete the profile of a user with all its sessions.
+
+    Args:
+        user_id: The user id.
+
+    Returns:
+        bool: True if the profile was deleted, False otherwise.
+    """
+    try:
+        get_profile_database().delete(user_id)
+        return True
+    except Exception as e:
+        print(f"Error deleting profile of {user_id}: {e}")
+    return False
+
+
+def user_profile_exists(user_id: str) -> bool:
+    """Check if a user has a profile in the profile database.
+
+    Args:
+        user_id: The user id.
+
+    Returns:
+        bool: True if the profile exists, False otherwise.
+    """
+    return get_profile_database().exists(user_id)
 
 
 def create_profile(phrase: str) -> dict:
@@ -202,6 +531,8 @@ def create_profile(phrase: str) -> dict:
         "total_runs": 0,
         "means": [],
         "variances": [],
+        "m2": [],
+        "counts": [],
         "sessions": [],
         "created": time.strftime("%Y-%m-%d %H:%M", time.localtime(now)),
         "updated": time.strftime("%Y-%m-%d %H:%M", time.localtime(now)),